@@ -0,0 +1,59 @@
+"""Add derived blog content columns
+
+Revision ID: 5f2c8e91d3b6
+Revises: e3b1f0c2a7d4
+Create Date: 2026-10-19 10:03:18.274519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.core.content import derive_post_content
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f2c8e91d3b6'
+down_revision: Union[str, None] = 'e3b1f0c2a7d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 200
+
+
+def upgrade() -> None:
+    op.add_column('blog_posts', sa.Column('content_html', sa.Text(), nullable=True))
+    op.add_column('blog_posts', sa.Column('content_toc', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.add_column('blog_posts', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+    # Derive word counts, read times, HTML and TOC for existing posts in keyset batches
+    posts = sa.table(
+        'blog_posts',
+        sa.column('id', postgresql.UUID(as_uuid=True)),
+        sa.column('content', sa.Text()),
+        sa.column('word_count', sa.Integer()),
+        sa.column('read_time_minutes', sa.Integer()),
+        sa.column('content_html', sa.Text()),
+        sa.column('content_toc', postgresql.JSONB()),
+        sa.column('content_hash', sa.String())
+    )
+    bind = op.get_bind()
+    after = None
+    while True:
+        query = sa.select(posts.c.id, posts.c.content).order_by(posts.c.id).limit(BATCH_SIZE)
+        if after is not None:
+            query = query.where(posts.c.id > after)
+        rows = bind.execute(query).fetchall()
+        if not rows:
+            break
+        for post_id, content in rows:
+            bind.execute(posts.update().where(posts.c.id == post_id).values(**derive_post_content(content or "")))
+        after = rows[-1][0]
+
+
+def downgrade() -> None:
+    op.drop_column('blog_posts', 'content_hash')
+    op.drop_column('blog_posts', 'content_toc')
+    op.drop_column('blog_posts', 'content_html')
@@ -0,0 +1,37 @@
+"""Add index for lesson schedules
+
+Revision ID: a4e9d2c7b8f3
+Revises: f1c7b3e9a2d5
+Create Date: 2026-10-19 16:41:07.382915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4e9d2c7b8f3'
+down_revision: Union[str, None] = 'f1c7b3e9a2d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Only dated, active lessons ever appear on a schedule; keep in sync with Lesson.__table_args__
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_lessons_module_id_lesson_date', 'lessons', ['module_id', 'lesson_date'],
+            postgresql_where=sa.text('lesson_date IS NOT NULL AND is_active'),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+    op.execute('ANALYZE lessons')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_lessons_module_id_lesson_date', table_name='lessons',
+            postgresql_concurrently=True, if_exists=True
+        )
@@ -0,0 +1,67 @@
+"""Add indexes for foreign keys and hot filters
+
+Revision ID: b6e4f1a9c3d7
+Revises: 9a7d3e5b1c42
+Create Date: 2026-10-19 12:02:51.664170
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e4f1a9c3d7'
+down_revision: Union[str, None] = '9a7d3e5b1c42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PUBLISHED_POSTS = sa.text("status = 'published'")
+PUBLISHED_COURSES = sa.text("is_published")
+
+# (name, table, columns, options); keep in sync with __table_args__ on the models.
+# Checked against the workload with benchmarks/explain_workload.py
+INDEXES = [
+    # Posts by author / category, newest first; also serve the foreign keys
+    ('ix_blog_posts_author_id_created_at', 'blog_posts', ['author_id', sa.text('created_at DESC')], {}),
+    ('ix_blog_posts_category_id_created_at', 'blog_posts', ['category_id', sa.text('created_at DESC')], {}),
+    # Public listings only ever read published posts, a fraction of the table
+    ('ix_blog_posts_published_created_at', 'blog_posts', [sa.text('created_at DESC')],
+     {'postgresql_where': PUBLISHED_POSTS}),
+    ('ix_blog_posts_published_published_at', 'blog_posts', [sa.text('published_at DESC')],
+     {'postgresql_where': PUBLISHED_POSTS}),
+    # The primary key leads with post_id; tag filters need tag_id first
+    ('ix_blog_post_tags_tag_id_post_id', 'blog_post_tags', ['tag_id', 'post_id'], {}),
+    ('ix_courses_instructor_id', 'courses', ['instructor_id'], {}),
+    ('ix_courses_published_created_at', 'courses', [sa.text('created_at DESC')],
+     {'postgresql_where': PUBLISHED_COURSES}),
+    # Outline loads fetch children in display order
+    ('ix_modules_course_id_order_index', 'modules', ['course_id', 'order_index'], {}),
+    ('ix_lessons_module_id_order_index', 'lessons', ['module_id', 'order_index'], {}),
+    ('ix_lesson_attachments_lesson_id', 'lesson_attachments', ['lesson_id'], {}),
+    ('ix_user_enrollments_user_id_enrolled_at', 'user_enrollments', ['user_id', sa.text('enrolled_at DESC')], {}),
+    ('ix_user_enrollments_course_id_enrolled_at', 'user_enrollments', ['course_id', sa.text('enrolled_at DESC')], {}),
+    # Completion counts per user read only is_completed, so they can be index-only scans
+    ('ix_user_progress_user_id_lesson_id', 'user_progress', ['user_id', 'lesson_id'],
+     {'postgresql_include': ['is_completed']}),
+    ('ix_user_progress_lesson_id', 'user_progress', ['lesson_id'], {}),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run in a transaction, but keeps tables writable while building
+    with op.get_context().autocommit_block():
+        for name, table, columns, options in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True, if_not_exists=True, **options
+            )
+    op.execute('ANALYZE blog_posts, blog_post_tags, courses, modules, lessons, lesson_attachments, '
+               'user_enrollments, user_progress')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,97 @@
+"""Deduplicate and add unique constraints to enrollments and progress
+
+Revision ID: d3a8c6f2e1b4
+Revises: b6e4f1a9c3d7
+Create Date: 2026-10-19 13:10:42.507318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a8c6f2e1b4'
+down_revision: Union[str, None] = 'b6e4f1a9c3d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Hold off writers until the constraints exist, so no new duplicate slips in after the merge
+    op.execute('LOCK TABLE user_progress, user_enrollments IN SHARE ROW EXCLUSIVE MODE')
+
+    # Keep the earliest completion per (user, lesson) and the longest time spent among the copies
+    op.execute("""
+        WITH ranked AS (
+            SELECT id,
+                   row_number() OVER (
+                       PARTITION BY user_id, lesson_id
+                       ORDER BY is_completed DESC, completed_at ASC NULLS LAST, created_at, id
+                   ) AS rank,
+                   max(time_spent) OVER (PARTITION BY user_id, lesson_id) AS time_spent
+            FROM user_progress
+        ), merged AS (
+            UPDATE user_progress p SET time_spent = r.time_spent
+            FROM ranked r
+            WHERE p.id = r.id AND r.rank = 1 AND p.time_spent <> r.time_spent
+        )
+        DELETE FROM user_progress p USING ranked r WHERE p.id = r.id AND r.rank > 1
+    """)
+
+    # Keep the first enrollment per (user, course) and fold the others' progress into it
+    op.execute("""
+        WITH ranked AS (
+            SELECT id,
+                   row_number() OVER (
+                       PARTITION BY user_id, course_id ORDER BY enrolled_at ASC NULLS LAST, id
+                   ) AS rank,
+                   count(*) OVER copies AS copies,
+                   max(progress_percentage) OVER copies AS progress_percentage,
+                   bool_or(is_completed) OVER copies AS is_completed,
+                   min(completed_at) OVER copies AS completed_at,
+                   max(last_accessed_at) OVER copies AS last_accessed_at
+            FROM user_enrollments
+            WINDOW copies AS (PARTITION BY user_id, course_id)
+        ), merged AS (
+            UPDATE user_enrollments e
+            SET progress_percentage = r.progress_percentage,
+                is_completed = r.is_completed,
+                completed_at = r.completed_at,
+                last_accessed_at = r.last_accessed_at
+            FROM ranked r
+            WHERE e.id = r.id AND r.rank = 1 AND r.copies > 1
+        )
+        DELETE FROM user_enrollments e USING ranked r WHERE e.id = r.id AND r.rank > 1
+    """)
+
+    # Duplicate enrollments also inflated the denormalized counter
+    op.execute("""
+        UPDATE courses c SET enrollment_count = n.enrolled
+        FROM (
+            SELECT courses.id, count(user_enrollments.id) AS enrolled
+            FROM courses LEFT JOIN user_enrollments ON user_enrollments.course_id = courses.id
+            GROUP BY courses.id
+        ) n
+        WHERE c.id = n.id AND c.enrollment_count <> n.enrolled
+    """)
+
+    # The unique index replaces the plain covering one and keeps its INCLUDE for index-only counts
+    op.drop_index('ix_user_progress_user_id_lesson_id', table_name='user_progress')
+    op.create_index(
+        'uq_user_progress_user_id_lesson_id', 'user_progress', ['user_id', 'lesson_id'],
+        unique=True, postgresql_include=['is_completed']
+    )
+    op.create_unique_constraint(
+        'uq_user_enrollments_user_id_course_id', 'user_enrollments', ['user_id', 'course_id']
+    )
+
+
+def downgrade() -> None:
+    # Merged duplicates are not restored
+    op.drop_constraint('uq_user_enrollments_user_id_course_id', 'user_enrollments', type_='unique')
+    op.drop_index('uq_user_progress_user_id_lesson_id', table_name='user_progress')
+    op.create_index(
+        'ix_user_progress_user_id_lesson_id', 'user_progress', ['user_id', 'lesson_id'],
+        postgresql_include=['is_completed']
+    )
@@ -0,0 +1,53 @@
+"""Backfill blog excerpts and course short descriptions
+
+Revision ID: e3b1f0c2a7d4
+Revises: ac5acc66cadc
+Create Date: 2026-10-19 09:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.text import make_excerpt, EXCERPT_LENGTH, SHORT_DESCRIPTION_LENGTH
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b1f0c2a7d4'
+down_revision: Union[str, None] = 'ac5acc66cadc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+
+def _backfill(table: str, source: str, target: str, length: int) -> None:
+    """Generate ``target`` from ``source`` wherever it is empty, in keyset batches"""
+    bind = op.get_bind()
+    select_batch = sa.text(
+        f"SELECT id, {source} FROM {table} "
+        f"WHERE ({target} IS NULL OR {target} = '') AND {source} IS NOT NULL AND id > :after "
+        f"ORDER BY id LIMIT :limit"
+    )
+    update_row = sa.text(f"UPDATE {table} SET {target} = :value WHERE id = :id")
+
+    after = '00000000-0000-0000-0000-000000000000'
+    while True:
+        rows = bind.execute(select_batch, {"after": after, "limit": BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        bind.execute(update_row, [{"id": row[0], "value": make_excerpt(row[1], length)} for row in rows])
+        after = rows[-1][0]
+
+
+def upgrade() -> None:
+    # List endpoints no longer load blog_posts.content or courses.description,
+    # so every row needs its summary column filled in
+    _backfill('blog_posts', 'content', 'excerpt', EXCERPT_LENGTH)
+    _backfill('courses', 'description', 'short_description', SHORT_DESCRIPTION_LENGTH)
+
+
+def downgrade() -> None:
+    # Generated summaries are indistinguishable from authored ones; nothing to undo
+    pass
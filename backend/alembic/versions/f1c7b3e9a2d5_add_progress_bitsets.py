@@ -0,0 +1,70 @@
+"""Add lesson progress ordinals, enrollment bitsets and per-lesson time
+
+Revision ID: f1c7b3e9a2d5
+Revises: d3a8c6f2e1b4
+Create Date: 2026-10-19 15:02:18.114907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c7b3e9a2d5'
+down_revision: Union[str, None] = 'd3a8c6f2e1b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('courses', sa.Column('next_lesson_ordinal', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    op.add_column('lessons', sa.Column('progress_ordinal', sa.Integer(), nullable=True))
+    op.add_column(
+        'user_enrollments',
+        sa.Column('completed_lesson_bits', sa.LargeBinary(), server_default=sa.text("'\\x'::bytea"), nullable=False)
+    )
+
+    # Number existing lessons per course in outline order; later reorders keep these
+    op.execute('LOCK TABLE lessons IN SHARE ROW EXCLUSIVE MODE')
+    op.execute("""
+        UPDATE lessons l SET progress_ordinal = n.ordinal
+        FROM (
+            SELECT lessons.id,
+                   row_number() OVER (
+                       PARTITION BY modules.course_id
+                       ORDER BY modules.order_index, lessons.order_index, lessons.id
+                   ) - 1 AS ordinal
+            FROM lessons JOIN modules ON modules.id = lessons.module_id
+        ) n
+        WHERE l.id = n.id
+    """)
+    op.execute("""
+        UPDATE courses c SET next_lesson_ordinal = n.used
+        FROM (
+            SELECT modules.course_id, max(lessons.progress_ordinal) + 1 AS used
+            FROM lessons JOIN modules ON modules.id = lessons.module_id
+            GROUP BY modules.course_id
+        ) n
+        WHERE c.id = n.course_id
+    """)
+    op.alter_column('lessons', 'progress_ordinal', nullable=False)
+
+    op.create_table(
+        'enrollment_lesson_time',
+        sa.Column('enrollment_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('lesson_ordinal', sa.Integer(), nullable=False),
+        sa.Column('seconds', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['enrollment_id'], ['user_enrollments.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('enrollment_id', 'lesson_ordinal')
+    )
+    # Bitsets start empty; fill them with migrate_progress_bitsets.py backfill while PROGRESS_STORE=dual
+
+
+def downgrade() -> None:
+    op.drop_table('enrollment_lesson_time')
+    op.drop_column('user_enrollments', 'completed_lesson_bits')
+    op.drop_column('lessons', 'progress_ordinal')
+    op.drop_column('courses', 'next_lesson_ordinal')
@@ -10,6 +10,7 @@ from .v1.lessons import router as lessons_router
 from .v1.files import router as files_router
 from .v1.users import router as users_router
 from .v1.enrollments import router as enrollments_router
+from .v1.admin import router as admin_router
 
 api_router = APIRouter()
 
@@ -33,4 +34,7 @@ api_router.include_router(lessons_router, prefix="/lessons", tags=["lessons"])
 api_router.include_router(files_router, prefix="/files", tags=["files"])
 
 # Enrollment management routes
-api_router.include_router(enrollments_router, prefix="/enrollments", tags=["enrollments"])
\ No newline at end of file
+api_router.include_router(enrollments_router, prefix="/enrollments", tags=["enrollments"])
+
+# Operational diagnostics
+api_router.include_router(admin_router, prefix="/admin", tags=["admin"])
\ No newline at end of file
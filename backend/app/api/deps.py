@@ -1,5 +1,5 @@
 from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from jose import jwt, JWTError
@@ -7,6 +7,9 @@ from typing import Optional
 
 from ..core.database import get_db
 from ..core.config import settings
+from ..core.security import decode_token
+from ..core.sql_profiler import authorize_profile
+from ..core.token_revocation import revocation_list
 from ..models.user import User, UserRole
 from ..services.auth_service import AuthService
 
@@ -15,9 +18,43 @@ security = HTTPBearer()
 optional_security = HTTPBearer(auto_error=False)
 
 
+def _token_claims(token: Optional[str], token_type: str = "access") -> dict:
+    claims = decode_token(token) if token else None
+    # Revocation is checked against the in-memory mirror, so this stays network-free
+    if claims is None or claims.get("type", "access") != token_type or revocation_list.is_revoked(claims):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return claims
+
+
+def get_token_claims(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> dict:
+    """Validate the bearer access token and return its claims, without touching the database"""
+    return _token_claims(credentials.credentials)
+
+
+def get_stream_token_claims(
+    access_token: Optional[str] = Query(None, description="For EventSource clients, which cannot send headers"),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+) -> dict:
+    """Like get_token_claims, also accepting the token as a query parameter"""
+    return _token_claims(credentials.credentials if credentials else access_token)
+
+
+def get_calendar_token_claims(
+    token: str = Query(..., description="Calendar feed token from /courses/schedule/calendar-url")
+) -> dict:
+    """Validate a calendar feed token; calendar clients can only fetch a URL"""
+    return _token_claims(token, "calendar")
+
+
 def get_current_user(
     db: Session = Depends(get_db),
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    claims: dict = Depends(get_token_claims)
 ) -> User:
     """Get current authenticated user from JWT token"""
     credentials_exception = HTTPException(
@@ -25,19 +62,9 @@ def get_current_user(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
-    try:
-        # Decode JWT token
-        payload = jwt.decode(
-            credentials.credentials,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
-        )
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
+    user_id = claims["sub"]
+    # Lets the session keep this user's reads on the primary right after their writes
+    db.info["user_id"] = user_id
     
     # Get user from database
     auth_service = AuthService(db)
@@ -52,6 +79,7 @@ def get_current_user(
             detail="Inactive user"
         )
     
+    authorize_profile(user)
     return user
 
 
@@ -125,18 +153,11 @@ def get_optional_current_user(
     if not credentials:
         return None
     
-    try:
-        # Decode JWT token
-        payload = jwt.decode(
-            credentials.credentials,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
-        )
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            return None
-    except JWTError:
+    claims = decode_token(credentials.credentials)
+    if claims is None or claims.get("type", "access") != "access" or revocation_list.is_revoked(claims):
         return None
+    user_id = claims["sub"]
+    db.info["user_id"] = user_id
     
     # Get user from database
     auth_service = AuthService(db)
@@ -144,6 +165,7 @@ def get_optional_current_user(
     if user is None or not user.is_active:
         return None
     
+    authorize_profile(user)
     return user
 
 
@@ -164,6 +186,12 @@ def get_learning_service(db: Session = Depends(get_db)):
     return LearningService(db)
 
 
+def get_stats_service(db: Session = Depends(get_db)):
+    """Get StatsService instance"""
+    from ..services.stats_service import StatsService
+    return StatsService(db)
+
+
 def get_file_service():
     """Get FileService instance"""
     from ..services.file_service import FileService
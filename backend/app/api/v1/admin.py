@@ -0,0 +1,43 @@
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+
+from ...core.slow_queries import SlowQuerySampler, get_slow_query_sampler
+from ..deps import get_admin_user
+from ...models.user import User
+
+router = APIRouter()
+
+
+def _sampler() -> SlowQuerySampler:
+    sampler = get_slow_query_sampler()
+    if sampler is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Slow query sampling is disabled"
+        )
+    return sampler
+
+
+@router.get("/slow-queries")
+def get_slow_queries(
+    limit: int = Query(20, ge=1, le=200),
+    order_by: Literal["total_ms", "max_ms", "mean_ms", "count"] = Query("total_ms"),
+    recent: int = Query(20, ge=0, le=500),
+    current_user: User = Depends(get_admin_user)
+):
+    """Get the slowest statement shapes seen by this worker (Admin only)"""
+    sampler = _sampler()
+    return {
+        "threshold_ms": sampler.threshold_ms,
+        "shapes": sampler.top_shapes(limit, order_by),
+        "recent": sampler.recent(recent)
+    }
+
+
+@router.delete("/slow-queries")
+def reset_slow_queries(
+    current_user: User = Depends(get_admin_user)
+):
+    """Clear this worker's slow query samples (Admin only)"""
+    _sampler().reset()
+    return {"message": "Slow query samples cleared"}
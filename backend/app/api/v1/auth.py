@@ -1,15 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Body, Query
 from fastapi.security import HTTPBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from ...core.database import get_db
+from ...core.rate_limit import rate_limit
+from ...core.security import decode_token
 from ...schemas.user import (
     UserCreate, UserResponse, Token,
     PasswordReset, PasswordResetConfirm, RefreshTokenRequest,
     GoogleTokenRequest, UserCreateByAdmin
 )
 from ...services.auth_service import AuthService
-from ..deps import get_current_user, get_auth_service
+from ..deps import get_current_user, get_token_claims, get_auth_service
 from ...models.user import User
 
 router = APIRouter()
@@ -32,7 +35,7 @@ def register(
         )
 
 
-@router.post("/google-login", response_model=Token)
+@router.post("/google-login", response_model=Token, dependencies=[Depends(rate_limit("google_login"))])
 def google_login(
     google_token: GoogleTokenRequest,
     auth_service: AuthService = Depends(get_auth_service)
@@ -81,7 +84,7 @@ def create_user_by_admin(
         )
 
 
-@router.post("/login", response_model=Token)
+@router.post("/login", response_model=Token, dependencies=[Depends(rate_limit("login"))])
 def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     auth_service: AuthService = Depends(get_auth_service)
@@ -111,30 +114,30 @@ def refresh_token(
     auth_service: AuthService = Depends(get_auth_service)
 ):
     """Refresh access token using refresh token"""
-    try:
-        new_access_token = auth_service.refresh_access_token(token_request.refresh_token)
-        return {
-            "access_token": new_access_token,
-            "refresh_token": token_request.refresh_token,
-            "token_type": "bearer"
-        }
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=str(e),
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    tokens = auth_service.refresh_access_token(token_request.refresh_token)
+    return {**tokens, "refresh_token": token_request.refresh_token}
 
 
 @router.post("/logout")
 def logout(
-    current_user: User = Depends(get_current_user)
+    token_request: Optional[RefreshTokenRequest] = Body(None),
+    all_sessions: bool = Query(False, description="Also sign out every other session of this user"),
+    claims: dict = Depends(get_token_claims),
+    auth_service: AuthService = Depends(get_auth_service)
 ):
-    """Logout user (client should discard tokens)"""
-    # In a more sophisticated implementation, you might want to:
-    # 1. Blacklist the token
-    # 2. Store logout timestamp
-    # 3. Clear any server-side sessions
+    """Logout user by revoking the access token and, if given, the refresh token"""
+    auth_service.revoke_token(claims)
+    
+    if token_request is not None:
+        refresh_claims = decode_token(token_request.refresh_token)
+        # Only the caller's own refresh token can be revoked this way
+        if refresh_claims is not None and refresh_claims.get("sub") == claims["sub"]:
+            auth_service.revoke_token(refresh_claims)
+    
+    if all_sessions:
+        user = auth_service.get_user_by_id(claims["sub"])
+        if user is not None:
+            auth_service.revoke_all_tokens(user)
     
     return {"message": "Successfully logged out"}
 
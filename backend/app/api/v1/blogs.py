@@ -4,10 +4,12 @@ import logging
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
 from sqlalchemy.orm import Session
 from ...core.database import get_db
+from ...core.rate_limit import rate_limit
+from ...core.responses import model_list_response
 from ..deps import get_current_user, get_optional_current_user, get_active_user, get_instructor_user, get_blog_service
 from ...models.user import User, UserRole
 from ...schemas.blog import (
-    BlogPostCreate, BlogPostUpdate, BlogPostResponse, BlogPostListResponse,
+    BlogPostCreate, BlogPostUpdate, BlogPostResponse, BlogPostSummaryResponse, BlogPostListResponse,
     BlogCategoryCreate, BlogCategoryResponse, BlogTagCreate, BlogTagResponse,
     BlogSearchParams
 )
@@ -24,7 +26,11 @@ def options_handler():
     return {"message": "OK"}
 
 
-@router.get("/", response_model=List[BlogPostResponse])
+# Only searches are limited; they scan title and content with ILIKE
+search_rate_limit = rate_limit("search", key="user", when=lambda request: bool(request.query_params.get("search")))
+
+
+@router.get("/", response_model=List[BlogPostSummaryResponse], dependencies=[Depends(search_rate_limit)])
 def get_blog_posts(
     skip: int = Query(0, ge=0, description="Number of posts to skip"),
     limit: int = Query(20, ge=1, le=100, description="Number of posts to return"),
@@ -63,7 +69,7 @@ def get_blog_posts(
                 skip=skip,
                 limit=limit
             )
-            return posts
+            return model_list_response(BlogPostSummaryResponse, posts)
         elif author_id == current_user.id:
             # Xem bài của chính mình: có thể xem cả published/unpublished
             pass
@@ -85,10 +91,10 @@ def get_blog_posts(
         limit=limit
     )
     
-    return posts
+    return model_list_response(BlogPostSummaryResponse, posts)
 
 
-@router.get("/popular", response_model=List[BlogPostResponse])
+@router.get("/popular", response_model=List[BlogPostSummaryResponse])
 def get_popular_posts(
     limit: int = Query(10, ge=1, le=50, description="Number of popular posts to return"),
     days: int = Query(30, ge=1, le=365, description="Time period in days"),
@@ -96,20 +102,20 @@ def get_popular_posts(
 ):
     """Get popular blog posts"""
     posts = blog_service.get_popular_posts(limit=limit, days=days)
-    return posts
+    return model_list_response(BlogPostSummaryResponse, posts)
 
 
-@router.get("/recent", response_model=List[BlogPostResponse])
+@router.get("/recent", response_model=List[BlogPostSummaryResponse])
 def get_recent_posts(
     limit: int = Query(10, ge=1, le=50, description="Number of recent posts to return"),
     blog_service: BlogService = Depends(get_blog_service)
 ):
     """Get recent blog posts"""
     posts = blog_service.get_recent_posts(limit=limit)
-    return posts
+    return model_list_response(BlogPostSummaryResponse, posts)
 
 
-@router.get("/my-posts", response_model=List[BlogPostResponse])
+@router.get("/my-posts", response_model=List[BlogPostSummaryResponse])
 def get_my_posts(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
@@ -124,7 +130,7 @@ def get_my_posts(
         limit=limit,
         is_published=is_published
     )
-    return posts
+    return model_list_response(BlogPostSummaryResponse, posts)
 
 
 @router.get("/{post_id}", response_model=BlogPostResponse)
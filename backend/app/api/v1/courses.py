@@ -1,31 +1,48 @@
-from typing import List, Optional
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Literal, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
-from ...core.database import get_db
+from ...core.calendar import Feed, feed_cache, render_calendar
+from ...core.config import settings
+from ...core.database import SessionLocal, get_db
+from ...core.live_updates import course_channel, get_broker
+from ...core.bitmap import encode_bitmap
+from ...core.responses import conditional_model_response, etag_for, etag_matches, model_list_response
+from ...core.security import create_calendar_token
+from ...core.token_revocation import revocation_list
 from ...schemas.learning import (
-    CourseCreate, CourseUpdate, CourseResponse,
-    UserEnrollmentCreate, UserEnrollmentResponse,
-    CourseSearchParams, ModuleResponse, ModuleCreate
+    CourseCreate, CourseUpdate, CourseResponse, CourseSummaryResponse,
+    UserEnrollmentCreate, UserEnrollmentResponse, LearnerDashboardItem,
+    CourseProgressResponse, LessonProgressState,
+    CourseSearchParams, ModuleResponse, ModuleCreate, ReorderItem,
+    ScheduleItem, CalendarFeedResponse
 )
+from ...services.auth_service import AuthService
 from ...services.learning_service import LearningService
+from ...services.stats_service import StatsService
 from ..deps import (
     get_current_user, get_active_user, get_instructor_user,
-    get_optional_current_user, get_learning_service
+    get_optional_current_user, get_learning_service, get_stats_service,
+    get_stream_token_claims, get_calendar_token_claims
 )
 from ...models.user import User, UserRole
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[CourseResponse])
+@router.get("/", response_model=List[CourseSummaryResponse])
 def get_courses(
     skip: int = Query(0, ge=0, description="Number of courses to skip"),
     limit: int = Query(20, ge=1, le=100, description="Number of courses to return"),
     search: Optional[str] = Query(None, description="Search in title and description"),
-    instructor_id: Optional[int] = Query(None, description="Filter by instructor ID"),
+    instructor_id: Optional[UUID] = Query(None, description="Filter by instructor ID"),
     is_published: Optional[bool] = Query(True, description="Filter by published status"),
     difficulty_level: Optional[str] = Query(None, description="Filter by difficulty level"),
     current_user: Optional[User] = Depends(get_optional_current_user),
@@ -47,7 +64,7 @@ def get_courses(
     
     courses, total = learning_service.get_courses(search_params)
     
-    return courses
+    return model_list_response(CourseSummaryResponse, courses)
 
 
 @router.get("/my-courses", response_model=List[CourseResponse])
@@ -93,6 +110,105 @@ def get_enrolled_courses(
     return courses
 
 
+@router.get("/dashboard", response_model=List[LearnerDashboardItem])
+def get_learner_dashboard(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_active_user),
+    learning_service: LearningService = Depends(get_learning_service)
+):
+    """Get current user's enrolled courses with progress and the next lesson to take"""
+    dashboard = learning_service.get_learner_dashboard(
+        user_id=current_user.id,
+        skip=skip,
+        limit=limit
+    )
+    return model_list_response(LearnerDashboardItem, dashboard)
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+@router.get("/schedule", response_model=List[ScheduleItem])
+def get_schedule(
+    start: Optional[datetime] = Query(None, description="Defaults to now"),
+    end: Optional[datetime] = Query(None, description="Exclusive; defaults to a week after start"),
+    limit: int = Query(500, ge=1, le=1000),
+    current_user: User = Depends(get_active_user),
+    learning_service: LearningService = Depends(get_learning_service)
+):
+    """Get current user's lessons scheduled between start and end across enrolled courses"""
+    start = _as_utc(start) if start else datetime.now(timezone.utc)
+    end = _as_utc(end) if end else start + timedelta(days=7)
+    if end <= start or end - start > timedelta(days=settings.SCHEDULE_MAX_RANGE_DAYS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"end must be after start and at most {settings.SCHEDULE_MAX_RANGE_DAYS} days later"
+        )
+    
+    lessons = learning_service.get_schedule(current_user.id, start, end, limit)
+    return model_list_response(ScheduleItem, lessons)
+
+
+@router.get("/schedule/calendar-url", response_model=CalendarFeedResponse)
+def get_calendar_url(
+    request: Request,
+    current_user: User = Depends(get_active_user)
+):
+    """Get a private iCalendar feed URL of current user's schedule, for calendar apps to subscribe to"""
+    token = create_calendar_token(current_user.id, version=current_user.token_version)
+    return CalendarFeedResponse(url=f"{request.url_for('get_calendar_feed')}?token={token}")
+
+
+def _build_calendar_feed(user_id: str) -> Optional[Feed]:
+    # Taken before reading, so a change made while the feed is built still invalidates it
+    built_at = time.monotonic()
+    db = SessionLocal()
+    try:
+        user = AuthService(db).get_user_by_id(user_id)
+        if user is None or not user.is_active:
+            return None
+        name = f"{user.full_name} - lessons"
+        learning_service = LearningService(db)
+        course_ids = learning_service.get_enrolled_course_ids(user_id)
+        now = datetime.now(timezone.utc)
+        lessons = learning_service.get_schedule(
+            user_id,
+            now - timedelta(days=settings.CALENDAR_FEED_PAST_DAYS),
+            now + timedelta(days=settings.CALENDAR_FEED_FUTURE_DAYS),
+            limit=5000
+        )
+    finally:
+        db.close()
+    
+    body = render_calendar(lessons, name)
+    return Feed(body, etag_for(body), frozenset(str(course_id) for course_id in course_ids), built_at)
+
+
+@router.get("/schedule.ics", name="get_calendar_feed")
+async def get_calendar_feed(
+    request: Request,
+    claims: dict = Depends(get_calendar_token_claims)
+):
+    """Current schedule as iCalendar, rendered once and served from memory until a followed course changes"""
+    user_id = claims["sub"]
+    feed = feed_cache.get(user_id)
+    if feed is None:
+        feed = await run_in_threadpool(_build_calendar_feed, user_id)
+        if feed is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials"
+            )
+        feed_cache.set(user_id, feed)
+    
+    headers = {"ETag": feed.etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), feed.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=feed.body, media_type="text/calendar", headers=headers)
+
+
 @router.get("/{course_id}", response_model=CourseResponse)
 def get_course(
     course_id: UUID,
@@ -179,11 +295,11 @@ def enroll_in_course(
     learning_service: LearningService = Depends(get_learning_service)
 ):
     """Enroll current user in course"""
-    enrollment_create = UserEnrollmentCreate(course_id=course_id)
+    enrollment_create = UserEnrollmentCreate(user_id=current_user.id, course_id=course_id)
     enrollment = learning_service.enroll_user(
         enrollment_create, user_id=current_user.id
     )
-    return enrollment
+    return UserEnrollmentResponse.from_orm_with_course(enrollment)
 
 
 @router.delete("/{course_id}/enroll")
@@ -221,15 +337,87 @@ def get_course_enrollments(
     return enrollments
 
 
-@router.get("/{course_id}/progress")
+@router.get("/{course_id}/progress", response_model=CourseProgressResponse)
 def get_course_progress(
     course_id: UUID,
+    request: Request,
+    format: Literal["list", "bitmap"] = Query("list", description="Per-lesson objects or one bit per lesson"),
     current_user: User = Depends(get_active_user),
     learning_service: LearningService = Depends(get_learning_service)
 ):
-    """Get current user's progress in course"""
-    progress = learning_service.get_user_course_progress(current_user.id, course_id)
-    return progress
+    """Get current user's completion state of every lesson in course (supports If-None-Match)"""
+    lessons = learning_service.get_course_lesson_progress(current_user.id, course_id)
+    completed = sum(1 for lesson in lessons if lesson.is_completed)
+    
+    progress = CourseProgressResponse(
+        course_id=course_id,
+        total_lessons=len(lessons),
+        completed_lessons=completed,
+        progress_percentage=round(completed * 100 / len(lessons), 2) if lessons else 0.0
+    )
+    if format == "bitmap":
+        progress.bitmap = encode_bitmap(lesson.is_completed for lesson in lessons)
+    else:
+        progress.lessons = [LessonProgressState.model_validate(lesson) for lesson in lessons]
+    
+    return conditional_model_response(request, progress)
+
+
+def _check_course_follower(course_id: UUID, user_id: str) -> None:
+    # A session of its own, released before streaming; Depends(get_db) would hold a connection until the stream ends
+    db = SessionLocal()
+    try:
+        db.info["user_id"] = user_id
+        LearningService(db).check_course_follower(course_id, user_id)
+    finally:
+        db.close()
+
+
+def _stream_token_valid(claims: dict) -> bool:
+    """Whether the token a stream was opened with is still unexpired and unrevoked"""
+    return claims.get("exp", 0) > time.time() and not revocation_list.is_revoked(claims)
+
+
+async def _course_event_stream(course_id: UUID, claims: dict):
+    broker = get_broker()
+    subscription = broker.subscribe(course_channel(course_id))
+    try:
+        # Browsers reconnect this many milliseconds after the stream drops
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                frame = await asyncio.wait_for(subscription.queue.get(), settings.LIVE_UPDATES_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                frame = ": ping\n\n"
+            # End the stream once the token expires or is revoked; the client reconnects with a fresh one
+            if frame is None or not _stream_token_valid(claims):
+                break
+            yield frame
+    finally:
+        broker.unsubscribe(subscription)
+
+
+@router.get("/{course_id}/events")
+async def stream_course_events(
+    course_id: UUID,
+    claims: dict = Depends(get_stream_token_claims)
+):
+    """Stream lesson and schedule changes of a course as server-sent events (learners, instructor and admins)"""
+    broker = get_broker()
+    if broker is None or broker.subscribers >= settings.LIVE_UPDATES_MAX_SUBSCRIBERS:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many live update streams, please retry shortly",
+            headers={"Retry-After": str(settings.LOAD_SHED_RETRY_AFTER_SECONDS)}
+        )
+    
+    await run_in_threadpool(_check_course_follower, course_id, claims["sub"])
+    
+    return StreamingResponse(
+        _course_event_stream(course_id, claims),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.post("/{course_id}/publish")
@@ -262,40 +450,24 @@ def unpublish_course(
 def get_course_stats(
     course_id: UUID,
     current_user: User = Depends(get_active_user),
-    learning_service: LearningService = Depends(get_learning_service)
+    stats_service: StatsService = Depends(get_stats_service)
 ):
     """Get course statistics"""
-    course = learning_service.get_course_by_id(course_id)
-    if not course:
+    stats = stats_service.get_course_stats(course_id)
+    if not stats:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Course not found"
         )
     
     # Check permissions: only instructor or admin can view stats
-    if (current_user.id != course.instructor_id and 
+    if (current_user.id != stats["instructor_id"] and 
         current_user.role != UserRole.ADMIN):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions to view course statistics"
         )
     
-    enrollments = learning_service.get_course_enrollments(course_id)
-    
-    stats = {
-        "course_id": course_id,
-        "title": course.title,
-        "is_published": course.is_published,
-        "total_enrollments": len(enrollments),
-        "active_enrollments": len([e for e in enrollments if e.is_active]),
-        "completed_enrollments": len([e for e in enrollments if e.completion_percentage == 100]),
-        "average_progress": sum([e.completion_percentage for e in enrollments]) / len(enrollments) if enrollments else 0,
-        "total_modules": len(course.modules) if hasattr(course, 'modules') else 0,
-        "total_lessons": sum([len(module.lessons) for module in course.modules]) if hasattr(course, 'modules') else 0,
-        "created_at": course.created_at,
-        "updated_at": course.updated_at
-    }
-    
     return stats
 
 
@@ -376,4 +548,31 @@ def create_course_module(
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/{course_id}/modules/reorder")
+def reorder_course_modules(
+    course_id: UUID,
+    items: List[ReorderItem],
+    current_user: User = Depends(get_active_user),
+    learning_service: LearningService = Depends(get_learning_service)
+):
+    """Apply a new module order for the whole course in one statement"""
+    instructor_id = learning_service.get_course_instructor_id(course_id)
+    if instructor_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Course not found"
+        )
+    
+    # Check permissions: only instructor or admin can reorder modules
+    if (current_user.id != instructor_id and 
+        current_user.role != UserRole.ADMIN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to reorder modules in this course"
+        )
+    
+    updated = learning_service.reorder_modules(course_id, items)
+    return {"message": "Modules reordered successfully", "updated": updated}
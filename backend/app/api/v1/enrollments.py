@@ -27,7 +27,7 @@ def create_enrollment(
             user_id=enrollment_data.user_id,
             course_id=enrollment_data.course_id
         )
-        return enrollment
+        return UserEnrollmentResponse.from_orm_with_course(enrollment)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
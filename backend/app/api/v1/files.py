@@ -7,11 +7,15 @@ from ...services.file_service import FileService
 from ..deps import get_current_user, get_active_user, get_file_service
 from ...models.user import User, UserRole
 from ...core.config import settings
+from ...core.rate_limit import rate_limit
 
 router = APIRouter()
 
+# Uploads write to disk and may resize images; limited per user
+upload_rate_limit = Depends(rate_limit("upload", key="user"))
 
-@router.post("/upload/image")
+
+@router.post("/upload/image", dependencies=[upload_rate_limit])
 async def upload_image(
     file: UploadFile = File(...),
     resize_width: Optional[int] = Form(None),
@@ -42,7 +46,7 @@ async def upload_image(
         )
 
 
-@router.post("/upload/video")
+@router.post("/upload/video", dependencies=[upload_rate_limit])
 async def upload_video(
     file: UploadFile = File(...),
     current_user: User = Depends(get_active_user),
@@ -67,7 +71,7 @@ async def upload_video(
         )
 
 
-@router.post("/upload/document")
+@router.post("/upload/document", dependencies=[upload_rate_limit])
 async def upload_document(
     file: UploadFile = File(...),
     current_user: User = Depends(get_active_user),
@@ -92,7 +96,7 @@ async def upload_document(
         )
 
 
-@router.post("/upload/attachment")
+@router.post("/upload/attachment", dependencies=[upload_rate_limit])
 async def upload_attachment(
     file: UploadFile = File(...),
     current_user: User = Depends(get_active_user),
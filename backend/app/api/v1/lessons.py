@@ -1,18 +1,23 @@
+import time
 from typing import List, Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
 from sqlalchemy.orm import Session
 
+from ...core.activity import cap_lesson_seconds, get_activity_buffer
+from ...core.config import settings
 from ...core.database import get_db
+from ...core.rate_limit import rate_limit
+from ...core.responses import model_response, model_list_response
 from ...schemas.learning import (
     LessonCreate, LessonUpdate, LessonResponse,
     LessonAttachmentCreate, LessonAttachmentResponse,
-    UserProgressResponse
+    UserProgressResponse, ActivityHeartbeat, ActivityHeartbeatResponse, MAX_EVENT_SECONDS
 )
 from ...services.learning_service import LearningService
 from ...services.file_service import FileService
 from ..deps import (
-    get_current_user, get_active_user, get_instructor_user,
+    get_current_user, get_active_user, get_instructor_user, get_token_claims,
     get_optional_current_user, get_learning_service, get_file_service
 )
 from ...models.user import User, UserRole
@@ -76,7 +81,36 @@ def get_lessons(
             limit=limit
         )
     
-    return [LessonResponse.from_orm_with_attachments(lesson) for lesson in lessons]
+    return model_list_response(LessonResponse, lessons)
+
+
+@router.post(
+    "/activity",
+    response_model=ActivityHeartbeatResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(rate_limit("activity", key="user"))]
+)
+async def record_activity(
+    heartbeat: ActivityHeartbeat,
+    claims: dict = Depends(get_token_claims)
+):
+    """Buffer time spent on lessons; it is added to progress in bulk every few seconds"""
+    buffer = get_activity_buffer()
+    if buffer is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Activity tracking is not running"
+        )
+    
+    # Enrollment is checked when the buffer is written, not per heartbeat
+    now = time.time()
+    events = cap_lesson_seconds(
+        ((str(event.lesson_id), event.seconds, min(event.occurred_at.timestamp(), now)) for event in heartbeat.events),
+        MAX_EVENT_SECONDS,
+        settings.ACTIVITY_MAX_SECONDS_PER_LESSON
+    )
+    await buffer.add(str(claims["sub"]), events)
+    return {"accepted": len(heartbeat.events)}
 
 
 @router.get("/{lesson_id}", response_model=LessonResponse)
@@ -114,7 +148,7 @@ def get_lesson(
                     detail="Lesson not found"
                 )
     
-    return LessonResponse.from_orm_with_attachments(lesson)
+    return model_response(LessonResponse.from_orm_with_attachments(lesson))
 
 
 @router.post("/", response_model=LessonResponse, status_code=status.HTTP_201_CREATED)
@@ -131,7 +165,10 @@ def create_lesson(
             module_id=module_id,
             user_id=current_user.id
         )
-        return LessonResponse.from_orm_with_attachments(lesson)
+        return model_response(
+            LessonResponse.from_orm_with_attachments(lesson),
+            status_code=status.HTTP_201_CREATED
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -153,7 +190,7 @@ def update_lesson(
             lesson_update=lesson_update,
             user_id=current_user.id
         )
-        return LessonResponse.from_orm_with_attachments(lesson)
+        return model_response(LessonResponse.from_orm_with_attachments(lesson))
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -184,11 +221,11 @@ def delete_lesson(
 @router.post("/{lesson_id}/reorder")
 def reorder_lesson(
     lesson_id: UUID,
-    new_order: int,
+    new_order: int = Query(..., ge=0, description="Zero-based position within the module"),
     current_user: User = Depends(get_active_user),
     learning_service: LearningService = Depends(get_learning_service)
 ):
-    """Reorder lesson within module"""
+    """Move lesson to a new position within its module"""
     # Get the existing lesson
     existing_lesson = learning_service.get_lesson_by_id(lesson_id)
     if not existing_lesson:
@@ -223,7 +260,7 @@ def reorder_lesson(
         )
 
 
-@router.post("/{lesson_id}/complete")
+@router.post("/{lesson_id}/complete", response_model=UserProgressResponse)
 def complete_lesson(
     lesson_id: UUID,
     current_user: User = Depends(get_active_user),
@@ -321,7 +358,7 @@ def create_lesson_attachment(
         )
 
 
-@router.post("/{lesson_id}/attachments/upload")
+@router.post("/{lesson_id}/attachments/upload", dependencies=[Depends(rate_limit("upload", key="user"))])
 async def upload_lesson_attachment(
     lesson_id: UUID,
     file: UploadFile = File(...),
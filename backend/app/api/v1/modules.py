@@ -4,9 +4,10 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 
 from ...core.database import get_db
+from ...core.responses import model_response, model_list_response
 from ...schemas.learning import (
     ModuleCreate, ModuleUpdate, ModuleResponse,
-    LessonCreate, LessonResponse
+    LessonCreate, LessonResponse, ReorderItem
 )
 from ...services.learning_service import LearningService
 from ..deps import (
@@ -197,7 +198,7 @@ def get_module_lessons(
     )
     
     # Return only lessons to prevent circular reference
-    return [LessonResponse.from_orm_with_attachments(lesson) for lesson in lessons]
+    return model_list_response(LessonResponse, lessons)
 
 
 @router.post("/{module_id}/lessons", response_model=LessonResponse, status_code=status.HTTP_201_CREATED)
@@ -227,7 +228,10 @@ def create_lesson_in_module(
     
     try:
         lesson = learning_service.create_lesson(lesson_create, module_id, current_user.id)
-        return LessonResponse.from_orm_with_attachments(lesson)
+        return model_response(
+            LessonResponse.from_orm_with_attachments(lesson),
+            status_code=status.HTTP_201_CREATED
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -240,14 +244,42 @@ def create_lesson_in_module(
         )
 
 
+@router.post("/{module_id}/lessons/reorder")
+def reorder_module_lessons(
+    module_id: UUID,
+    items: List[ReorderItem],
+    current_user: User = Depends(get_active_user),
+    learning_service: LearningService = Depends(get_learning_service)
+):
+    """Apply a new lesson order for the whole module in one statement"""
+    module = learning_service.get_module_by_id(module_id)
+    if not module:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Module not found"
+        )
+    
+    # Check permissions: only course instructor or admin can reorder
+    course = module.course
+    if (current_user.id != course.instructor_id and 
+        current_user.role != UserRole.ADMIN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to reorder lessons in this module"
+        )
+    
+    updated = learning_service.reorder_lessons(module_id, items)
+    return {"message": "Lessons reordered successfully", "updated": updated}
+
+
 @router.post("/{module_id}/reorder")
 def reorder_module(
     module_id: UUID,
-    new_order: int,
+    new_order: int = Query(..., ge=0, description="Zero-based position within the course"),
     current_user: User = Depends(get_active_user),
     learning_service: LearningService = Depends(get_learning_service)
 ):
-    """Reorder module within course"""
+    """Move module to a new position within its course"""
     # Get the existing module
     existing_module = learning_service.get_module_by_id(module_id)
     if not existing_module:
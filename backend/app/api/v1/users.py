@@ -7,9 +7,10 @@ from ...schemas.user import UserResponse, UserUpdate, UserCreate
 from ...schemas.learning import UserEnrollmentResponse
 from ...services.auth_service import AuthService
 from ...services.learning_service import LearningService
+from ...services.stats_service import StatsService
 from ..deps import (
     get_current_user, get_active_user, get_admin_user,
-    get_auth_service, get_learning_service
+    get_auth_service, get_learning_service, get_stats_service
 )
 from ...models.user import User, UserRole
 
@@ -275,32 +276,21 @@ def change_user_role(
 def get_user_stats(
     user_id: str,
     current_user: User = Depends(get_current_user),
-    auth_service: AuthService = Depends(get_auth_service)
+    stats_service: StatsService = Depends(get_stats_service)
 ):
     """Get user statistics"""
     # Users can view their own stats or admins can view any user's stats
-    if current_user.id != user_id and current_user.role != UserRole.ADMIN:
+    if str(current_user.id) != user_id and current_user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
     
-    user = auth_service.get_user_by_id(user_id)
-    if not user:
+    stats = stats_service.get_user_stats(user_id)
+    if not stats:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    # Get user statistics (this would typically involve querying related tables)
-    stats = {
-        "user_id": user_id,
-        "total_courses_enrolled": len(user.enrollments) if hasattr(user, 'enrollments') else 0,
-        "total_blog_posts": len(user.blog_posts) if hasattr(user, 'blog_posts') else 0,
-        "account_created": user.created_at,
-        "last_login": user.last_login_at,
-        "is_active": user.is_active,
-        "role": user.role
-    }
-    
-    return stats
\ No newline at end of file
+    return stats
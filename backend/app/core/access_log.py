@@ -0,0 +1,105 @@
+import logging
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from time import perf_counter_ns
+from typing import Optional, TextIO
+
+from pythonjsonlogger import jsonlogger
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+access_logger = logging.getLogger("app.access")
+
+_listener: Optional[QueueListener] = None
+
+
+def start_access_log_listener(stream: Optional[TextIO] = None) -> None:
+    """Route access log records through a queue drained by a background thread"""
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+
+    stream_handler = logging.StreamHandler(stream or sys.stdout)
+    stream_handler.setFormatter(jsonlogger.JsonFormatter("%(asctime)s %(levelname)s %(message)s"))
+
+    access_logger.handlers = [QueueHandler(log_queue)]
+    access_logger.setLevel(logging.INFO)
+    access_logger.propagate = False
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_access_log_listener() -> None:
+    """Flush queued access log records and stop the background thread"""
+    global _listener
+    if _listener is None:
+        return
+
+    _listener.stop()
+    _listener = None
+
+
+class AccessLogMiddleware:
+    """Pure ASGI middleware that times requests and emits structured access logs.
+
+    Every response gets an X-Process-Time header. A request is logged when it
+    is slow, failed with a 5xx, or falls inside the configured sample rate.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: float = 1.0,
+        slow_request_ms: float = 1000.0
+    ):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_request_ns = int(slow_request_ms * 1_000_000)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter_ns()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed = perf_counter_ns() - start
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Process-Time", f"{elapsed / 1e9:.6f}")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = perf_counter_ns() - start
+            self._log(scope, status_code, elapsed)
+
+    def _log(self, scope: Scope, status_code: int, elapsed_ns: int) -> None:
+        is_slow = elapsed_ns >= self.slow_request_ns
+        if not (is_slow or status_code >= 500 or random.random() < self.sample_rate):
+            return
+
+        client = scope.get("client")
+        access_logger.log(
+            logging.WARNING if is_slow or status_code >= 500 else logging.INFO,
+            "request",
+            extra={
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status_code,
+                "duration_ms": round(elapsed_ns / 1_000_000, 3),
+                "client": client[0] if client else None,
+                "slow": is_slow
+            }
+        )
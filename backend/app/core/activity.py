@@ -0,0 +1,380 @@
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import exc, text
+from sqlalchemy.engine import Engine
+
+from .config import settings
+
+
+logger = logging.getLogger(__name__)
+
+# (user id, lesson id) -> [seconds, last seen as a Unix timestamp]
+Entries = Dict[Tuple[str, str], List[float]]
+
+# Largest value the integer time columns can hold
+MAX_STORED_SECONDS = 2**31 - 1
+
+# Add every event of a heartbeat batch; ARGV holds (field, seconds, seen) triples
+_ADD_SCRIPT = """
+for i = 1, #ARGV, 3 do
+    redis.call('HINCRBY', KEYS[1], ARGV[i], ARGV[i + 1])
+    local current = tonumber(redis.call('HGET', KEYS[2], ARGV[i]))
+    if not current or tonumber(ARGV[i + 2]) > current then
+        redis.call('HSET', KEYS[2], ARGV[i], ARGV[i + 2])
+    end
+end
+return #ARGV / 3
+"""
+
+# Move both hashes aside in one step so events arriving during a flush land in fresh ones
+_TAKE_SCRIPT = """
+local seconds = redis.call('HGETALL', KEYS[1])
+local seen = redis.call('HGETALL', KEYS[2])
+redis.call('DEL', KEYS[1], KEYS[2])
+return {seconds, seen}
+"""
+
+
+def coalesce_events(user_id: str, events: Iterable[Tuple[str, int, float]], into: Optional[Entries] = None) -> Entries:
+    """Sum seconds and keep the latest timestamp per (user, lesson)"""
+    entries = {} if into is None else into
+    for lesson_id, seconds, seen in events:
+        entry = entries.get((user_id, lesson_id))
+        if entry is None:
+            entries[(user_id, lesson_id)] = [seconds, seen]
+        else:
+            entry[0] += seconds
+            if seen > entry[1]:
+                entry[1] = seen
+    return entries
+
+
+def cap_lesson_seconds(
+    events: Iterable[Tuple[str, int, float]],
+    max_event_seconds: int,
+    ceiling: int
+) -> List[Tuple[str, int, float]]:
+    """Coalesce one batch to an event per lesson, claiming no more time than the batch can cover.
+
+    A lesson gets at most the span between its earliest and latest event
+    plus one event's worth, and never more than ``ceiling``, so repeating
+    an event many times in one batch adds nothing.
+    """
+    lessons: Dict[str, List[float]] = {}
+    for lesson_id, seconds, seen in events:
+        lesson = lessons.get(lesson_id)
+        if lesson is None:
+            lessons[lesson_id] = [seconds, seen, seen]
+        else:
+            lesson[0] += seconds
+            lesson[1] = min(lesson[1], seen)
+            lesson[2] = max(lesson[2], seen)
+    return [
+        (lesson_id, int(min(seconds, last - first + max_event_seconds, ceiling)), last)
+        for lesson_id, (seconds, first, last) in lessons.items()
+    ]
+
+
+class MemoryActivityBuffer:
+    """Per-worker buffer of heartbeat seconds coalesced per (user, lesson)"""
+
+    def __init__(self, max_keys: int = 50000, on_full=lambda: None):
+        self.max_keys = max_keys
+        self.on_full = on_full
+        self._entries: Entries = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add_now(self, user_id: str, events: List[Tuple[str, int, float]]) -> None:
+        with self._lock:
+            coalesce_events(user_id, events, self._entries)
+            full = len(self._entries) >= self.max_keys
+        if full:
+            self.on_full()
+
+    async def add(self, user_id: str, events: List[Tuple[str, int, float]]) -> None:
+        self.add_now(user_id, events)
+
+    def take(self) -> Entries:
+        """Remove and return everything buffered so far"""
+        with self._lock:
+            entries, self._entries = self._entries, {}
+        return entries
+
+    def restore(self, entries: Entries) -> None:
+        """Put back entries whose write failed, merged with what arrived meanwhile"""
+        with self._lock:
+            for (user_id, lesson_id), (seconds, seen) in entries.items():
+                coalesce_events(user_id, [(lesson_id, seconds, seen)], self._entries)
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisActivityBuffer:
+    """Heartbeat buffer shared by every worker through Redis hashes.
+
+    Seconds are summed with HINCRBY, so any worker may flush. A flushing
+    worker reads and deletes the hashes in one script, so a failed take
+    leaves them in Redis for the next flush, and keeps entries whose
+    database write failed in its own buffer for the next flush. When Redis is unreachable events go to that per-worker buffer for
+    ``retry_interval_seconds``, flushed like the memory backend.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        key: str = "activity",
+        timeout_seconds: float = 0.1,
+        retry_interval_seconds: float = 5.0,
+        max_keys: int = 50000
+    ):
+        import redis
+        import redis.asyncio as aioredis
+
+        self.key = key
+        self.retry_interval_seconds = retry_interval_seconds
+        self.fallback = MemoryActivityBuffer(max_keys)
+        # Requests add through the async client; the flusher thread takes through the blocking one
+        self._client = aioredis.from_url(url, socket_timeout=timeout_seconds, socket_connect_timeout=timeout_seconds)
+        self._sync_client = redis.from_url(url, socket_timeout=timeout_seconds * 10, socket_connect_timeout=timeout_seconds)
+        self._add = self._client.register_script(_ADD_SCRIPT)
+        self._take = self._sync_client.register_script(_TAKE_SCRIPT)
+        self._down_until = 0.0
+
+    def __len__(self) -> int:
+        return len(self.fallback)
+
+    async def add(self, user_id: str, events: List[Tuple[str, int, float]]) -> None:
+        if time.monotonic() < self._down_until:
+            self.fallback.add_now(user_id, events)
+            return
+        args = []
+        for (_, lesson_id), (seconds, seen) in coalesce_events(user_id, events).items():
+            args += [f"{user_id}:{lesson_id}", int(seconds), seen]
+        try:
+            await self._add(keys=[self.key, f"{self.key}:seen"], args=args)
+        except Exception as e:
+            logger.warning(f"Activity buffer unavailable, buffering in this worker: {e}")
+            self._down_until = time.monotonic() + self.retry_interval_seconds
+            self.fallback.add_now(user_id, events)
+
+    def take(self) -> Entries:
+        entries = self.fallback.take()
+        if time.monotonic() < self._down_until:
+            return entries
+        try:
+            seconds, seen = self._take(keys=[self.key, f"{self.key}:seen"])
+            # HGETALL replies come back from scripts as flat field, value lists
+            seen = dict(zip(seen[::2], seen[1::2]))
+            for field, value in zip(seconds[::2], seconds[1::2]):
+                user_id, _, lesson_id = field.decode().partition(":")
+                coalesce_events(user_id, [(lesson_id, int(value), float(seen.get(field, 0)))], entries)
+        except Exception as e:
+            logger.warning(f"Could not take buffered activity from Redis: {e}")
+            self._down_until = time.monotonic() + self.retry_interval_seconds
+        return entries
+
+    def restore(self, entries: Entries) -> None:
+        # Kept locally; the next flush retries them whether or not Redis is back
+        self.fallback.restore(entries)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+        self._sync_client.close()
+
+
+def write_activity(engine: Engine, entries: Entries, store: str = "rows") -> int:
+    """Add buffered seconds to lesson progress and touch the enrollments in one statement.
+
+    Entries for lessons the user is not enrolled in, or that no longer
+    exist, are dropped by the join. ``store`` follows PROGRESS_STORE: time
+    goes to user_progress.time_spent, to enrollment_lesson_time, or both.
+    Returns the number of (user, lesson) pairs written.
+    """
+    if not entries:
+        return 0
+
+    # A stable order keeps concurrent flushes from different workers locking rows in the same sequence
+    keys = sorted(entries)
+    parameters = {
+        "user_ids": [user_id for user_id, _ in keys],
+        "lesson_ids": [lesson_id for _, lesson_id in keys],
+        "seconds": [min(int(entries[key][0]), MAX_STORED_SECONDS) for key in keys],
+        "seen": [datetime.fromtimestamp(entries[key][1], timezone.utc) for key in keys]
+    }
+
+    writes = []
+    if store != "bitset":
+        writes.append("""
+            progress AS (
+                INSERT INTO user_progress (id, user_id, lesson_id, is_completed, time_spent)
+                SELECT gen_random_uuid(), user_id, lesson_id, false, seconds FROM valid
+                ON CONFLICT (user_id, lesson_id)
+                DO UPDATE SET time_spent = LEAST(user_progress.time_spent::bigint + excluded.time_spent, :max_seconds),
+                              updated_at = now()
+            )""")
+    if store in ("dual", "bitset"):
+        writes.append("""
+            lesson_time AS (
+                INSERT INTO enrollment_lesson_time (enrollment_id, lesson_ordinal, seconds)
+                SELECT enrollment_id, lesson_ordinal, seconds FROM valid
+                ON CONFLICT (enrollment_id, lesson_ordinal)
+                DO UPDATE SET seconds = LEAST(enrollment_lesson_time.seconds::bigint + excluded.seconds, :max_seconds)
+            )""")
+
+    statement = text(f"""
+        WITH batch AS (
+            SELECT * FROM unnest(
+                CAST(:user_ids AS uuid[]), CAST(:lesson_ids AS uuid[]),
+                CAST(:seconds AS integer[]), CAST(:seen AS timestamptz[])
+            ) AS b(user_id, lesson_id, seconds, seen_at)
+        ), valid AS (
+            SELECT b.user_id, b.lesson_id, b.seconds, b.seen_at,
+                   e.id AS enrollment_id, l.progress_ordinal AS lesson_ordinal
+            FROM batch b
+            JOIN lessons l ON l.id = b.lesson_id
+            JOIN modules m ON m.id = l.module_id
+            JOIN user_enrollments e ON e.user_id = b.user_id AND e.course_id = m.course_id
+        ), {",".join(writes)},
+        touched AS (
+            UPDATE user_enrollments e
+            SET last_accessed_at = greatest(e.last_accessed_at, v.seen_at)
+            FROM (SELECT enrollment_id, max(seen_at) AS seen_at FROM valid GROUP BY enrollment_id) v
+            WHERE e.id = v.enrollment_id
+        )
+        SELECT count(*) FROM valid
+    """)
+
+    parameters["max_seconds"] = MAX_STORED_SECONDS
+    with engine.begin() as conn:
+        return conn.execute(statement, parameters).scalar()
+
+
+def _is_transient(error: Exception) -> bool:
+    """Whether a failed write may succeed unchanged later (lost connection, pool exhausted)"""
+    return isinstance(error, (exc.OperationalError, exc.TimeoutError)) or getattr(error, "connection_invalidated", False)
+
+
+class ActivityFlusher:
+    """Daemon thread writing the buffer every ``interval_seconds``, or sooner once it fills up.
+
+    When the database is unreachable the entries go back to the buffer for
+    the next flush, so a hiccup delays time tracking instead of losing it;
+    after ``max_attempts`` consecutive failures they are dropped, so an
+    outage cannot grow the buffer without bound. Any other error is taken to
+    come from the data: the batch is bisected until the entries that fail
+    on their own are found, logged and dropped, and the rest is written.
+    Stopping flushes one last time.
+    """
+
+    def __init__(self, buffer, engine: Engine, interval_seconds: float = 5.0, max_attempts: int = 5):
+        self.buffer = buffer
+        self.engine = engine
+        self.interval_seconds = interval_seconds
+        self.max_attempts = max_attempts
+        self._failures = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def flush(self) -> int:
+        entries = self.buffer.take()
+        if not entries:
+            return 0
+        try:
+            written = self._write(entries)
+        except Exception as e:
+            self._failures += 1
+            if self._failures >= self.max_attempts:
+                logger.error(f"Dropping {len(entries)} activity entries after {self._failures} failed flushes: {e}")
+                self._failures = 0
+            else:
+                logger.error(f"Writing {len(entries)} activity entries failed, retrying next flush: {e}")
+                self.buffer.restore(entries)
+            return 0
+        self._failures = 0
+        return written
+
+    def _write(self, entries: Entries) -> int:
+        """Write entries, isolating and dropping those the database rejects; transient errors propagate"""
+        try:
+            return write_activity(self.engine, entries, settings.PROGRESS_STORE)
+        except Exception as e:
+            if _is_transient(e):
+                raise
+            if len(entries) == 1:
+                (user_id, lesson_id), (seconds, _) = next(iter(entries.items()))
+                logger.error(
+                    f"Dropping {int(seconds)}s of activity for user {user_id} on lesson {lesson_id} "
+                    f"rejected by the database: {getattr(e, 'orig', e)}"
+                )
+                return 0
+        keys = sorted(entries)
+        middle = len(keys) // 2
+        return sum(
+            self._write({key: entries[key] for key in half})
+            for half in (keys[:middle], keys[middle:])
+        )
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="activity-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval_seconds + 5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.interval_seconds)
+            self._wake.clear()
+            self.flush()
+        self.flush()
+
+
+_buffer = None
+_flusher: Optional[ActivityFlusher] = None
+
+
+def start_activity_flusher(engine: Engine) -> None:
+    """Create the worker's heartbeat buffer and start flushing it"""
+    global _buffer, _flusher
+    if _flusher is None:
+        if settings.ACTIVITY_BUFFER_BACKEND == "redis":
+            _buffer = RedisActivityBuffer(settings.REDIS_URL, max_keys=settings.ACTIVITY_BUFFER_MAX_KEYS)
+        else:
+            _buffer = MemoryActivityBuffer(settings.ACTIVITY_BUFFER_MAX_KEYS)
+        _flusher = ActivityFlusher(
+            _buffer, engine, settings.ACTIVITY_FLUSH_INTERVAL_SECONDS, settings.ACTIVITY_FLUSH_MAX_ATTEMPTS
+        )
+        # Only the in-process buffer can grow unbounded; Redis is drained on the interval
+        local = _buffer.fallback if isinstance(_buffer, RedisActivityBuffer) else _buffer
+        local.on_full = _flusher.wake
+        _flusher.start()
+
+
+async def stop_activity_flusher() -> None:
+    """Write what is still buffered and release the backend"""
+    global _buffer, _flusher
+    if _flusher is not None:
+        _flusher.stop()
+        await _buffer.close()
+        _buffer = _flusher = None
+
+
+def get_activity_buffer():
+    """The worker's heartbeat buffer, or None before startup"""
+    return _buffer
@@ -0,0 +1,75 @@
+import base64
+from typing import Iterable, List
+
+from sqlalchemy import case, func
+
+
+def pack_bits(flags: Iterable[bool]) -> bytes:
+    """Pack booleans into bytes, first flag in the most significant bit of the first byte"""
+    packed = bytearray()
+    for index, flag in enumerate(flags):
+        if index % 8 == 0:
+            packed.append(0)
+        if flag:
+            packed[-1] |= 0x80 >> (index % 8)
+    return bytes(packed)
+
+
+def unpack_bits(packed: bytes, length: int) -> List[bool]:
+    """Inverse of pack_bits for the first ``length`` flags"""
+    return [bool(packed[index // 8] & (0x80 >> (index % 8))) for index in range(length)]
+
+
+def encode_bitmap(flags: Iterable[bool]) -> str:
+    """Base64 of pack_bits, a compact JSON-safe form of a flag list"""
+    return base64.b64encode(pack_bits(flags)).decode("ascii")
+
+
+# Completed-lesson bitsets stored in user_enrollments.completed_lesson_bits use the
+# bit numbering of Postgres get_bit/set_bit on bytea: bit n is the (n % 8) least
+# significant bit of byte n // 8. Lessons are addressed by Lesson.progress_ordinal.
+
+def pack_ordinals(ordinals: Iterable[int]) -> bytes:
+    """Bitset with the given ordinals set, readable by Postgres get_bit"""
+    packed = bytearray()
+    for ordinal in ordinals:
+        if ordinal // 8 >= len(packed):
+            packed.extend(bytes(ordinal // 8 + 1 - len(packed)))
+        packed[ordinal // 8] |= 1 << (ordinal % 8)
+    return bytes(packed)
+
+
+def unpack_ordinals(packed: bytes) -> List[int]:
+    """Ordinals set in a bitset, ascending"""
+    return [
+        index * 8 + bit
+        for index, byte in enumerate(packed) if byte
+        for bit in range(8) if byte & (1 << bit)
+    ]
+
+
+def sql_has_bit(bits, ordinal):
+    """SQL boolean: is ``ordinal`` set; bits past the end of the value are unset"""
+    return case(
+        (func.length(bits) > ordinal // 8, func.get_bit(bits, ordinal) == 1),
+        else_=False
+    )
+
+
+def sql_set_bit(bits, ordinal):
+    """SQL bytea with ``ordinal`` set, zero-extending the value when it is too short"""
+    padding = func.decode(func.repeat("00", func.greatest(0, ordinal // 8 + 1 - func.length(bits))), "hex")
+    return func.set_bit(bits.op("||")(padding), ordinal, 1)
+
+
+def sql_clear_bit(bits, ordinal):
+    """SQL bytea with ``ordinal`` unset"""
+    return case(
+        (func.length(bits) > ordinal // 8, func.set_bit(bits, ordinal, 0)),
+        else_=bits
+    )
+
+
+def sql_popcount(bits):
+    """SQL count of set bits (Postgres 14+ bit_count)"""
+    return func.bit_count(bits)
@@ -0,0 +1,136 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, FrozenSet, Hashable, Iterable, NamedTuple, Optional
+
+from .cache import TTLCache
+from .config import settings
+
+
+# Lesson fields a calendar shows; changes to any other field leave feeds as they are
+CALENDAR_LESSON_FIELDS = frozenset({"title", "lesson_date", "duration", "instructor", "zoom_link", "is_active"})
+
+# Calendar clients need an end time; lessons without a duration are shown as an hour long
+DEFAULT_DURATION_MINUTES = 60
+
+
+def _escape(value: str) -> str:
+    """Escape a TEXT property value (RFC 5545 3.3.11)"""
+    return (
+        value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+        .replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Fold a content line at 75 octets, continuing with a leading space (RFC 5545 3.1)"""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    while encoded:
+        limit = 75 if not parts else 74
+        # Never split inside a UTF-8 sequence
+        while limit < len(encoded) and (encoded[limit] & 0xC0) == 0x80:
+            limit -= 1
+        parts.append(encoded[:limit].decode())
+        encoded = encoded[limit:]
+    return "\r\n ".join(parts)
+
+
+def _timestamp(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def render_calendar(lessons: Iterable, name: str) -> bytes:
+    """Render schedule rows as an iCalendar (RFC 5545) document, one event per lesson"""
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//LMS Blog//Lesson schedule//EN",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(name)}",
+        # Hint for clients that honour it; feeds are cheap to poll
+        "REFRESH-INTERVAL;VALUE=DURATION:PT15M",
+    ]
+    for lesson in lessons:
+        end = lesson.lesson_date + timedelta(minutes=lesson.duration or DEFAULT_DURATION_MINUTES)
+        details = [f"{lesson.course_title} / {lesson.module_title}"]
+        if lesson.instructor:
+            details.append(f"Instructor: {lesson.instructor}")
+        if lesson.zoom_link:
+            details.append(f"Join: {lesson.zoom_link}")
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:lesson-{lesson.lesson_id}@lms",
+            f"DTSTAMP:{_timestamp(lesson.updated_at or lesson.lesson_date)}",
+            f"DTSTART:{_timestamp(lesson.lesson_date)}",
+            f"DTEND:{_timestamp(end)}",
+            f"SUMMARY:{_escape(f'{lesson.course_title}: {lesson.title}')}",
+            f"DESCRIPTION:{_escape(chr(10).join(details))}",
+        ]
+        if lesson.zoom_link:
+            lines += [f"LOCATION:{_escape(lesson.zoom_link)}", f"URL:{lesson.zoom_link}"]
+        lines.append("END:VEVENT")
+    lines.append("END:VCALENDAR")
+    return ("\r\n".join(_fold(line) for line in lines) + "\r\n").encode()
+
+
+class Feed(NamedTuple):
+    body: bytes
+    etag: str
+    course_ids: FrozenSet[str]
+    built_at: float
+
+
+class FeedCache:
+    """Rendered calendar feeds per user, dropped when a course they follow or their enrollments change.
+
+    Changes are recorded in this worker only. Feeds cached by other workers
+    are rebuilt when their TTL runs out, so ``ttl_seconds`` bounds how stale
+    a calendar can be after an edit handled elsewhere.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 10000):
+        self._feeds = TTLCache(ttl_seconds, max_entries)
+        # course id or ("user", user id) -> monotonic time of the last change
+        self._changed: Dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._feeds.enabled
+
+    def get(self, user_id: str) -> Optional[Feed]:
+        feed = self._feeds.get(user_id)
+        if feed is None:
+            return None
+        keys = [("user", user_id), *feed.course_ids]
+        if any(self._changed.get(key, 0.0) >= feed.built_at for key in keys):
+            self._feeds.invalidate(user_id)
+            return None
+        return feed
+
+    def set(self, user_id: str, feed: Feed) -> None:
+        self._feeds.set(user_id, feed)
+
+    def course_changed(self, course_id) -> None:
+        self._mark(str(course_id))
+
+    def user_changed(self, user_id) -> None:
+        self._mark(("user", str(user_id)))
+
+    def _mark(self, key: Hashable) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._changed[key] = now
+            # Changes older than any cached feed can no longer invalidate one
+            if len(self._changed) > 2 * self._feeds.max_entries:
+                horizon = now - self._feeds.ttl_seconds
+                self._changed = {k: t for k, t in self._changed.items() if t >= horizon}
+
+
+feed_cache = FeedCache(settings.CALENDAR_FEED_CACHE_TTL_SECONDS, settings.CALENDAR_FEED_CACHE_MAX_ENTRIES)
@@ -0,0 +1,230 @@
+import hashlib
+import zlib
+from typing import Dict, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .cache import TTLCache
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+# Media that is already compressed, or must reach the client unbuffered
+INCOMPRESSIBLE_PREFIXES = ("image/", "video/", "audio/", "font/woff")
+INCOMPRESSIBLE_TYPES = {
+    "application/gzip", "application/zip", "application/pdf",
+    "application/octet-stream", "text/event-stream"
+}
+
+
+class _GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Map each coding in an Accept-Encoding header to its q-value"""
+    codings = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        codings[coding.strip().lower()] = q
+    return codings
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if not media_type or media_type in INCOMPRESSIBLE_TYPES:
+        return False
+    return not media_type.startswith(INCOMPRESSIBLE_PREFIXES)
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware negotiating brotli or gzip response compression.
+
+    Bodies below ``minimum_size`` are sent unchanged. Streaming responses are
+    compressed chunk by chunk; only the first ``minimum_size`` bytes are held
+    back while deciding whether compression is worth it. Single-message bodies
+    are compressed in one go and, when a ``cache`` is given, the compressed
+    bytes are kept under a digest of the body so repeated identical responses
+    (cached or unchanged data) skip compression entirely.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        cache: Optional[TTLCache] = None,
+        cache_max_body_size: int = 1024 * 1024
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.cache = cache
+        self.cache_max_body_size = cache_max_body_size
+        # Server preference when the client weighs codings equally
+        self.encodings = ("br", "gzip") if brotli is not None else ("gzip",)
+
+    def choose_encoding(self, accept_encoding: str) -> Optional[str]:
+        codings = parse_accept_encoding(accept_encoding)
+        wildcard = codings.get("*", 0.0)
+        best, best_q = None, 0.0
+        for encoding in self.encodings:
+            q = codings.get(encoding, wildcard)
+            if q > best_q:
+                best, best_q = encoding, q
+        return best
+
+    def compressor(self, encoding: str):
+        if encoding == "br":
+            return _BrotliCompressor(self.brotli_quality)
+        return _GzipCompressor(self.gzip_level)
+
+    def compress(self, encoding: str, body: bytes) -> bytes:
+        """Compress a complete body, reusing a cached result for identical responses"""
+        use_cache = self.cache is not None and self.cache.enabled and len(body) <= self.cache_max_body_size
+        if use_cache:
+            # Hashing runs at memory speed, far cheaper than compressing again
+            key: Tuple = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        compressor = self.compressor(encoding)
+        compressed = compressor.compress(body) + compressor.finish()
+        if use_cache:
+            self.cache.set(key, compressed)
+        return compressed
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self.choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressingResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    """Per-response state: pass through, buffer up to the threshold, or compress"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start_message: Optional[Message] = None
+        self.passthrough = False
+        self.pending = bytearray()
+        self.compressor = None
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._on_start(message)
+            if self.passthrough:
+                await self._send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is not None:
+            chunk = self.compressor.compress(body)
+            if not more_body:
+                chunk += self.compressor.finish()
+            if chunk or not more_body:
+                await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+            return
+
+        self.pending.extend(body)
+        minimum_size = self.middleware.minimum_size
+
+        if not more_body:
+            if len(self.pending) < minimum_size:
+                await self._send_uncompressed()
+            else:
+                await self._send_whole()
+        elif len(self.pending) >= minimum_size:
+            await self._start_stream()
+
+    def _on_start(self, message: Message) -> None:
+        self.start_message = message
+        headers = Headers(raw=message["headers"])
+        content_length = headers.get("content-length")
+        self.passthrough = (
+            "content-encoding" in headers
+            or message["status"] in (204, 304)
+            or not is_compressible(headers.get("content-type", ""))
+            or (content_length is not None and int(content_length) < self.middleware.minimum_size)
+        )
+
+    def _compressed_headers(self, content_length: Optional[int]) -> Message:
+        headers = MutableHeaders(scope=self.start_message)
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        # The compressed representation is a different byte sequence
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+        return self.start_message
+
+    async def _send_uncompressed(self) -> None:
+        await self._send(self.start_message)
+        await self._send({"type": "http.response.body", "body": bytes(self.pending)})
+
+    async def _send_whole(self) -> None:
+        compressed = self.middleware.compress(self.encoding, bytes(self.pending))
+        await self._send(self._compressed_headers(len(compressed)))
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    async def _start_stream(self) -> None:
+        self.compressor = self.middleware.compressor(self.encoding)
+        await self._send(self._compressed_headers(None))
+        chunk = self.compressor.compress(bytes(self.pending))
+        self.pending = bytearray()
+        if chunk:
+            await self._send({"type": "http.response.body", "body": chunk, "more_body": True})
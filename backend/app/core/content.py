@@ -0,0 +1,159 @@
+import hashlib
+import logging
+import math
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from .config import settings
+from .text import plain_text
+
+
+logger = logging.getLogger(__name__)
+
+# Bump when rendering output changes so stored artifacts are recomputed
+RENDERER_VERSION = 1
+
+WORDS_PER_MINUTE = 200
+
+ALLOWED_TAGS = {
+    "a", "abbr", "b", "blockquote", "br", "code", "del", "em", "h1", "h2", "h3", "h4", "h5", "h6",
+    "hr", "i", "img", "li", "ol", "p", "pre", "s", "strong", "sub", "sup", "table", "tbody", "td",
+    "th", "thead", "tr", "ul"
+}
+ALLOWED_ATTRIBUTES = {
+    "a": {"href", "title"},
+    "code": {"class"},
+    "img": {"src", "alt", "title"},
+    "th": {"style"},
+    "td": {"style"},
+    **{f"h{level}": {"id"} for level in range(1, 7)}
+}
+
+_SLUG_STRIP = re.compile(r"[^\w\s-]")
+_SLUG_SPACES = re.compile(r"[-\s]+")
+
+
+def content_hash(markdown: str) -> str:
+    """Fingerprint of the source and renderer version; equal hashes mean nothing to recompute"""
+    return hashlib.sha256(f"{RENDERER_VERSION}\0{markdown}".encode("utf-8")).hexdigest()
+
+
+def count_words(markdown: str) -> int:
+    return len(plain_text(markdown).split())
+
+
+def read_time_minutes(word_count: int) -> int:
+    return max(1, math.ceil(word_count / WORDS_PER_MINUTE)) if word_count else 0
+
+
+@lru_cache(maxsize=1)
+def _markdown():
+    from markdown_it import MarkdownIt
+
+    # Raw HTML in posts is escaped rather than passed through
+    return MarkdownIt("commonmark", {"html": False}).enable(["table", "strikethrough"])
+
+
+def _slugify(text: str, seen: Dict[str, int]) -> str:
+    slug = _SLUG_SPACES.sub("-", _SLUG_STRIP.sub("", text.lower())).strip("-") or "section"
+    count = seen.get(slug, 0)
+    seen[slug] = count + 1
+    return slug if count == 0 else f"{slug}-{count}"
+
+
+def render_markdown(markdown: str) -> Tuple[str, List[dict]]:
+    """Render markdown to sanitized HTML and a table of contents of its headings"""
+    import nh3
+
+    md = _markdown()
+    tokens = md.parse(markdown)
+
+    toc = []
+    seen: Dict[str, int] = {}
+    for index, token in enumerate(tokens):
+        if token.type != "heading_open":
+            continue
+        text = plain_text(tokens[index + 1].content)
+        anchor = _slugify(text, seen)
+        token.attrSet("id", anchor)
+        toc.append({"level": int(token.tag[1]), "text": text, "id": anchor})
+
+    html = md.renderer.render(tokens, md.options, {})
+    clean = nh3.clean(html, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES, link_rel="noopener nofollow")
+    return clean, toc
+
+
+def derive_post_content(markdown: str, render: bool = True) -> dict:
+    """Column values derived from a post's markdown source.
+
+    With ``render=False`` only the cheap fields are filled in and the HTML/TOC
+    are left empty for ``schedule_post_render`` to produce.
+    """
+    words = count_words(markdown)
+    derived = {
+        "content_hash": content_hash(markdown),
+        "word_count": words,
+        "read_time_minutes": read_time_minutes(words),
+        "content_html": None,
+        "content_toc": None
+    }
+    if render:
+        derived["content_html"], derived["content_toc"] = render_markdown(markdown)
+    return derived
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _render_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.CONTENT_RENDER_WORKERS,
+                    thread_name_prefix="content-render"
+                )
+    return _executor
+
+
+def _render_post(post_id: UUID, digest: str, markdown: str) -> None:
+    from sqlalchemy import update
+
+    from ..models.blog import BlogPost
+    from .database import SessionLocal
+
+    try:
+        html, toc = render_markdown(markdown)
+        db = SessionLocal()
+        try:
+            # A newer edit changes the hash; its own render wins and this one is dropped
+            db.execute(
+                update(BlogPost)
+                .where(BlogPost.id == post_id, BlogPost.content_hash == digest)
+                .values(content_html=html, content_toc=toc)
+            )
+            db.commit()
+        finally:
+            db.close()
+    except Exception:
+        logger.exception(f"Rendering content of blog post {post_id} failed")
+
+
+def schedule_post_render(post_id: UUID, digest: str, markdown: str) -> None:
+    """Render a large post's HTML and TOC on the background pool after it is committed"""
+    _render_executor().submit(_render_post, post_id, digest, markdown)
+
+
+def shutdown_content_renderer() -> None:
+    """Finish queued renders and stop the pool"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
@@ -3,18 +3,25 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 from .config import settings
+from .replicas import RoutingSession
 
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
-    echo=False,  # Temporarily disable echo to debug SQL issues
+    echo=settings.SQL_ECHO,
     # For PostgreSQL, we don't need StaticPool
     # poolclass=StaticPool if "sqlite" in settings.DATABASE_URL else None,
 )
 
+# Read replicas, used by read_only service methods while they keep up (see core/replicas.py)
+replica_engines = [
+    create_engine(url, pool_pre_ping=True, echo=settings.SQL_ECHO)
+    for url in settings.DATABASE_REPLICA_URLS
+]
+
 # Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=RoutingSession)
 
 # Create Base class for models
 Base = declarative_base()
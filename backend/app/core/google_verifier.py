@@ -0,0 +1,187 @@
+import logging
+import re
+import threading
+import time
+from typing import Dict, Optional
+
+from .config import settings
+
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class GoogleTokenVerifier:
+    """Verify Google ID tokens locally against cached signing certificates.
+
+    Certificates are fetched through a pooled HTTP session and kept for the
+    Cache-Control max-age the key server sends. A daemon timer refreshes them
+    shortly before they expire, so logins only pay for local signature checks.
+    A token signed with an unknown key id triggers one rate-limited refetch to
+    pick up key rotation early. If a refresh fails the previous certificates
+    stay in use until ``stale_grace_seconds`` past their expiry.
+    """
+
+    def __init__(
+        self,
+        certs_url: str,
+        client_id: Optional[str],
+        default_max_age: int = 3600,
+        refresh_margin_seconds: int = 300,
+        min_refetch_interval_seconds: int = 30,
+        stale_grace_seconds: int = 3600,
+        clock_skew_seconds: int = 10,
+        timeout_seconds: float = 5.0,
+        background_refresh: bool = True
+    ):
+        self.certs_url = certs_url
+        self.client_id = client_id
+        self.default_max_age = default_max_age
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.min_refetch_interval_seconds = min_refetch_interval_seconds
+        self.stale_grace_seconds = stale_grace_seconds
+        self.clock_skew_seconds = clock_skew_seconds
+        self.timeout_seconds = timeout_seconds
+        self.background_refresh = background_refresh
+
+        self._certs: Dict[str, str] = {}
+        self._expires_at = 0.0
+        self._last_fetch = 0.0
+        self._lock = threading.Lock()
+        self._session = None
+        self._timer: Optional[threading.Timer] = None
+        self._closed = False
+
+    def _http(self):
+        """Pooled session shared by every fetch"""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._session = session
+        return self._session
+
+    def _download(self):
+        """Download certificates and their max-age without holding the lock"""
+        response = self._http().get(self.certs_url, timeout=self.timeout_seconds)
+        response.raise_for_status()
+
+        match = _MAX_AGE.search(response.headers.get("Cache-Control", ""))
+        max_age = int(match.group(1)) if match else self.default_max_age
+        return response.json(), max_age
+
+    def _store(self, certs: Dict[str, str], max_age: int) -> None:
+        """Swap in fresh certificates and schedule the next refresh (lock held)"""
+        now = time.monotonic()
+        self._certs = certs
+        self._expires_at = now + max_age
+        self._last_fetch = now
+        self._schedule_refresh(max_age)
+
+    def _schedule_refresh(self, max_age: int) -> None:
+        if not self.background_refresh or self._closed:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+
+        delay = max(1, max_age - self.refresh_margin_seconds)
+        self._timer = threading.Timer(delay, self._background_refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _background_refresh(self) -> None:
+        # Logins keep using the current certificates while the download runs
+        try:
+            certs, max_age = self._download()
+        except Exception as e:
+            logger.warning(f"Background refresh of Google certificates failed: {e}")
+            with self._lock:
+                # Retry soon; the cached certificates remain usable meanwhile
+                self._schedule_refresh(self.refresh_margin_seconds + self.min_refetch_interval_seconds)
+            return
+
+        with self._lock:
+            self._store(certs, max_age)
+
+    def get_certs(self, require_kid: Optional[str] = None) -> Dict[str, str]:
+        """Return cached certificates, fetching when expired or when a key id is unknown"""
+        with self._lock:
+            now = time.monotonic()
+            expired = now >= self._expires_at
+            unknown_kid = (
+                require_kid is not None
+                and require_kid not in self._certs
+                and now - self._last_fetch >= self.min_refetch_interval_seconds
+            )
+
+            if expired or unknown_kid:
+                try:
+                    self._store(*self._download())
+                except Exception as e:
+                    if not self._certs or now >= self._expires_at + self.stale_grace_seconds:
+                        raise
+                    logger.warning(f"Using cached Google certificates after fetch failure: {e}")
+
+            return self._certs
+
+    def verify(self, token: str) -> dict:
+        """Verify signature, audience, expiry and issuer of a Google ID token"""
+        from google.auth import jwt
+
+        header = jwt.decode_header(token)
+        certs = self.get_certs(require_kid=header.get("kid"))
+        claims = jwt.decode(
+            token,
+            certs=certs,
+            audience=self.client_id,
+            clock_skew_in_seconds=self.clock_skew_seconds
+        )
+
+        if claims.get("iss") not in GOOGLE_ISSUERS:
+            raise ValueError(f"Wrong issuer: {claims.get('iss')}")
+        return claims
+
+    def close(self) -> None:
+        """Stop background refreshes and release pooled connections"""
+        with self._lock:
+            self._closed = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+_verifier: Optional[GoogleTokenVerifier] = None
+_verifier_lock = threading.Lock()
+
+
+def close_google_verifier() -> None:
+    """Shut down the process-wide verifier if it was ever used"""
+    global _verifier
+    with _verifier_lock:
+        if _verifier is not None:
+            _verifier.close()
+            _verifier = None
+
+
+def get_google_verifier() -> GoogleTokenVerifier:
+    """Process-wide verifier configured from settings"""
+    global _verifier
+    if _verifier is None:
+        with _verifier_lock:
+            if _verifier is None:
+                _verifier = GoogleTokenVerifier(
+                    certs_url=settings.GOOGLE_CERTS_URL,
+                    client_id=settings.GOOGLE_CLIENT_ID,
+                    refresh_margin_seconds=settings.GOOGLE_CERTS_REFRESH_MARGIN_SECONDS
+                )
+    return _verifier
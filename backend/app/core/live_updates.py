@@ -0,0 +1,176 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set
+
+import orjson
+
+from .config import settings
+from .metrics import live_update_dropped_total, live_update_streams
+
+
+logger = logging.getLogger(__name__)
+
+# Prefix of the Redis pub/sub channels, so the listener can subscribe to all of them with one pattern
+REDIS_CHANNEL_PREFIX = "live:"
+
+
+def course_channel(course_id) -> str:
+    return f"course:{course_id}"
+
+
+def sse_frame(event: str, data: Any) -> str:
+    """One Server-Sent Events message; rendered once per publish and shared by every subscriber"""
+    return f"event: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
+
+
+class Subscription:
+    """A stream's queue of rendered frames; ``None`` tells the stream to end"""
+
+    def __init__(self, channel: str, max_queued: int = 100):
+        self.channel = channel
+        self.queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue(max_queued)
+        self.dropped = 0
+
+    def deliver(self, frame: Optional[str]) -> None:
+        # A client too slow to keep up loses its oldest messages, never blocks the others
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+            live_update_dropped_total.inc()
+        self.queue.put_nowait(frame)
+
+
+class LocalBroker:
+    """Fan out published frames to the subscribers of a channel in this worker.
+
+    Subscriptions live on the event loop; ``publish`` may be called from any
+    thread, e.g. a sync endpoint in the threadpool, and hands the frame over
+    to the loop, so a publisher never waits on slow subscribers.
+    """
+
+    def __init__(self, max_queued: int = 100):
+        self.max_queued = max_queued
+        self._channels: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.subscribers = 0
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+
+    async def stop(self) -> None:
+        for subscriptions in list(self._channels.values()):
+            for subscription in list(subscriptions):
+                subscription.deliver(None)
+
+    def subscribe(self, channel: str) -> Subscription:
+        subscription = Subscription(channel, self.max_queued)
+        self._channels[channel].add(subscription)
+        self.subscribers += 1
+        live_update_streams.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._channels.get(subscription.channel)
+        if subscriptions is not None and subscription in subscriptions:
+            subscriptions.discard(subscription)
+            self.subscribers -= 1
+            live_update_streams.dec()
+            if not subscriptions:
+                del self._channels[subscription.channel]
+
+    def fan_out(self, channel: str, frame: str) -> None:
+        """Deliver to this worker's subscribers; event loop only"""
+        for subscription in list(self._channels.get(channel, ())):
+            subscription.deliver(frame)
+
+    def publish(self, channel: str, frame: str) -> None:
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self.fan_out, channel, frame)
+
+
+class RedisBroker(LocalBroker):
+    """Broker whose publishes reach the subscribers of every worker through Redis pub/sub.
+
+    Each worker runs one pattern subscription and fans messages out locally,
+    so Redis sees one connection per worker however many streams are open.
+    When Redis is unreachable, publishes reach this worker's subscribers
+    only, and the listener keeps reconnecting.
+    """
+
+    def __init__(self, url: str, max_queued: int = 100, timeout_seconds: float = 0.5):
+        import redis
+        import redis.asyncio as aioredis
+
+        super().__init__(max_queued)
+        # Publishers are sync service code; the listener runs on the event loop
+        self._client = redis.from_url(url, socket_timeout=timeout_seconds, socket_connect_timeout=timeout_seconds)
+        self._async_client = aioredis.from_url(url)
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        await super().start()
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        await super().stop()
+        await self._async_client.aclose()
+        self._client.close()
+
+    def publish(self, channel: str, frame: str) -> None:
+        try:
+            self._client.publish(REDIS_CHANNEL_PREFIX + channel, frame)
+        except Exception as e:
+            logger.warning(f"Live update broker unavailable, notifying this worker only: {e}")
+            super().publish(channel, frame)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self._async_client.pubsub() as pubsub:
+                    await pubsub.psubscribe(REDIS_CHANNEL_PREFIX + "*")
+                    async for message in pubsub.listen():
+                        if message["type"] == "pmessage":
+                            channel = message["channel"].decode()[len(REDIS_CHANNEL_PREFIX):]
+                            self.fan_out(channel, message["data"].decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Live update subscription lost, reconnecting: {e}")
+                await asyncio.sleep(1)
+
+
+_broker: Optional[LocalBroker] = None
+
+
+async def start_live_updates() -> None:
+    """Create the worker's broker on the running event loop"""
+    global _broker
+    if _broker is None:
+        if settings.LIVE_UPDATES_BACKEND == "redis":
+            _broker = RedisBroker(settings.REDIS_URL, settings.LIVE_UPDATES_QUEUE_SIZE)
+        else:
+            _broker = LocalBroker(settings.LIVE_UPDATES_QUEUE_SIZE)
+        await _broker.start()
+
+
+async def stop_live_updates() -> None:
+    """End every open stream and disconnect the backend"""
+    global _broker
+    if _broker is not None:
+        await _broker.stop()
+        _broker = None
+
+
+def get_broker() -> Optional[LocalBroker]:
+    """The worker's broker, or None before startup"""
+    return _broker
+
+
+def publish_course_event(course_id, event: str, data: Any) -> None:
+    """Push an event to every learner following the course; a no-op before startup"""
+    if _broker is not None:
+        _broker.publish(course_channel(course_id), sse_frame(event, data))
@@ -0,0 +1,110 @@
+from typing import Optional, Sequence
+
+from sqlalchemy.engine import Engine
+from starlette.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .metrics import http_requests_in_flight, load_shed_total, pool_stats, threadpool_stats
+
+
+class LoadSheddingMiddleware:
+    """Pure ASGI middleware rejecting new requests with 503 while the worker is saturated.
+
+    A request is shed when any enabled signal passes its threshold (0 disables):
+
+    * ``max_in_flight``: requests already being served by this worker
+    * ``threadpool_queue_threshold``: tasks queued for a worker thread
+    * ``pool_queue_threshold``: requests in flight beyond the connection pool's
+      capacity while every connection is checked out, an estimate of how many
+      are waiting on ``pool_timeout``
+
+    Failing fast with Retry-After lets clients and load balancers back off
+    instead of piling more work onto queues that end in timeouts. A request
+    stops counting as in flight once its response starts as an event
+    stream: open streams hold no thread or connection, and would otherwise
+    read as a backlog. The content type comes from the application, so a
+    client cannot claim the exemption.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        engine: Engine,
+        max_in_flight: int = 0,
+        threadpool_queue_threshold: int = 0,
+        pool_queue_threshold: int = 0,
+        retry_after_seconds: int = 2,
+        exempt_paths: Sequence[str] = ("/health", "/metrics")
+    ):
+        self.app = app
+        self.engine = engine
+        self.max_in_flight = max_in_flight
+        self.threadpool_queue_threshold = threadpool_queue_threshold
+        self.pool_queue_threshold = pool_queue_threshold
+        self.retry_after_seconds = retry_after_seconds
+        self.exempt_paths = set(exempt_paths)
+        # Only touched from the event loop, so no lock is needed
+        self.in_flight = 0
+
+    def overload_reason(self) -> Optional[str]:
+        if self.max_in_flight and self.in_flight >= self.max_in_flight:
+            return "in_flight"
+
+        if self.threadpool_queue_threshold and threadpool_stats()["waiting"] >= self.threadpool_queue_threshold:
+            return "threadpool"
+
+        if self.pool_queue_threshold:
+            pool = pool_stats(self.engine)
+            if (
+                pool["capacity"]
+                and pool["checked_out"] >= pool["capacity"]
+                and self.in_flight - pool["capacity"] >= self.pool_queue_threshold
+            ):
+                return "db_pool"
+
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        reason = self.overload_reason()
+        if reason is not None:
+            load_shed_total.inc((reason,))
+            response = JSONResponse(
+                status_code=503,
+                content={
+                    "error": True,
+                    "message": "Server is overloaded, please retry shortly",
+                    "status_code": 503,
+                    "path": scope["path"]
+                },
+                headers={"Retry-After": str(self.retry_after_seconds)}
+            )
+            await response(scope, receive, send)
+            return
+
+        counted = True
+
+        def release() -> None:
+            nonlocal counted
+            if counted:
+                counted = False
+                self.in_flight -= 1
+                http_requests_in_flight.dec()
+
+        async def send_releasing_streams(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                content_type = MutableHeaders(scope=message).get("content-type", "")
+                if content_type.startswith("text/event-stream"):
+                    release()
+            await send(message)
+
+        self.in_flight += 1
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_releasing_streams)
+        finally:
+            release()
@@ -0,0 +1,320 @@
+import bisect
+import threading
+from contextvars import ContextVar
+from time import perf_counter, perf_counter_ns
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import anyio
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+# Upper bounds in seconds, matching the Prometheus client defaults
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0
+)
+
+LabelValues = Tuple[str, ...]
+
+
+class Counter:
+    """Monotonic counter keyed by label values"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: LabelValues = (), amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Gauge:
+    """Value that goes up and down, keyed by label values"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: LabelValues = (), amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, labels: LabelValues = (), amount: float = 1.0) -> None:
+        self.inc(labels, -amount)
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative bucket histogram keyed by label values"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelValues, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: LabelValues, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            # Layout: one slot per bucket, then +Inf, then sum
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+        for labels, series in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                bucket_labels = _format_labels(self.labelnames + ("le",), labels + (_format_bound(bound),))
+                lines.append(f"{self.name}_bucket{bucket_labels} {_format_value(cumulative)}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {series[-1]!r}")
+            lines.append(f"{self.name}_count{label_text} {_format_value(cumulative)}")
+        return lines
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+http_requests_total = Counter(
+    "http_requests_total",
+    "HTTP requests by method, templated route and status class",
+    ("method", "route", "status")
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method and templated route",
+    ("method", "route")
+)
+db_queries_total = Counter(
+    "db_queries_total",
+    "SQL statements executed while serving a route",
+    ("route",)
+)
+db_query_duration_seconds = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement latency by route",
+    ("route",)
+)
+upload_bytes_total = Counter(
+    "upload_bytes_total",
+    "Bytes written by FileService uploads",
+    ("category",)
+)
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight",
+    "Requests currently being served, as tracked by load shedding"
+)
+rate_limited_total = Counter(
+    "rate_limited_total",
+    "Requests rejected with 429 by rate limit policy",
+    ("policy",)
+)
+load_shed_total = Counter(
+    "load_shed_total",
+    "Requests rejected with 503 by load shedding, by the signal that tripped",
+    ("reason",)
+)
+live_update_streams = Gauge(
+    "live_update_streams",
+    "Server-sent event streams open on this worker"
+)
+live_update_dropped_total = Counter(
+    "live_update_dropped_total",
+    "Live update events dropped because a stream's queue was full"
+)
+
+_collectors = (
+    http_requests_total,
+    http_request_duration_seconds,
+    db_queries_total,
+    db_query_duration_seconds,
+    upload_bytes_total,
+    http_requests_in_flight,
+    rate_limited_total,
+    load_shed_total,
+    live_update_streams,
+    live_update_dropped_total
+)
+
+
+class _RequestQueries:
+    """Per-request SQL timings, shared by reference with threadpool copies of the context"""
+
+    __slots__ = ("durations",)
+
+    def __init__(self):
+        self.durations: List[float] = []
+
+
+_current_queries: ContextVar[Optional[_RequestQueries]] = ContextVar("metrics_request_queries", default=None)
+
+
+def record_upload(category: str, size: int) -> None:
+    """Count bytes stored by an upload"""
+    upload_bytes_total.inc((category,), size)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach cursor execute hooks that attribute SQL timings to the current request"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_query_start", []).append(perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("metrics_query_start")
+        if not starts:
+            return
+        elapsed = perf_counter() - starts.pop()
+
+        queries = _current_queries.get()
+        if queries is not None:
+            queries.durations.append(elapsed)
+        else:
+            db_queries_total.inc(("background",))
+            db_query_duration_seconds.observe(("background",), elapsed)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request counts, latency and SQL cost per templated route"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter_ns()
+        status_code = 500
+        queries = _RequestQueries()
+        token = _current_queries.set(queries)
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _current_queries.reset(token)
+            elapsed = (perf_counter_ns() - start) / 1e9
+
+            # Routing stores the matched route in the scope; unmatched paths share one label
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+
+            http_requests_total.inc((method, route_path, f"{status_code // 100}xx"))
+            http_request_duration_seconds.observe((method, route_path), elapsed)
+            if queries.durations:
+                db_queries_total.inc((route_path,), len(queries.durations))
+                for duration in queries.durations:
+                    db_query_duration_seconds.observe((route_path,), duration)
+
+
+def pool_stats(engine: Engine) -> Dict[str, int]:
+    """Connection pool occupancy; zeros for pools that do not track it"""
+    pool = engine.pool
+    size = getattr(pool, "size", lambda: 0)()
+    return {
+        "size": size,
+        "capacity": size + max(getattr(pool, "_max_overflow", 0), 0),
+        "checked_out": getattr(pool, "checkedout", lambda: 0)(),
+        # QueuePool reports negative overflow while the pool is not yet full
+        "overflow": max(getattr(pool, "overflow", lambda: 0)(), 0)
+    }
+
+
+def threadpool_stats() -> Dict[str, int]:
+    """Occupancy of the threadpool that runs sync endpoints and dependencies"""
+    # Sync endpoints and dependencies run on anyio's default thread limiter
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    statistics = limiter.statistics()
+    return {
+        "capacity": int(limiter.total_tokens),
+        "busy": statistics.borrowed_tokens,
+        "waiting": statistics.tasks_waiting
+    }
+
+
+def render_metrics(engine: Engine) -> str:
+    """Render all metrics in the Prometheus text exposition format"""
+    lines: List[str] = []
+    for collector in _collectors:
+        lines.extend(collector.collect())
+
+    pool = pool_stats(engine)
+    threadpool = threadpool_stats()
+    gauges = {
+        "db_pool_size": ("Configured connection pool size", pool["size"]),
+        "db_pool_checked_out": ("Connections currently checked out", pool["checked_out"]),
+        "db_pool_overflow": ("Connections opened beyond the pool size", pool["overflow"]),
+        "threadpool_capacity": ("Worker threads available to sync endpoints", threadpool["capacity"]),
+        "threadpool_busy": ("Worker threads currently running sync endpoints", threadpool["busy"]),
+        "threadpool_queue_depth": ("Tasks waiting for a worker thread", threadpool["waiting"])
+    }
+
+    for name, (documentation, value) in gauges.items():
+        lines.append(f"# HELP {name} {documentation}")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {_format_value(value)}")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,202 @@
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+
+from .config import settings
+from .metrics import rate_limited_total
+from .security import verify_token
+
+
+logger = logging.getLogger(__name__)
+
+RATE_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Refill and take atomically; Redis' own clock keeps workers on different hosts consistent
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+def parse_rate(spec: str) -> Tuple[int, int]:
+    """Parse ``"10/minute"`` into (requests, period in seconds)"""
+    count, _, period = spec.partition("/")
+    period = period.strip().lower().rstrip("s")
+    if period not in RATE_PERIODS:
+        raise ValueError(f"Invalid rate limit {spec!r}; expected '<count>/<second|minute|hour|day>'")
+    return int(count), RATE_PERIODS[period]
+
+
+class MemoryTokenBuckets:
+    """Per-worker token buckets, evicting the least recently used key past ``max_keys``"""
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take_now(self, key: str, rate: float, capacity: float, cost: float = 1.0) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+    async def take(self, key: str, rate: float, capacity: float, cost: float = 1.0) -> float:
+        """Take ``cost`` tokens; returns 0 if allowed, else seconds until enough have refilled"""
+        return self.take_now(key, rate, capacity, cost)
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisTokenBuckets:
+    """Token buckets shared by every worker through Redis.
+
+    When Redis is unreachable the limiter degrades to per-worker buckets
+    rather than failing requests, and stops trying Redis for
+    ``retry_interval_seconds`` so each request does not pay a connect timeout.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        prefix: str = "ratelimit:",
+        timeout_seconds: float = 0.1,
+        retry_interval_seconds: float = 5.0
+    ):
+        import redis.asyncio as redis
+
+        self.prefix = prefix
+        self.retry_interval_seconds = retry_interval_seconds
+        self.fallback = MemoryTokenBuckets()
+        self._client = redis.from_url(
+            url, socket_timeout=timeout_seconds, socket_connect_timeout=timeout_seconds
+        )
+        self._script = self._client.register_script(_TOKEN_BUCKET_SCRIPT)
+        self._down_until = 0.0
+
+    async def take(self, key: str, rate: float, capacity: float, cost: float = 1.0) -> float:
+        if time.monotonic() < self._down_until:
+            return self.fallback.take_now(key, rate, capacity, cost)
+        try:
+            wait = await self._script(keys=[self.prefix + key], args=[rate, capacity, cost])
+            return float(wait)
+        except Exception as e:
+            logger.warning(f"Rate limit backend unavailable, using per-worker buckets: {e}")
+            self._down_until = time.monotonic() + self.retry_interval_seconds
+            return self.fallback.take_now(key, rate, capacity, cost)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class RateLimiter:
+    """Named token bucket policies over a storage backend"""
+
+    def __init__(self, policies: Dict[str, str], backend):
+        self.backend = backend
+        self.policies: Dict[str, Tuple[float, int]] = {}
+        for name, spec in policies.items():
+            count, period = parse_rate(spec)
+            # A full bucket allows one period's worth of requests as a burst
+            self.policies[name] = (count / period, count)
+
+    async def check(self, policy: str, identity: str) -> float:
+        """Seconds the caller must wait, or 0 if the request may proceed"""
+        limit = self.policies.get(policy)
+        if limit is None:
+            return 0.0
+        rate, capacity = limit
+        return await self.backend.take(f"{policy}:{identity}", rate, capacity)
+
+
+def client_identity(request: Request, key: str) -> str:
+    """Bucket key for the caller: the token subject for ``key="user"`` when present, else the client IP"""
+    if key == "user":
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and token:
+            # Signature check only; the endpoint's own auth still loads the user
+            subject = verify_token(token)
+            if subject is not None:
+                return f"user:{subject}"
+    host = request.client.host if request.client else "unknown"
+    return f"ip:{host}"
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Process-wide limiter configured from settings"""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                if settings.RATE_LIMIT_BACKEND == "redis":
+                    backend = RedisTokenBuckets(settings.REDIS_URL)
+                else:
+                    backend = MemoryTokenBuckets()
+                _limiter = RateLimiter(settings.RATE_LIMITS, backend)
+    return _limiter
+
+
+async def close_rate_limiter() -> None:
+    """Release the backend connection if the limiter was ever used"""
+    global _limiter
+    if _limiter is not None:
+        await _limiter.backend.close()
+        _limiter = None
+
+
+def rate_limit(policy: str, key: str = "ip", when: Optional[Callable[[Request], bool]] = None):
+    """Dependency enforcing a named policy from ``settings.RATE_LIMITS``.
+
+    ``key`` is ``"ip"`` or ``"user"``; ``when`` restricts the limit to the
+    requests it returns True for, e.g. only searches on a list endpoint.
+    """
+
+    async def dependency(request: Request) -> None:
+        if not settings.RATE_LIMIT_ENABLED or (when is not None and not when(request)):
+            return
+
+        wait = await get_rate_limiter().check(policy, client_identity(request, key))
+        if wait > 0:
+            rate_limited_total.inc((policy,))
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please try again later",
+                headers={"Retry-After": str(max(1, math.ceil(wait)))}
+            )
+
+    return dependency
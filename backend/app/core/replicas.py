@@ -0,0 +1,298 @@
+import functools
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .cache import TTLCache
+from .config import settings
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds behind the primary; an idle standby that has replayed everything it received is current
+LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+def measure_lag(engine: Engine) -> float:
+    """Replication lag of a Postgres standby in seconds"""
+    with engine.connect() as conn:
+        return float(conn.execute(LAG_QUERY).scalar())
+
+
+class Replica:
+    """A read replica and the outcome of its last lag check"""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.lag_seconds: Optional[float] = None  # None until a check succeeds
+        self.checked_at: Optional[float] = None
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+
+class ReplicaSet:
+    """Read replicas usable while their lag stays under ``max_lag_seconds``.
+
+    A daemon thread re-measures every replica each ``check_interval_seconds``.
+    A replica is only used when its last check succeeded, is recent, and
+    reported a lag within bounds, so a replica that is down or falling behind
+    is skipped until it recovers and reads go back to the primary. Healthy
+    replicas are picked round robin. ``lag_probe`` can be replaced to simulate
+    a lagging replica.
+    """
+
+    def __init__(
+        self,
+        engines: List[Engine],
+        max_lag_seconds: float = 5.0,
+        check_interval_seconds: float = 2.0,
+        lag_probe: Callable[[Engine], float] = measure_lag
+    ):
+        self.replicas = [Replica(engine) for engine in engines]
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.lag_probe = lag_probe
+        self._round_robin = itertools.count()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def check(self) -> None:
+        for replica in self.replicas:
+            try:
+                replica.lag_seconds = self.lag_probe(replica.engine)
+                replica.checked_at = time.monotonic()
+            except Exception as e:
+                replica.lag_seconds = None
+                logger.warning(f"Read replica {replica.name} is unavailable: {e}")
+
+    def healthy(self) -> List[Replica]:
+        # A check older than a few intervals means the monitor stalled; trust nothing
+        stale_before = time.monotonic() - self.check_interval_seconds * 3
+        return [
+            replica for replica in self.replicas
+            if replica.lag_seconds is not None
+            and replica.lag_seconds <= self.max_lag_seconds
+            and replica.checked_at >= stale_before
+        ]
+
+    def choose(self) -> Optional[Engine]:
+        """A healthy replica's engine, or None to use the primary"""
+        healthy = self.healthy()
+        if not healthy:
+            return None
+        return healthy[next(self._round_robin) % len(healthy)].engine
+
+    def start(self) -> None:
+        self.check()
+        self._thread = threading.Thread(target=self._run, name="replica-lag", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.check_interval_seconds * 2)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.check_interval_seconds):
+            self.check()
+
+
+class RecentWriters:
+    """User ids whose recent writes a replica may not have replayed yet, tracked in this worker"""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 10000):
+        self._local = TTLCache(ttl_seconds=ttl_seconds, max_entries=max_entries)
+
+    def mark(self, user_id: str) -> None:
+        self._local.set(user_id, True)
+
+    def is_recent(self, user_id: str) -> bool:
+        return self._local.get(user_id) is not None
+
+    def close(self) -> None:
+        pass
+
+
+class RedisRecentWriters(RecentWriters):
+    """Recent writers shared by every worker through expiring Redis keys.
+
+    A user's next request may land on any worker, so each write is recorded
+    in Redis for ``ttl_seconds`` as well as locally. When Redis is
+    unreachable only this worker's writes are seen, and Redis is not tried
+    again for ``retry_interval_seconds`` so each query does not pay a
+    connect timeout.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        ttl_seconds: int,
+        prefix: str = "replica:wrote:",
+        timeout_seconds: float = 0.1,
+        retry_interval_seconds: float = 5.0
+    ):
+        import redis
+
+        super().__init__(ttl_seconds)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self.retry_interval_seconds = retry_interval_seconds
+        # Called from sync sessions in the threadpool
+        self._client = redis.from_url(url, socket_timeout=timeout_seconds, socket_connect_timeout=timeout_seconds)
+        self._down_until = 0.0
+
+    def mark(self, user_id: str) -> None:
+        super().mark(user_id)
+        if time.monotonic() < self._down_until:
+            return
+        try:
+            self._client.set(self.prefix + user_id, 1, ex=self.ttl_seconds)
+        except Exception as e:
+            self._unavailable(e)
+
+    def is_recent(self, user_id: str) -> bool:
+        if super().is_recent(user_id):
+            return True
+        if time.monotonic() < self._down_until:
+            return False
+        try:
+            return bool(self._client.exists(self.prefix + user_id))
+        except Exception as e:
+            self._unavailable(e)
+            return False
+
+    def close(self) -> None:
+        self._client.close()
+
+    def _unavailable(self, e: Exception) -> None:
+        logger.warning(f"Replica stickiness backend unavailable, tracking this worker's writes only: {e}")
+        self._down_until = time.monotonic() + self.retry_interval_seconds
+
+
+if settings.REPLICA_STICKY_BACKEND == "redis":
+    recent_writers: RecentWriters = RedisRecentWriters(settings.REDIS_URL, settings.REPLICA_STICKY_SECONDS)
+else:
+    recent_writers = RecentWriters(settings.REPLICA_STICKY_SECONDS)
+
+_replica_set: Optional[ReplicaSet] = None
+
+
+class RoutingSession(Session):
+    """Session sending queries made inside ``read_only`` methods to a replica when it is safe.
+
+    Everything else, flushes, and any query after this session has written
+    goes to the primary. Requests of a user who committed a write within
+    REPLICA_STICKY_SECONDS also stay on the primary so they read their own
+    writes, so the window should be longer than REPLICA_MAX_LAG_SECONDS,
+    which bounds staleness everywhere else. With the "memory" sticky backend
+    the window only covers requests served by the worker that took the
+    write; multi-worker deployments with replicas should use "redis".
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            _replica_set is not None
+            and self.info.get("read_only")
+            and not self.info.get("wrote")
+            and not self._flushing
+            and not getattr(clause, "is_dml", False)
+        ):
+            if not self._recent_writer():
+                replica = _replica_set.choose()
+                if replica is not None:
+                    return replica
+        return super().get_bind(mapper, clause=clause, **kw)
+
+    def _recent_writer(self) -> bool:
+        user_id = self.info.get("user_id")
+        if user_id is None:
+            return False
+        # Looked up once per session; a shared backend costs a round trip
+        if "recent_writer" not in self.info:
+            self.info["recent_writer"] = recent_writers.is_recent(user_id)
+        return self.info["recent_writer"]
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_dml(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_flush(session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_writer(session) -> None:
+    if session.info.pop("wrote", False) and session.info.get("user_id") is not None:
+        recent_writers.mark(session.info["user_id"])
+        session.info["recent_writer"] = True
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _forget_writes(session) -> None:
+    session.info.pop("wrote", None)
+
+
+@contextmanager
+def use_replica(session: Session) -> Iterator[None]:
+    """Let queries in this block read from a replica; nested blocks keep the outer setting"""
+    previous = session.info.get("read_only", False)
+    session.info["read_only"] = True
+    try:
+        yield
+    finally:
+        session.info["read_only"] = previous
+
+
+def read_only(method):
+    """Mark a service method whose queries may be served by a read replica"""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with use_replica(self.db):
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def start_replica_monitor(engines: List[Engine]) -> None:
+    """Measure replica lag for the life of the worker and route reads to healthy replicas"""
+    global _replica_set
+    if _replica_set is None and engines:
+        _replica_set = ReplicaSet(
+            engines,
+            max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS,
+            check_interval_seconds=settings.REPLICA_CHECK_INTERVAL_SECONDS
+        )
+        _replica_set.start()
+
+
+def stop_replica_monitor() -> None:
+    global _replica_set
+    if _replica_set is not None:
+        _replica_set.stop()
+        _replica_set = None
+    recent_writers.close()
+
+
+def get_replica_set() -> Optional[ReplicaSet]:
+    return _replica_set
@@ -0,0 +1,69 @@
+import hashlib
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Type
+
+from fastapi import Request, Response, status
+from pydantic import BaseModel, TypeAdapter
+
+
+class PydanticJSONResponse(Response):
+    """JSON body already serialized by pydantic-core"""
+
+    media_type = "application/json"
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """Cached TypeAdapter validating and serializing List[model] in one pass"""
+    return TypeAdapter(List[model])
+
+
+def model_response(instance: BaseModel, status_code: int = status.HTTP_200_OK) -> Response:
+    """Serialize an already-built response model without validating it again"""
+    return PydanticJSONResponse(
+        content=type(instance).__pydantic_serializer__.to_json(instance),
+        status_code=status_code
+    )
+
+
+def model_list_response(
+    model: Type[BaseModel],
+    items: Iterable[Any],
+    status_code: int = status.HTTP_200_OK
+) -> Response:
+    """Validate ORM rows (or dicts) as List[model] and serialize them straight to JSON.
+
+    Endpoints keep ``response_model`` for the OpenAPI schema; returning this
+    response skips FastAPI's second validation and jsonable_encoder pass.
+    """
+    adapter = list_adapter(model)
+    validated = adapter.validate_python(list(items), from_attributes=True)
+    return PydanticJSONResponse(content=adapter.dump_json(validated), status_code=status_code)
+
+
+def etag_for(content: bytes) -> str:
+    """Strong ETag derived from the response body"""
+    return '"' + hashlib.blake2b(content, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison, as If-None-Match requires; compression may have weakened the tag we sent"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def conditional_model_response(
+    request: Request,
+    instance: BaseModel,
+    cache_control: str = "private, no-cache"
+) -> Response:
+    """Serialize a response model with an ETag and answer 304 if the client already has this body"""
+    content = type(instance).__pydantic_serializer__.to_json(instance)
+    etag = etag_for(content)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return PydanticJSONResponse(content=content, headers=headers)
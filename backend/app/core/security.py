@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
 from typing import Any, Union, Optional
+import uuid
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from .config import settings
@@ -9,9 +10,9 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def create_access_token(
-    subject: Union[str, Any], expires_delta: timedelta = None
+    subject: Union[str, Any], expires_delta: timedelta = None, version: int = 0, role: Optional[str] = None
 ) -> str:
-    """Create JWT access token"""
+    """Create JWT access token carrying a unique id, the user's token version and optionally their role"""
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
@@ -19,7 +20,13 @@ def create_access_token(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {
+        "exp": expire, "sub": str(subject), "type": "access",
+        "jti": uuid.uuid4().hex, "ver": version
+    }
+    # Lets middleware gate admin-only diagnostics without a database lookup
+    if role is not None:
+        to_encode["role"] = role
     encoded_jwt = jwt.encode(
         to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
     )
@@ -27,9 +34,9 @@ def create_access_token(
 
 
 def create_refresh_token(
-    subject: Union[str, Any], expires_delta: timedelta = None
+    subject: Union[str, Any], expires_delta: timedelta = None, version: int = 0
 ) -> str:
-    """Create JWT refresh token"""
+    """Create JWT refresh token carrying a unique id and the user's token version"""
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
@@ -37,13 +44,38 @@ def create_refresh_token(
             days=settings.REFRESH_TOKEN_EXPIRE_DAYS
         )
     
-    to_encode = {"exp": expire, "sub": str(subject), "type": "refresh"}
+    to_encode = {
+        "exp": expire, "sub": str(subject), "type": "refresh",
+        "jti": uuid.uuid4().hex, "ver": version
+    }
     encoded_jwt = jwt.encode(
         to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
     )
     return encoded_jwt
 
 
+def create_calendar_token(subject: Union[str, Any], version: int = 0) -> str:
+    """Create a non-expiring JWT for a user's calendar feed URL; revoked with the user's other tokens"""
+    to_encode = {
+        "sub": str(subject), "type": "calendar",
+        "jti": uuid.uuid4().hex, "ver": version
+    }
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def decode_token(token: str) -> Optional[dict]:
+    """Verify JWT signature and expiry and return its claims"""
+    try:
+        payload = jwt.decode(
+            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+        )
+    except JWTError:
+        return None
+    if payload.get("sub") is None:
+        return None
+    return payload
+
+
 def verify_token(token: str) -> Optional[str]:
     """Verify JWT token and return subject"""
     try:
@@ -0,0 +1,275 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from time import perf_counter
+from typing import Any, Deque, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .sql_profiler import normalize_statement
+
+
+logger = logging.getLogger(__name__)
+
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+# Parameter values shown as-is; strings, bytes and JSON may carry user data
+_SAFE_TYPES = (bool, int, float, Decimal, UUID, datetime, date, type(None))
+
+# Plans still waiting for the EXPLAIN thread before new requests are dropped
+_MAX_PENDING_EXPLAINS = 16
+
+
+def _redact(value: Any) -> Any:
+    if isinstance(value, _SAFE_TYPES):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_redact(item) for item in value]
+    return f"<{type(value).__name__}>"
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """Keep ids, numbers and timestamps of bound parameters; replace everything else with its type"""
+    if isinstance(parameters, dict):
+        return {key: _redact(value) for key, value in parameters.items()}
+    return _redact(parameters)
+
+
+_current_scope: ContextVar[Optional[Scope]] = ContextVar("slow_query_scope", default=None)
+
+
+def _route_label() -> str:
+    scope = _current_scope.get()
+    if scope is None:
+        return "background"
+    # Routing stores the matched route in the scope once it has run
+    route = scope.get("route")
+    return f"{scope['method']} {getattr(route, 'path', None) or 'unmatched'}"
+
+
+class SlowQuerySampler:
+    """Sample statements slower than a threshold, grouped by shape.
+
+    Every slow execution goes into a ring buffer of the last ``capacity``
+    samples with its redacted parameters, duration and route, and into
+    per-shape totals, an application-level, slow-only cousin of
+    pg_stat_statements. At most ``max_shapes`` shapes are kept; the least
+    recently seen one is dropped first. Faster statements only cost a clock
+    read. With ``explain`` on, a shape's first slow execution (and again after
+    ``explain_interval_seconds``) is EXPLAINed without ANALYZE on a background
+    thread, so nothing is executed twice and requests never wait for it.
+
+    Samples are per worker process.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float = 200,
+        capacity: int = 500,
+        max_shapes: int = 1000,
+        explain: bool = False,
+        explain_interval_seconds: float = 300
+    ):
+        self.threshold_ms = threshold_ms
+        self.max_shapes = max_shapes
+        self.explain = explain
+        self.explain_interval_seconds = explain_interval_seconds
+        self._samples: Deque[dict] = deque(maxlen=capacity)
+        self._shapes: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        # Set on the EXPLAIN thread so its own statements are not sampled
+        self._explaining = threading.local()
+
+    def install(self, engine: Engine) -> None:
+        """Attach cursor hooks timing every statement on the engine"""
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("slow_query_start", []).append(perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            starts = conn.info.get("slow_query_start")
+            if not starts:
+                return
+            duration = perf_counter() - starts.pop()
+            if duration * 1000 < self.threshold_ms or getattr(self._explaining, "active", False):
+                return
+            self.record(statement, parameters, duration, executemany, _route_label(), conn.engine)
+
+    def record(
+        self,
+        statement: str,
+        parameters: Any,
+        duration: float,
+        executemany: bool,
+        route: str,
+        engine: Optional[Engine] = None
+    ) -> None:
+        shape = normalize_statement(statement)
+        duration_ms = round(duration * 1000, 3)
+        now = time.time()
+
+        if executemany:
+            redacted = {"rows": len(parameters), "first": redact_parameters(parameters[0]) if parameters else None}
+        else:
+            redacted = redact_parameters(parameters)
+
+        sample = {
+            "shape": shape,
+            "parameters": redacted,
+            "duration_ms": duration_ms,
+            "route": route,
+            "at": datetime.fromtimestamp(now, timezone.utc)
+        }
+
+        explain = False
+        with self._lock:
+            self._samples.append(sample)
+            stats = self._shapes.get(shape)
+            if stats is None:
+                stats = self._shapes[shape] = {
+                    "shape": shape,
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "routes": {},
+                    "last_seen": None,
+                    "plan": None,
+                    "explained_at": None
+                }
+                if len(self._shapes) > self.max_shapes:
+                    self._shapes.popitem(last=False)
+            else:
+                self._shapes.move_to_end(shape)
+
+            stats["count"] += 1
+            stats["total_ms"] += duration_ms
+            stats["max_ms"] = max(stats["max_ms"], duration_ms)
+            stats["routes"][route] = stats["routes"].get(route, 0) + 1
+            stats["last_seen"] = sample["at"]
+
+            if (
+                self.explain
+                and not executemany
+                and engine is not None
+                and engine.dialect.name == "postgresql"
+                and statement.lstrip().upper().startswith(EXPLAINABLE)
+                and self._pending < _MAX_PENDING_EXPLAINS
+                and (stats["explained_at"] is None or now - stats["explained_at"] >= self.explain_interval_seconds)
+            ):
+                stats["explained_at"] = now
+                self._pending += 1
+                explain = True
+
+        if explain:
+            self._explain_executor().submit(self._explain, engine, shape, statement, parameters)
+
+    def _explain_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+            return self._executor
+
+    def _explain(self, engine: Engine, shape: str, statement: str, parameters: Any) -> None:
+        self._explaining.active = True
+        try:
+            # On the engine that ran it, so a replica's plan reflects the replica; nothing is executed
+            with engine.connect() as conn:
+                plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+            plan = (plan if isinstance(plan, list) else json.loads(plan))[0]["Plan"]
+        except Exception as e:
+            plan = {"error": str(e).splitlines()[0]}
+        finally:
+            self._explaining.active = False
+
+        with self._lock:
+            self._pending -= 1
+            stats = self._shapes.get(shape)
+            if stats is not None:
+                stats["plan"] = plan
+
+    def top_shapes(self, limit: int = 20, order_by: str = "total_ms") -> List[dict]:
+        """Slowest statement shapes with counts, total and mean time, routes and plan"""
+        with self._lock:
+            shapes = [
+                {
+                    **stats,
+                    "total_ms": round(stats["total_ms"], 3),
+                    "mean_ms": round(stats["total_ms"] / stats["count"], 3),
+                    "routes": dict(stats["routes"])
+                }
+                for stats in self._shapes.values()
+            ]
+        shapes.sort(key=lambda stats: stats[order_by], reverse=True)
+        return shapes[:limit]
+
+    def recent(self, limit: int = 50) -> List[dict]:
+        """Most recent slow samples, newest first"""
+        with self._lock:
+            samples = list(self._samples)
+        return samples[::-1][:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._shapes.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class SlowQueryMiddleware:
+    """Pure ASGI middleware exposing the request being served so slow statements name their route"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_scope.reset(token)
+
+
+_sampler: Optional[SlowQuerySampler] = None
+
+
+def install_slow_query_sampler(engines: Sequence[Engine], **options) -> SlowQuerySampler:
+    """Create the worker's sampler and hook it into the engines"""
+    global _sampler
+    if _sampler is None:
+        _sampler = SlowQuerySampler(**options)
+        for engine in engines:
+            _sampler.install(engine)
+    return _sampler
+
+
+def get_slow_query_sampler() -> Optional[SlowQuerySampler]:
+    """The worker's sampler, or None when sampling is disabled"""
+    return _sampler
+
+
+def close_slow_query_sampler() -> None:
+    """Stop the EXPLAIN thread; samples stay readable"""
+    if _sampler is not None:
+        _sampler.close()
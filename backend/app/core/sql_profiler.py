@@ -0,0 +1,275 @@
+import json
+import os
+import re
+import traceback
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+# Request header that turns profiling on for a single request: "summary" or "json"
+PROFILE_HEADER = "X-SQL-Profile"
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_THIS_FILE = os.path.abspath(__file__)
+
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PARAMS = re.compile(r"%\([^)]+\)s|%s")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """Reduce a SQL statement to its shape so repeated queries group together"""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _LITERALS.sub("?", shape)
+    shape = _PARAMS.sub("?", shape)
+    # IN lists of any length share one shape
+    shape = _IN_LIST.sub("(?)", shape)
+    return shape
+
+
+def _call_site(limit: int) -> List[str]:
+    """Innermost application frames that led to the statement"""
+    frames = [
+        frame for frame in traceback.extract_stack()
+        if frame.filename.startswith(_APP_DIR) and os.path.abspath(frame.filename) != _THIS_FILE
+    ]
+    return [
+        f"{os.path.relpath(frame.filename, _APP_DIR)}:{frame.lineno} in {frame.name}"
+        for frame in frames[-limit:]
+    ]
+
+
+class SQLProfile:
+    """Statements executed inside one profiling scope"""
+
+    def __init__(self, n_plus_one_threshold: int = 3, stack_depth: int = 5):
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.stack_depth = stack_depth
+        self.statements: List[dict] = []
+        # Header-driven profiles only report once an admin has been resolved
+        self.authorized = True
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def total_ms(self) -> float:
+        return round(sum(item["duration_ms"] for item in self.statements), 3)
+
+    def record(self, statement: str, duration: float, executemany: bool) -> None:
+        self.statements.append({
+            "statement": statement,
+            "shape": normalize_statement(statement),
+            "duration_ms": round(duration * 1000, 3),
+            "executemany": executemany,
+            "stack": _call_site(self.stack_depth)
+        })
+
+    def repeated_shapes(self) -> List[dict]:
+        """Statement shapes executed often enough to look like an N+1"""
+        counts = Counter(item["shape"] for item in self.statements)
+        repeated = []
+        for shape, count in counts.most_common():
+            if count < self.n_plus_one_threshold:
+                break
+            first = next(item for item in self.statements if item["shape"] == shape)
+            repeated.append({
+                "shape": shape,
+                "count": count,
+                "total_ms": round(sum(
+                    item["duration_ms"] for item in self.statements if item["shape"] == shape
+                ), 3),
+                "stack": first["stack"]
+            })
+        return repeated
+
+    def summary_header(self) -> str:
+        return f"count={self.count}; total_ms={self.total_ms}; repeated={len(self.repeated_shapes())}"
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": self.total_ms,
+            "possible_n_plus_one": self.repeated_shapes(),
+            "statements": self.statements
+        }
+
+
+_current_profile: ContextVar[Optional[SQLProfile]] = ContextVar("sql_profile", default=None)
+
+
+def current_profile() -> Optional[SQLProfile]:
+    """Profile collecting statements for the running request, if any"""
+    return _current_profile.get()
+
+
+def authorize_profile(user) -> None:
+    """Allow header-driven profiling output once the caller is known to be an admin"""
+    profile = _current_profile.get()
+    if profile is None or profile.authorized:
+        return
+
+    from ..models.user import UserRole
+    if user is not None and user.role == UserRole.ADMIN:
+        profile.authorized = True
+
+
+@contextmanager
+def profile_queries(n_plus_one_threshold: int = 3, stack_depth: int = 5) -> Iterator[SQLProfile]:
+    """Collect every statement executed in this context (and threads spawned from it)"""
+    profile = SQLProfile(n_plus_one_threshold, stack_depth)
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+
+
+def install_sql_profiler(engine: Engine) -> None:
+    """Attach cursor hooks that feed the active SQLProfile; no-ops outside a profile"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current_profile.get() is not None:
+            conn.info.setdefault("sql_profile_start", []).append(perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        profile = _current_profile.get()
+        starts = conn.info.get("sql_profile_start")
+        if profile is None or not starts:
+            return
+        profile.record(statement, perf_counter() - starts.pop(), executemany)
+
+
+def _admin_claims(scope: Scope) -> bool:
+    """Whether the request carries a valid, unrevoked access token with the admin role claim"""
+    from ..models.user import UserRole
+    from .security import decode_token
+    from .token_revocation import revocation_list
+
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer":
+                return False
+            claims = decode_token(token.strip())
+            return (
+                claims is not None
+                and claims.get("type", "access") == "access"
+                and claims.get("role") == UserRole.ADMIN
+                and not revocation_list.is_revoked(claims)
+            )
+    return False
+
+
+class SQLProfilerMiddleware:
+    """Profile SQL per request and report it in a header or a debug JSON body.
+
+    Profiling is always on when ``always_on`` is set. Otherwise a request opts
+    in with ``X-SQL-Profile: summary`` or ``X-SQL-Profile: json``; the header
+    is ignored unless the bearer token claims the admin role, so anonymous
+    clients cannot make requests pay for stack capture and buffering. Output
+    is still only produced once the user loaded from the database is an admin.
+    Streamed and non-JSON responses are passed through unbuffered.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        always_on: bool = False,
+        n_plus_one_threshold: int = 3,
+        stack_depth: int = 5
+    ):
+        self.app = app
+        self.always_on = always_on
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.stack_depth = stack_depth
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        mode = None
+        for name, value in scope["headers"]:
+            if name == b"x-sql-profile":
+                mode = value.decode("latin-1").strip().lower()
+                break
+
+        if not self.always_on and (mode is None or not _admin_claims(scope)):
+            await self.app(scope, receive, send)
+            return
+
+        with profile_queries(self.n_plus_one_threshold, self.stack_depth) as profile:
+            profile.authorized = self.always_on
+            if mode == "json":
+                await self._send_json(profile, scope, receive, send)
+            else:
+                await self._send_summary(profile, scope, receive, send)
+
+    async def _send_summary(self, profile: SQLProfile, scope: Scope, receive: Receive, send: Send) -> None:
+        async def send_with_summary(message: Message) -> None:
+            if message["type"] == "http.response.start" and profile.authorized:
+                headers = MutableHeaders(scope=message)
+                headers.append(PROFILE_HEADER, profile.summary_header())
+            await send(message)
+
+        await self.app(scope, receive, send_with_summary)
+
+    async def _send_json(self, profile: SQLProfile, scope: Scope, receive: Receive, send: Send) -> None:
+        start_message: Optional[Message] = None
+        body = bytearray()
+        passthrough = False
+
+        async def buffer_response(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+            elif message["type"] == "http.response.start":
+                # Only JSON bodies can be wrapped; event streams must reach the client as they are produced
+                content_type = MutableHeaders(scope=message).get("content-type", "")
+                if not content_type.startswith("application/json"):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+            elif message["type"] == "http.response.body":
+                body.extend(message.get("body", b""))
+
+        await self.app(scope, receive, buffer_response)
+        if start_message is None:
+            return
+
+        if not profile.authorized:
+            await send(start_message)
+            await send({"type": "http.response.body", "body": bytes(body)})
+            return
+
+        try:
+            response_body = json.loads(body) if body else None
+        except ValueError:
+            response_body = body.decode("utf-8", errors="replace")
+
+        payload = json.dumps({
+            "status_code": start_message["status"],
+            "response": response_body,
+            "sql_profile": profile.as_dict()
+        }, default=str).encode("utf-8")
+
+        headers = MutableHeaders(scope=start_message)
+        headers["content-type"] = "application/json"
+        headers["content-length"] = str(len(payload))
+        headers[PROFILE_HEADER] = profile.summary_header()
+        await send(start_message)
+        await send({"type": "http.response.body", "body": payload})
@@ -0,0 +1,45 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+
+logger = logging.getLogger("app.startup")
+
+
+class StartupReport:
+    """Wall-clock timings for importing the app and for each lifespan phase"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.import_seconds: Optional[float] = None
+        self.phases: List[Tuple[str, float]] = []
+
+    def mark_imported(self) -> None:
+        """Record the time spent importing the application modules"""
+        self.import_seconds = time.perf_counter() - self.started
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time one lifespan startup step"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - started))
+
+    def as_dict(self) -> dict:
+        return {
+            "import_ms": round((self.import_seconds or 0.0) * 1000, 1),
+            "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in self.phases},
+            "total_ms": round(((self.import_seconds or 0.0) + sum(s for _, s in self.phases)) * 1000, 1)
+        }
+
+    def log(self) -> None:
+        report = self.as_dict()
+        phases = ", ".join(f"{name}={ms}ms" for name, ms in report["phases_ms"].items())
+        logger.info(f"Startup took {report['total_ms']}ms (import={report['import_ms']}ms, {phases})")
+
+
+# Created when app.main starts importing, so import_seconds covers the whole app
+startup_report = StartupReport()
@@ -0,0 +1,33 @@
+import re
+
+
+EXCERPT_LENGTH = 300
+SHORT_DESCRIPTION_LENGTH = 200
+
+_MARKDOWN_IMAGE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+_MARKDOWN_LINK = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+_CODE_FENCE = re.compile(r"```.*?```", re.DOTALL)
+_HTML_TAG = re.compile(r"<[^>]+>")
+_MARKDOWN_SYNTAX = re.compile(r"^\s{0,3}(#{1,6}|>|[-*+]|\d+\.)\s+|[*_`~]", re.MULTILINE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def plain_text(markdown: str) -> str:
+    """Strip markdown/HTML markup and collapse whitespace"""
+    text = _CODE_FENCE.sub(" ", markdown)
+    text = _MARKDOWN_IMAGE.sub(" ", text)
+    text = _MARKDOWN_LINK.sub(r"\1", text)
+    text = _HTML_TAG.sub(" ", text)
+    text = _MARKDOWN_SYNTAX.sub("", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def make_excerpt(markdown: str, length: int = EXCERPT_LENGTH) -> str:
+    """Plain-text summary of at most ``length`` characters, cut at a word boundary"""
+    text = plain_text(markdown or "")
+    if len(text) <= length:
+        return text
+
+    head = text[:length + 1]
+    cut = head.rsplit(" ", 1)[0] if " " in head else text[:length]
+    return cut.rstrip(" .,;:-")
@@ -0,0 +1,202 @@
+import logging
+import select
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .config import settings
+
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "token_revocations"
+
+
+class RevocationList:
+    """In-memory mirror of revoked token ids and per-user token versions.
+
+    A token is revoked if its ``jti`` was revoked individually (logout) or if
+    its ``ver`` claim is older than the user's current token version
+    (deactivation, password reset, logout everywhere). Both checks are
+    dictionary lookups, so authenticating a request needs no network round
+    trip. Entries only ever get added; revoked ids are dropped once the token
+    would have expired anyway.
+    """
+
+    def __init__(self):
+        self._tokens: Dict[str, float] = {}  # jti -> expiry as a Unix timestamp
+        self._versions: Dict[str, int] = {}  # user id -> current token version
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._tokens) + len(self._versions)
+
+    def is_revoked(self, claims: dict) -> bool:
+        jti = claims.get("jti")
+        if jti is not None and jti in self._tokens:
+            return True
+        return claims.get("ver", 0) < self._versions.get(str(claims.get("sub")), 0)
+
+    def add_token(self, jti: str, expires_at: float) -> None:
+        with self._lock:
+            self._tokens[jti] = expires_at
+
+    def set_user_version(self, user_id: str, version: int) -> None:
+        with self._lock:
+            # Versions only move forward; a late or replayed message must not undo a newer one
+            if version > self._versions.get(user_id, 0):
+                self._versions[user_id] = version
+
+    def merge(self, tokens: Iterable[Tuple[str, float]], versions: Iterable[Tuple[str, int]]) -> None:
+        """Fold in a full snapshot from the store and drop expired token ids"""
+        now = time.time()
+        with self._lock:
+            self._tokens.update(tokens)
+            for jti in [jti for jti, expires_at in self._tokens.items() if expires_at < now]:
+                del self._tokens[jti]
+            for user_id, version in versions:
+                if version > self._versions.get(user_id, 0):
+                    self._versions[user_id] = version
+
+    def apply(self, payload: str) -> None:
+        """Apply a ``token:<jti>:<exp>`` or ``user:<id>:<version>`` notification"""
+        kind, _, rest = payload.partition(":")
+        key, _, value = rest.rpartition(":")
+        try:
+            if kind == "token":
+                self.add_token(key, float(value))
+            elif kind == "user":
+                self.set_user_version(key, int(value))
+        except ValueError:
+            logger.warning(f"Ignoring malformed token revocation message {payload!r}")
+
+
+revocation_list = RevocationList()
+
+
+def notify_revocation(db: Session, payload: str) -> None:
+    """Tell every worker about a revocation; Postgres delivers it when the transaction commits"""
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": NOTIFY_CHANNEL, "payload": payload})
+
+
+def load_revocations(db: Session) -> None:
+    """Merge the stored revocations into the mirror and purge expired revoked ids"""
+    from ..models.user import RevokedToken, User
+
+    db.query(RevokedToken).filter(RevokedToken.expires_at < text("now()")).delete(synchronize_session=False)
+    db.commit()
+
+    tokens = db.query(RevokedToken.jti, RevokedToken.expires_at).all()
+    versions = db.query(User.id, User.token_version).filter(User.token_version > 0).all()
+    revocation_list.merge(
+        ((jti, expires_at.timestamp()) for jti, expires_at in tokens),
+        ((str(user_id), version) for user_id, version in versions)
+    )
+
+
+class RevocationListener:
+    """Keep the mirror current from Postgres LISTEN/NOTIFY on a daemon thread.
+
+    The listener holds one dedicated connection outside the pool. After every
+    (re)connect, and every ``resync_seconds`` regardless, it reloads the full
+    store so notifications missed while disconnected are picked up. Other
+    databases have no NOTIFY and fall back to the periodic reload alone.
+    """
+
+    def __init__(self, engine: Engine, resync_seconds: float = 300, poll_seconds: float = 1.0):
+        self.engine = engine
+        self.resync_seconds = resync_seconds
+        self.poll_seconds = poll_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def resync(self) -> None:
+        from .database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            load_revocations(db)
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        try:
+            self.resync()
+        except Exception as e:
+            # Workers still boot; the listener keeps retrying the load
+            logger.warning(f"Could not load token revocations at startup: {e}")
+        self._thread = threading.Thread(target=self._run, name="token-revocations", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_seconds * 2)
+            self._thread = None
+
+    def _run(self) -> None:
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                if self.engine.dialect.name == "postgresql":
+                    self._listen()
+                else:
+                    self._poll()
+                backoff = 1.0
+            except Exception as e:
+                logger.warning(f"Token revocation listener failed, retrying in {backoff:.0f}s: {e}")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 60.0)
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self.resync_seconds):
+            self.resync()
+
+    def _listen(self) -> None:
+        connection = self.engine.raw_connection()
+        dbapi_connection = connection.driver_connection
+        # Detached so the LISTEN session is never handed to a request
+        connection.detach()
+        try:
+            dbapi_connection.autocommit = True
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+
+            self.resync()
+            next_resync = time.monotonic() + self.resync_seconds
+            while not self._stop.is_set():
+                readable, _, _ = select.select([dbapi_connection], [], [], self.poll_seconds)
+                if readable:
+                    dbapi_connection.poll()
+                    while dbapi_connection.notifies:
+                        revocation_list.apply(dbapi_connection.notifies.pop(0).payload)
+                if time.monotonic() >= next_resync:
+                    self.resync()
+                    next_resync = time.monotonic() + self.resync_seconds
+        finally:
+            dbapi_connection.close()
+
+
+_listener: Optional[RevocationListener] = None
+
+
+def start_token_revocation_listener() -> None:
+    """Load the revocation mirror and follow changes for the life of the worker"""
+    global _listener
+    from .database import engine
+
+    if _listener is None:
+        _listener = RevocationListener(engine, resync_seconds=settings.TOKEN_REVOCATION_RESYNC_SECONDS)
+        _listener.start()
+
+
+def stop_token_revocation_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -1,18 +1,33 @@
+# Imported first so the startup report covers every module import below
+from .core.startup import startup_report
+
 from fastapi import FastAPI, Request, status, HTTPException
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
-import time
 import logging
-import os
 import traceback
 from contextlib import asynccontextmanager
 
 from .core.config import settings
-from .core.database import init_db, check_db_connection, engine, Base
+from .core.database import check_db_connection, engine, replica_engines
+from .core.access_log import AccessLogMiddleware, start_access_log_listener, stop_access_log_listener
+from .core.activity import start_activity_flusher, stop_activity_flusher
+from .core.live_updates import start_live_updates, stop_live_updates
+from .core.cache import TTLCache
+from .core.compression import CompressionMiddleware
+from .core.content import shutdown_content_renderer
+from .core.google_verifier import close_google_verifier
+from .core.load_shedding import LoadSheddingMiddleware
+from .core.metrics import MetricsMiddleware, instrument_engine, render_metrics
+from .core.rate_limit import close_rate_limiter
+from .core.replicas import start_replica_monitor, stop_replica_monitor
+from .core.slow_queries import SlowQueryMiddleware, close_slow_query_sampler, install_slow_query_sampler
+from .core.sql_profiler import SQLProfilerMiddleware, install_sql_profiler
+from .core.token_revocation import start_token_revocation_listener, stop_token_revocation_listener
 from .api import api_router
 
 # Configure logging
@@ -28,42 +43,46 @@ async def lifespan(app: FastAPI):
     """Application lifespan events"""
     # Startup
     logger.info("Starting up LMS Backend API...")
+    with startup_report.phase("access_log"):
+        start_access_log_listener()
     
-    # Check database connection
-    if not check_db_connection():
-        logger.error("Failed to connect to database")
-        raise Exception("Database connection failed")
+    # Schema changes are applied by Alembic (see migrate.py), never at boot
+    if settings.STARTUP_CHECK_DB:
+        with startup_report.phase("database_check"):
+            if not check_db_connection():
+                logger.error("Failed to connect to database")
+                raise Exception("Database connection failed")
+        logger.info("Database connection successful")
     
-    logger.info("Database connection successful")
+    with startup_report.phase("token_revocation"):
+        start_token_revocation_listener()
     
-    # Create database tables
-    try:
-        Base.metadata.create_all(bind=engine)
-        logger.info("Database tables created successfully")
-    except Exception as e:
-        logger.error(f"Failed to create database tables: {e}")
-        raise
+    if replica_engines:
+        with startup_report.phase("replicas"):
+            start_replica_monitor(replica_engines)
     
-    # Create upload directories
-    upload_dirs = [
-        settings.UPLOAD_DIR,
-        os.path.join(settings.UPLOAD_DIR, "images"),
-        os.path.join(settings.UPLOAD_DIR, "videos"),
-        os.path.join(settings.UPLOAD_DIR, "documents"),
-        os.path.join(settings.UPLOAD_DIR, "attachments"),
-        os.path.join(settings.UPLOAD_DIR, "temp")
-    ]
+    with startup_report.phase("activity"):
+        start_activity_flusher(engine)
     
-    for directory in upload_dirs:
-        os.makedirs(directory, exist_ok=True)
-        logger.info(f"Created upload directory: {directory}")
+    with startup_report.phase("live_updates"):
+        await start_live_updates()
     
+    startup_report.log()
     logger.info("LMS Backend API started successfully")
     
     yield
     
     # Shutdown
     logger.info("Shutting down LMS Backend API...")
+    await stop_live_updates()
+    shutdown_content_renderer()
+    close_google_verifier()
+    await close_rate_limiter()
+    await stop_activity_flusher()
+    close_slow_query_sampler()
+    stop_token_revocation_listener()
+    stop_replica_monitor()
+    stop_access_log_listener()
 
 
 # Create FastAPI app
@@ -75,10 +94,22 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url=f"{settings.API_V1_STR}/docs",
     redoc_url=f"{settings.API_V1_STR}/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
-# Add CORS middleware first
+# Shed load before any work is done; innermost so 503s still get CORS headers and are logged
+if settings.LOAD_SHEDDING_ENABLED:
+    app.add_middleware(
+        LoadSheddingMiddleware,
+        engine=engine,
+        max_in_flight=settings.LOAD_SHED_MAX_IN_FLIGHT,
+        threadpool_queue_threshold=settings.LOAD_SHED_THREADPOOL_QUEUE,
+        pool_queue_threshold=settings.LOAD_SHED_POOL_QUEUE,
+        retry_after_seconds=settings.LOAD_SHED_RETRY_AFTER_SECONDS
+    )
+
+# Add CORS middleware
 if settings.BACKEND_CORS_ORIGINS:
     app.add_middleware(
         CORSMiddleware,
@@ -95,38 +126,53 @@ app.add_middleware(
 )
 
 
-# Request timing middleware
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
+# Request timing and access logging middleware
+app.add_middleware(
+    AccessLogMiddleware,
+    sample_rate=settings.ACCESS_LOG_SAMPLE_RATE,
+    slow_request_ms=settings.ACCESS_LOG_SLOW_MS
+)
 
+# Per-route request and SQL metrics
+if settings.METRICS_ENABLED:
+    for bound_engine in (engine, *replica_engines):
+        instrument_engine(bound_engine)
+    app.add_middleware(MetricsMiddleware)
 
-# Request logging middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    start_time = time.time()
-    
-    # Log request
-    logger.info(
-        f"Request: {request.method} {request.url.path} - "
-        f"Client: {request.client.host if request.client else 'unknown'}"
+# Slow statements sampled by shape, with their route and plan
+if settings.SLOW_QUERY_SAMPLING:
+    install_slow_query_sampler(
+        (engine, *replica_engines),
+        threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+        capacity=settings.SLOW_QUERY_BUFFER_SIZE,
+        max_shapes=settings.SLOW_QUERY_MAX_SHAPES,
+        explain=settings.SLOW_QUERY_EXPLAIN,
+        explain_interval_seconds=settings.SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS
     )
-    
-    response = await call_next(request)
-    
-    # Log response
-    process_time = time.time() - start_time
-    logger.info(
-        f"Response: {response.status_code} - "
-        f"Time: {process_time:.4f}s - "
-        f"Path: {request.url.path}"
+    app.add_middleware(SlowQueryMiddleware)
+
+# Opt-in SQL profiling and N+1 detection
+if settings.SQL_PROFILING or settings.SQL_PROFILING_ALLOW_HEADER:
+    for bound_engine in (engine, *replica_engines):
+        install_sql_profiler(bound_engine)
+    app.add_middleware(
+        SQLProfilerMiddleware,
+        always_on=settings.SQL_PROFILING,
+        n_plus_one_threshold=settings.SQL_PROFILING_N_PLUS_ONE_THRESHOLD
+    )
+
+# Response compression; outermost so it sees the final body
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        cache=TTLCache(
+            ttl_seconds=settings.COMPRESSION_CACHE_TTL_SECONDS,
+            max_entries=settings.COMPRESSION_CACHE_MAX_ENTRIES
+        )
     )
-    
-    return response
 
 
 # Exception handlers
@@ -143,7 +189,8 @@ async def fastapi_http_exception_handler(request: Request, exc: HTTPException):
             "message": exc.detail,
             "status_code": exc.status_code,
             "path": str(request.url.path)
-        }
+        },
+        headers=getattr(exc, "headers", None)
     )
 
 
@@ -160,7 +207,8 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
             "message": exc.detail,
             "status_code": exc.status_code,
             "path": str(request.url.path)
-        }
+        },
+        headers=getattr(exc, "headers", None)
     )
 
 
@@ -267,9 +315,21 @@ async def health_check():
     }
 
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus metrics endpoint"""
+        return PlainTextResponse(
+            render_metrics(engine),
+            media_type="text/plain; version=0.0.4"
+        )
+
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+startup_report.mark_imported()
+
 
 if __name__ == "__main__":
     import uvicorn
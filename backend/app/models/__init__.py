@@ -1,9 +1,10 @@
-from .user import User
+from .user import User, RevokedToken
 from .blog import BlogPost, BlogCategory, BlogTag, BlogPostTag
 from .learning import Course, Module, Lesson, LessonAttachment, UserEnrollment
 
 __all__ = [
     "User",
+    "RevokedToken",
     "BlogPost",
     "BlogCategory", 
     "BlogTag",
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Table
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Table, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
@@ -11,7 +11,8 @@ blog_post_tags = Table(
     'blog_post_tags',
     Base.metadata,
     Column('post_id', UUID(as_uuid=True), ForeignKey('blog_posts.id'), primary_key=True),
-    Column('tag_id', UUID(as_uuid=True), ForeignKey('blog_tags.id'), primary_key=True)
+    Column('tag_id', UUID(as_uuid=True), ForeignKey('blog_tags.id'), primary_key=True),
+    Index('ix_blog_post_tags_tag_id_post_id', 'tag_id', 'post_id')
 )
 
 
@@ -60,6 +61,10 @@ class BlogPost(Base):
     word_count = Column(Integer, default=0, nullable=False)
     read_time_minutes = Column(Integer, default=0, nullable=False)
     featured_image_url = Column(String(500), nullable=True)
+    # Derived from content on save (see app.core.content)
+    content_html = Column(Text, nullable=True)
+    content_toc = Column(JSONB, nullable=True)
+    content_hash = Column(String(64), nullable=True)
     published_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -73,6 +78,14 @@ class BlogPost(Base):
     category = relationship("BlogCategory", back_populates="blog_posts")
     tags = relationship("BlogTag", secondary=blog_post_tags, back_populates="blog_posts")
     
+    # Match the query shapes in BlogService; see benchmarks/explain_workload.py
+    __table_args__ = (
+        Index("ix_blog_posts_author_id_created_at", author_id, created_at.desc()),
+        Index("ix_blog_posts_category_id_created_at", category_id, created_at.desc()),
+        Index("ix_blog_posts_published_created_at", created_at.desc(), postgresql_where=text("status = 'published'")),
+        Index("ix_blog_posts_published_published_at", published_at.desc(), postgresql_where=text("status = 'published'")),
+    )
+    
     def __repr__(self):
         return f"<BlogPost(id={self.id}, title='{self.title}', status='{self.status}')>"
     
@@ -1,4 +1,7 @@
-from sqlalchemy import Column, String, Text, Integer, Boolean, Float, DateTime, ForeignKey
+from sqlalchemy import (
+    Column, String, Text, Integer, Boolean, Float, DateTime, ForeignKey, Index, UniqueConstraint, LargeBinary,
+    event, select, update, text
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -19,6 +22,7 @@ class Course(Base):
     is_published = Column(Boolean, default=False, nullable=False)
     price = Column(Float, default=0.0, nullable=False)
     enrollment_count = Column(Integer, default=0, nullable=False)
+    next_lesson_ordinal = Column(Integer, default=0, server_default=text("0"), nullable=False)  # see Lesson.progress_ordinal
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
@@ -30,6 +34,11 @@ class Course(Base):
     modules = relationship("Module", back_populates="course", cascade="all, delete-orphan", order_by="Module.order_index")
     enrollments = relationship("UserEnrollment", back_populates="course", cascade="all, delete-orphan")
     
+    __table_args__ = (
+        Index("ix_courses_instructor_id", instructor_id),
+        Index("ix_courses_published_created_at", created_at.desc(), postgresql_where=text("is_published")),
+    )
+    
     def __repr__(self):
         return f"<Course(id={self.id}, title='{self.title}', difficulty='{self.difficulty_level}')>"
 
@@ -52,6 +61,10 @@ class Module(Base):
     course = relationship("Course", back_populates="modules")
     lessons = relationship("Lesson", back_populates="module", cascade="all, delete-orphan", order_by="Lesson.order_index")
     
+    __table_args__ = (
+        Index("ix_modules_course_id_order_index", course_id, order_index),
+    )
+    
     def __repr__(self):
         return f"<Module(id={self.id}, title='{self.title}', course_id={self.course_id})>"
 
@@ -70,6 +83,8 @@ class Lesson(Base):
     duration = Column(Integer, nullable=True)  # in minutes
     video_url = Column(String(500), nullable=True)
     order_index = Column(Integer, nullable=False)
+    # Bit of this lesson in UserEnrollment.completed_lesson_bits; unique within the course and never reused
+    progress_ordinal = Column(Integer, nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -81,6 +96,15 @@ class Lesson(Base):
     module = relationship("Module", back_populates="lessons")
     attachments = relationship("LessonAttachment", back_populates="lesson", cascade="all, delete-orphan")
     
+    __table_args__ = (
+        Index("ix_lessons_module_id_order_index", module_id, order_index),
+        # Schedules range-scan each enrolled module's dated lessons
+        Index(
+            "ix_lessons_module_id_lesson_date", module_id, lesson_date,
+            postgresql_where=text("lesson_date IS NOT NULL AND is_active")
+        ),
+    )
+    
     def __repr__(self):
         return f"<Lesson(id={self.id}, title='{self.title}', instructor='{self.instructor}')>"
 
@@ -101,6 +125,10 @@ class LessonAttachment(Base):
     # Relationships
     lesson = relationship("Lesson", back_populates="attachments")
     
+    __table_args__ = (
+        Index("ix_lesson_attachments_lesson_id", lesson_id),
+    )
+    
     def __repr__(self):
         return f"<LessonAttachment(id={self.id}, name='{self.name}', lesson_id={self.lesson_id})>"
 
@@ -114,6 +142,8 @@ class UserEnrollment(Base):
     completed_at = Column(DateTime(timezone=True), nullable=True)
     enrolled_at = Column(DateTime(timezone=True), server_default=func.now())
     last_accessed_at = Column(DateTime(timezone=True), nullable=True)
+    # Bitset of completed Lesson.progress_ordinal values, used when PROGRESS_STORE is "dual" or "bitset"
+    completed_lesson_bits = Column(LargeBinary, default=b"", server_default=text("'\\x'::bytea"), nullable=False)
     
     # Foreign Keys
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -123,6 +153,13 @@ class UserEnrollment(Base):
     user = relationship("User", back_populates="enrollments")
     course = relationship("Course", back_populates="enrollments")
     
+    __table_args__ = (
+        # Arbitrates concurrent enrollments; see LearningService._insert_enrollment
+        UniqueConstraint("user_id", "course_id", name="uq_user_enrollments_user_id_course_id"),
+        Index("ix_user_enrollments_user_id_enrolled_at", user_id, enrolled_at.desc()),
+        Index("ix_user_enrollments_course_id_enrolled_at", course_id, enrolled_at.desc()),
+    )
+    
     def __repr__(self):
         return f"<UserEnrollment(id={self.id}, user_id={self.user_id}, course_id={self.course_id}, progress={self.progress_percentage}%)>"
 
@@ -145,5 +182,35 @@ class UserProgress(Base):
     user = relationship("User")
     lesson = relationship("Lesson")
     
+    __table_args__ = (
+        # One row per user and lesson, the conflict target of the completion upsert
+        Index("uq_user_progress_user_id_lesson_id", user_id, lesson_id, unique=True, postgresql_include=["is_completed"]),
+        Index("ix_user_progress_lesson_id", lesson_id),
+    )
+    
     def __repr__(self):
-        return f"<UserProgress(id={self.id}, user_id={self.user_id}, lesson_id={self.lesson_id}, completed={self.is_completed})>"
\ No newline at end of file
+        return f"<UserProgress(id={self.id}, user_id={self.user_id}, lesson_id={self.lesson_id}, completed={self.is_completed})>"
+
+
+class EnrollmentLessonTime(Base):
+    """Seconds spent per lesson next to the enrollment bitset, one narrow row per lesson actually watched"""
+    __tablename__ = "enrollment_lesson_time"
+    
+    enrollment_id = Column(UUID(as_uuid=True), ForeignKey("user_enrollments.id", ondelete="CASCADE"), primary_key=True)
+    lesson_ordinal = Column(Integer, primary_key=True)
+    seconds = Column(Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<EnrollmentLessonTime(enrollment_id={self.enrollment_id}, lesson_ordinal={self.lesson_ordinal}, seconds={self.seconds})>"
+
+
+@event.listens_for(Lesson, "before_insert")
+def _allocate_progress_ordinal(mapper, connection, lesson):
+    """Take the next ordinal of the lesson's course; the counter row lock serializes concurrent inserts"""
+    if lesson.progress_ordinal is None:
+        course_id = select(Module.course_id).where(Module.id == lesson.module_id).scalar_subquery()
+        lesson.progress_ordinal = connection.execute(
+            update(Course).where(Course.id == course_id).values(
+                next_lesson_ordinal=Course.next_lesson_ordinal + 1
+            ).returning(Course.next_lesson_ordinal - 1)
+        ).scalar_one()
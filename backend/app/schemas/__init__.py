@@ -1,11 +1,11 @@
 from .user import UserCreate, UserUpdate, UserResponse, Token, TokenPayload
 from .blog import (
-    BlogPostCreate, BlogPostUpdate, BlogPostResponse, 
+    BlogPostCreate, BlogPostUpdate, BlogPostResponse, BlogPostSummaryResponse,
     BlogCategoryCreate, BlogCategoryUpdate, BlogCategoryResponse,
     BlogTagCreate, BlogTagUpdate, BlogTagResponse
 )
 from .learning import (
-    CourseCreate, CourseUpdate, CourseResponse,
+    CourseCreate, CourseUpdate, CourseResponse, CourseSummaryResponse,
     ModuleCreate, ModuleUpdate, ModuleResponse,
     LessonCreate, LessonUpdate, LessonResponse,
     LessonAttachmentCreate, LessonAttachmentUpdate, LessonAttachmentResponse,
@@ -17,12 +17,12 @@ __all__ = [
     "UserCreate", "UserUpdate", "UserResponse", "UserLogin", "Token", "TokenPayload",
     
     # Blog schemas
-    "BlogPostCreate", "BlogPostUpdate", "BlogPostResponse",
+    "BlogPostCreate", "BlogPostUpdate", "BlogPostResponse", "BlogPostSummaryResponse",
     "BlogCategoryCreate", "BlogCategoryUpdate", "BlogCategoryResponse",
     "BlogTagCreate", "BlogTagUpdate", "BlogTagResponse",
     
     # Learning schemas
-    "CourseCreate", "CourseUpdate", "CourseResponse",
+    "CourseCreate", "CourseUpdate", "CourseResponse", "CourseSummaryResponse",
     "ModuleCreate", "ModuleUpdate", "ModuleResponse",
     "LessonCreate", "LessonUpdate", "LessonResponse",
     "LessonAttachmentCreate", "LessonAttachmentUpdate", "LessonAttachmentResponse",
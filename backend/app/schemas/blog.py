@@ -131,11 +131,24 @@ class BlogPostUpdate(BaseModel):
         return v.strip() if v else v
 
 
+# Table of contents entry; id is the anchor set on the heading in content_html
+class BlogPostTocEntry(BaseModel):
+    level: int
+    text: str
+    id: str
+
+
 class BlogPostResponse(BlogPostBase):
     id: UUID
     slug: str
     author_id: UUID
     view_count: int
+    word_count: int = 0
+    read_time_minutes: int = 0
+    
+    # Rendered on save; null while a large post is still being rendered
+    content_html: Optional[str] = None
+    content_toc: Optional[List[BlogPostTocEntry]] = None
     created_at: datetime
     updated_at: datetime
     published_at: Optional[datetime] = None
@@ -149,6 +162,43 @@ class BlogPostResponse(BlogPostBase):
         from_attributes = True
 
 
+# Author card embedded in list views
+class BlogAuthorSummary(BaseModel):
+    id: UUID
+    username: Optional[str] = None
+    full_name: str
+    avatar_url: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+
+
+# Blog Post Summary (list views; content is only returned by the detail endpoints)
+class BlogPostSummaryResponse(BaseModel):
+    id: UUID
+    title: str
+    slug: str
+    excerpt: Optional[str] = None
+    featured_image: Optional[str] = None
+    is_published: bool = False
+    category_id: Optional[UUID] = None
+    author_id: UUID
+    view_count: int
+    word_count: int = 0
+    read_time_minutes: int = 0
+    created_at: datetime
+    updated_at: datetime
+    published_at: Optional[datetime] = None
+    
+    # Related objects
+    author: Optional[BlogAuthorSummary] = None
+    category: Optional[BlogCategoryResponse] = None
+    tags: List[BlogTagResponse] = []
+    
+    class Config:
+        from_attributes = True
+
+
 # Blog Post List Response (for pagination)
 class BlogPostListResponse(BaseModel):
     items: List[BlogPostResponse]
@@ -1,6 +1,6 @@
 from typing import Optional, List
-from pydantic import BaseModel, field_validator, ConfigDict
-from datetime import datetime
+from pydantic import BaseModel, Field, AliasChoices, field_validator, ConfigDict
+from datetime import datetime, timezone
 from uuid import UUID
 from .user import UserResponse
 from typing import Optional, List
@@ -73,10 +73,10 @@ class CourseUpdate(BaseModel):
         return v
 
 
-class CourseResponse(BaseModel):
+# Course card for list views; the full description is only on the detail endpoints
+class CourseSummaryResponse(BaseModel):
     id: UUID
     title: str
-    description: Optional[str] = None
     short_description: Optional[str] = None
     thumbnail_url: Optional[str] = None
     difficulty_level: str
@@ -90,6 +90,10 @@ class CourseResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class CourseResponse(CourseSummaryResponse):
+    description: Optional[str] = None
+
+
 # Module Schemas
 class ModuleBase(BaseModel):
     title: str
@@ -223,6 +227,7 @@ class LessonCreate(BaseModel):
     notification: Optional[str] = None
     duration: Optional[int] = None
     video_url: Optional[str] = None
+    lesson_date: Optional[datetime] = None  # Scheduled start of the live session
     order_index: int = 0
     attachments: Optional[List[dict]] = None  # Added attachments field
     
@@ -250,6 +255,7 @@ class LessonUpdate(BaseModel):
     notification: Optional[str] = None
     duration: Optional[int] = None
     video_url: Optional[str] = None
+    lesson_date: Optional[datetime] = None
     order_index: Optional[int] = None
     attachments: Optional[List[dict]] = None  # Added attachments field
     
@@ -278,6 +284,7 @@ class LessonResponse(BaseModel):
     notification: Optional[str] = None
     duration: Optional[int] = None  # Duration in minutes
     video_url: Optional[str] = None
+    lesson_date: Optional[datetime] = None
     order_index: int
     is_active: bool
     created_at: datetime
@@ -285,46 +292,36 @@ class LessonResponse(BaseModel):
     module_id: UUID
     
     # Frontend compatibility fields (camelCase versions)
-    zoomLink: Optional[str] = None
-    quizLink: Optional[str] = None
+    # Filled from zoom_link/quiz_link when validating ORM rows or snake_case dicts
+    zoomLink: Optional[str] = Field(None, validation_alias=AliasChoices("zoomLink", "zoom_link"))
+    quizLink: Optional[str] = Field(None, validation_alias=AliasChoices("quizLink", "quiz_link"))
     
     # Related objects
     attachments: Optional[List[dict]] = None  # Will be populated with attachment data
     
     model_config = ConfigDict(from_attributes=True)
     
+    @field_validator("attachments", mode="before")
+    @classmethod
+    def format_attachments(cls, v):
+        """Accept ORM attachment rows as well as plain dicts"""
+        if v is None:
+            return v
+        return [
+            att if isinstance(att, dict) else {
+                "id": str(att.id),
+                "name": att.name,
+                "url": att.url,
+                "file_type": att.file_type,
+                "file_size": att.file_size
+            }
+            for att in v
+        ]
+    
     @classmethod
     def from_orm_with_attachments(cls, lesson):
         """Create LessonResponse with properly formatted attachments"""
-        lesson_dict = {
-            "id": lesson.id,
-            "title": lesson.title,
-            "description": lesson.description,
-            "instructor": lesson.instructor,
-            "zoom_link": lesson.zoom_link,
-            "quiz_link": lesson.quiz_link,
-            "notification": lesson.notification,
-            "duration": lesson.duration,
-            "video_url": lesson.video_url,
-            "order_index": lesson.order_index,
-            "is_active": lesson.is_active,
-            "created_at": lesson.created_at,
-            "updated_at": lesson.updated_at,
-            "module_id": lesson.module_id,
-            "zoomLink": lesson.zoom_link,
-            "quizLink": lesson.quiz_link,
-            "attachments": [
-                {
-                    "id": str(att.id),
-                    "name": att.name,
-                    "url": att.url,
-                    "file_type": att.file_type,
-                    "file_size": att.file_size
-                }
-                for att in (lesson.attachments or [])
-            ]
-        }
-        return cls(**lesson_dict)
+        return cls.model_validate(lesson)
 
 
 # Lesson Attachment Schemas
@@ -439,6 +436,19 @@ class UserEnrollmentResponse(UserEnrollmentBase):
         return cls(**enrollment_dict)
 
 
+# Reorder Schemas (shared by modules and lessons)
+class ReorderItem(BaseModel):
+    id: UUID
+    order_index: int
+
+    @field_validator("order_index")
+    @classmethod
+    def validate_order_index(cls, v):
+        if v < 0:
+            raise ValueError("Order index must be a non-negative integer")
+        return v
+
+
 # Course List Response (for pagination)
 class CourseListResponse(BaseModel):
     items: List[CourseResponse]
@@ -458,10 +468,91 @@ class UserProgressResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class LessonProgressState(BaseModel):
+    lesson_id: UUID
+    module_id: UUID
+    is_completed: bool
+    completed_at: Optional[datetime] = None
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CourseProgressResponse(BaseModel):
+    course_id: UUID
+    total_lessons: int
+    completed_lessons: int
+    progress_percentage: float
+    lessons: Optional[List[LessonProgressState]] = None  # format=list, in course outline order
+    bitmap: Optional[str] = None  # format=bitmap: base64, most significant bit first, one bit per lesson in outline order
+
+
+# Activity Heartbeat Schemas
+MAX_EVENT_SECONDS = 300
+
+
+class ActivityEvent(BaseModel):
+    lesson_id: UUID
+    seconds: int = Field(..., gt=0, le=MAX_EVENT_SECONDS)  # time on the lesson since the client's previous event
+    occurred_at: datetime  # client clock; later than the server's clock is treated as now
+    
+    @field_validator("occurred_at")
+    @classmethod
+    def assume_utc(cls, v):
+        return v if v.tzinfo else v.replace(tzinfo=timezone.utc)
+
+
+class ActivityHeartbeat(BaseModel):
+    events: List[ActivityEvent] = Field(..., min_length=1, max_length=500)
+
+
+class ActivityHeartbeatResponse(BaseModel):
+    accepted: int
+
+
+# Learner Dashboard Schemas
+class DashboardNextLesson(BaseModel):
+    id: UUID
+    title: str
+    module_id: UUID
+    module_title: str
+
+
+class LearnerDashboardItem(BaseModel):
+    course: CourseSummaryResponse
+    enrolled_at: datetime
+    last_accessed_at: Optional[datetime] = None
+    is_completed: bool
+    completed_at: Optional[datetime] = None
+    total_lessons: int
+    completed_lessons: int
+    progress_percentage: float
+    next_lesson: Optional[DashboardNextLesson] = None  # None once every lesson is completed
+
+
+# Schedule Schemas
+class ScheduleItem(BaseModel):
+    lesson_id: UUID
+    title: str
+    lesson_date: datetime
+    duration: Optional[int] = None  # Duration in minutes
+    instructor: Optional[str] = None
+    zoom_link: Optional[str] = None
+    module_id: UUID
+    module_title: str
+    course_id: UUID
+    course_title: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CalendarFeedResponse(BaseModel):
+    url: str  # Secret iCalendar subscription URL; revoked by logging out everywhere
+
+
 # Course Search Schema
 class CourseSearchParams(BaseModel):
     q: Optional[str] = None  # Search query
-    instructor_id: Optional[int] = None
+    instructor_id: Optional[UUID] = None
     difficulty_level: Optional[str] = None
     is_published: Optional[bool] = None
     min_price: Optional[float] = None
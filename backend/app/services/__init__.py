@@ -2,10 +2,12 @@ from .auth_service import AuthService
 from .blog_service import BlogService
 from .learning_service import LearningService
 from .file_service import FileService
+from .stats_service import StatsService
 
 __all__ = [
     "AuthService",
     "BlogService", 
     "LearningService",
-    "FileService"
+    "FileService",
+    "StatsService"
 ]
\ No newline at end of file
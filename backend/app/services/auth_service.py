@@ -2,22 +2,23 @@ from typing import Optional, List
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
 from fastapi import HTTPException, status
-from datetime import datetime, timedelta
-from google.auth.transport import requests
-from google.oauth2 import id_token
+from datetime import datetime, timedelta, timezone
 
 from ..core.security import (
     verify_password, 
     get_password_hash, 
     create_access_token, 
     create_refresh_token,
-    verify_token,
+    decode_token,
     create_password_reset_token,
     verify_password_reset_token
 )
-from ..models.user import User, UserRole
+from ..models.user import User, UserRole, RevokedToken
 from ..schemas.user import UserCreate, UserUpdate, GoogleUserInfo, UserCreateByAdmin
 from ..core.config import settings
+from ..core.google_verifier import get_google_verifier
+from ..core.replicas import read_only
+from ..core.token_revocation import notify_revocation, revocation_list
 
 
 class AuthService:
@@ -116,8 +117,8 @@ class AuthService:
     
     def create_tokens(self, user: User) -> dict:
         """Create access and refresh tokens for user"""
-        access_token = create_access_token(subject=user.id)
-        refresh_token = create_refresh_token(subject=user.id)
+        access_token = create_access_token(subject=user.id, version=user.token_version, role=user.role)
+        refresh_token = create_refresh_token(subject=user.id, version=user.token_version)
         
         return {
             "access_token": access_token,
@@ -128,46 +129,62 @@ class AuthService:
     
     def refresh_access_token(self, refresh_token: str) -> dict:
         """Create new access token from refresh token"""
-        try:
-            payload = verify_token(refresh_token)
-            user_id = payload.get("sub")
-            token_type = payload.get("type")
-            
-            if token_type != "refresh":
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid token type"
-                )
-            
-            user = self.get_user_by_id(int(user_id))
-            if not user:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="User not found"
-                )
-            
-            if not user.is_active:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="User account is deactivated"
-                )
-            
-            # Create new access token
-            access_token = create_access_token(
-                data={"sub": str(user.id), "type": "access"}
-            )
-            
-            return {
-                "access_token": access_token,
-                "token_type": "bearer",
-                "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
-            }
-            
-        except Exception as e:
+        claims = decode_token(refresh_token)
+        if claims is None or claims.get("type") != "refresh" or revocation_list.is_revoked(claims):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid refresh token"
             )
+        
+        user = self.get_user_by_id(claims["sub"])
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found"
+            )
+        
+        if not user.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User account is deactivated"
+            )
+        
+        access_token = create_access_token(subject=user.id, version=user.token_version, role=user.role)
+        
+        return {
+            "access_token": access_token,
+            "token_type": "bearer",
+            "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        }
+    
+    def revoke_token(self, claims: dict) -> None:
+        """Revoke a single token (logout) until it expires"""
+        jti = claims.get("jti")
+        if jti is None:
+            # Tokens issued before revocation support carry no id to revoke
+            return
+        
+        revoked = RevokedToken(
+            jti=jti,
+            user_id=claims["sub"],
+            expires_at=datetime.fromtimestamp(claims["exp"], tz=timezone.utc)
+        )
+        self.db.merge(revoked)
+        notify_revocation(self.db, f"token:{jti}:{claims['exp']}")
+        self.db.commit()
+        
+        revocation_list.add_token(jti, float(claims["exp"]))
+    
+    def _bump_token_version(self, user: User) -> None:
+        """Invalidate every token issued to the user so far; applied when the caller commits"""
+        user.token_version = (user.token_version or 0) + 1
+        notify_revocation(self.db, f"user:{user.id}:{user.token_version}")
+    
+    def revoke_all_tokens(self, user: User) -> None:
+        """Sign the user out of every session"""
+        self._bump_token_version(user)
+        self.db.commit()
+        revocation_list.set_user_version(str(user.id), user.token_version)
     
     def update_user(self, user_id: str, user_update: UserUpdate) -> User:
         """Update user information"""
@@ -203,13 +220,19 @@ class AuthService:
         if "password" in update_data:
             update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
         
+        deactivating = update_data.get("is_active") is False and user.is_active
+        
         for field, value in update_data.items():
             setattr(user, field, value)
         
         user.updated_at = datetime.utcnow()
+        if deactivating:
+            self._bump_token_version(user)
         
         self.db.commit()
         self.db.refresh(user)
+        if deactivating:
+            revocation_list.set_user_version(str(user.id), user.token_version)
         
         return user
     
@@ -224,9 +247,11 @@ class AuthService:
         
         user.is_active = False
         user.updated_at = datetime.utcnow()
+        self._bump_token_version(user)
         
         self.db.commit()
         self.db.refresh(user)
+        revocation_list.set_user_version(str(user.id), user.token_version)
         
         return user
     
@@ -300,12 +325,14 @@ class AuthService:
                     detail="User account is deactivated"
                 )
             
-            # Update password
+            # Update password and end sessions started with the old one
             user.hashed_password = get_password_hash(new_password)
             user.updated_at = datetime.utcnow()
+            self._bump_token_version(user)
             
             self.db.commit()
             self.db.refresh(user)
+            revocation_list.set_user_version(str(user.id), user.token_version)
             
             return user
             
@@ -318,17 +345,17 @@ class AuthService:
     def get_current_user_from_token(self, token: str) -> User:
         """Get current user from access token"""
         try:
-            payload = verify_token(token)
+            payload = decode_token(token)
             user_id = payload.get("sub")
             token_type = payload.get("type")
             
-            if token_type != "access":
+            if token_type != "access" or revocation_list.is_revoked(payload):
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Invalid token type"
                 )
             
-            user = self.get_user_by_id(int(user_id))
+            user = self.get_user_by_id(user_id)
             if not user:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -349,6 +376,7 @@ class AuthService:
                 detail="Could not validate credentials"
             )
     
+    @read_only
     def get_users(
         self,
         skip: int = 0,
@@ -386,10 +414,8 @@ class AuthService:
     def verify_google_token(self, token: str) -> GoogleUserInfo:
         """Verify Google ID token and extract user info"""
         try:
-            # Verify the token with Google
-            idinfo = id_token.verify_oauth2_token(
-                token, requests.Request(), settings.GOOGLE_CLIENT_ID
-            )
+            # Verify the signature locally against cached Google certificates
+            idinfo = get_google_verifier().verify(token)
             
             # Extract user information
             google_user_info = GoogleUserInfo(
@@ -1,12 +1,16 @@
 from typing import Optional, List, Tuple
 from uuid import UUID
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, load_only
 from sqlalchemy import or_, and_, desc, asc, func
 from fastapi import HTTPException, status
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List, Optional, Tuple
 import re
 
+from ..core.config import settings
+from ..core.content import content_hash, derive_post_content, schedule_post_render
+from ..core.replicas import read_only
+from ..core.text import make_excerpt
 from ..models.blog import BlogPost, BlogCategory, BlogTag, blog_post_tags
 from ..models.user import User
 from ..schemas.blog import (
@@ -16,10 +20,28 @@ from ..schemas.blog import (
 )
 
 
+# Columns rendered by list views; content is only loaded by the detail endpoints
+POST_LIST_COLUMNS = (
+    BlogPost.id, BlogPost.title, BlogPost.slug, BlogPost.excerpt, BlogPost.status,
+    BlogPost.view_count, BlogPost.word_count, BlogPost.read_time_minutes,
+    BlogPost.featured_image_url, BlogPost.published_at, BlogPost.created_at,
+    BlogPost.updated_at, BlogPost.author_id, BlogPost.category_id
+)
+
+
 class BlogService:
     def __init__(self, db: Session):
         self.db = db
     
+    def _list_query(self):
+        """Blog post query for list views: summary columns plus author, category and tags"""
+        return self.db.query(BlogPost).options(
+            load_only(*POST_LIST_COLUMNS),
+            joinedload(BlogPost.author).load_only(User.id, User.username, User.full_name, User.avatar_url),
+            joinedload(BlogPost.category),
+            joinedload(BlogPost.tags)
+        )
+    
     def _generate_slug(self, title: str) -> str:
         """Generate URL-friendly slug from title"""
         # Convert to lowercase and replace spaces with hyphens
@@ -36,6 +58,20 @@ class BlogService:
         
         return slug
     
+    def _derive_content(self, post: BlogPost) -> bool:
+        """Refresh word count, read time, HTML and TOC if the content changed.
+        
+        Returns True when rendering was left to the background pool, which must
+        only be scheduled once the post is committed.
+        """
+        if post.content_hash == content_hash(post.content):
+            return False
+        
+        inline = len(post.content) <= settings.CONTENT_RENDER_INLINE_MAX_CHARS
+        for field, value in derive_post_content(post.content, render=inline).items():
+            setattr(post, field, value)
+        return not inline
+    
     # Blog Category Methods
     def create_category(self, category_create: BlogCategoryCreate) -> BlogCategory:
         """Create a new blog category"""
@@ -61,6 +97,7 @@ class BlogService:
         
         return db_category
     
+    @read_only
     def get_categories(self, skip: int = 0, limit: int = 100, search: Optional[str] = None) -> List[BlogCategory]:
         """Get all blog categories"""
         query = self.db.query(BlogCategory)
@@ -146,10 +183,12 @@ class BlogService:
         
         return db_tag
     
+    @read_only
     def get_tags(self, skip: int = 0, limit: int = 100) -> List[BlogTag]:
         """Get all blog tags"""
         return self.db.query(BlogTag).offset(skip).limit(limit).all()
     
+    @read_only
     def get_blog_tags(self, skip: int = 0, limit: int = 100, search: Optional[str] = None) -> List[BlogTag]:
         """Get blog tags with optional search"""
         query = self.db.query(BlogTag)
@@ -223,7 +262,7 @@ class BlogService:
         db_post = BlogPost(
             title=post_create.title,
             content=post_create.content,
-            excerpt=post_create.excerpt,
+            excerpt=post_create.excerpt or make_excerpt(post_create.content),
             featured_image_url=post_create.featured_image,
             slug=slug,
             status="published" if post_create.is_published else "draft",
@@ -231,6 +270,7 @@ class BlogService:
             author_id=author_id,
             published_at=datetime.utcnow() if post_create.is_published else None
         )
+        render_later = self._derive_content(db_post)
         
         self.db.add(db_post)
         self.db.flush()  # Flush to get the ID
@@ -245,19 +285,20 @@ class BlogService:
         self.db.commit()
         self.db.refresh(db_post)
         
+        if render_later:
+            schedule_post_render(db_post.id, db_post.content_hash, db_post.content)
+        
         return db_post
     
+    @read_only
     def search_blog_posts(self, search_params: BlogSearchParams, skip: int = 0, limit: int = 10) -> Tuple[List[BlogPost], int]:
         """Search blog posts with parameters"""
         return self.get_posts(search_params)
     
+    @read_only
     def get_posts_for_user(self, user_id: UUID, search_params: BlogSearchParams, skip: int = 0, limit: int = 10) -> List[BlogPost]:
         """Get posts for authenticated user: their own posts (all) + published posts from others"""
-        query = self.db.query(BlogPost).options(
-            joinedload(BlogPost.author),
-            joinedload(BlogPost.category),
-            joinedload(BlogPost.tags)
-        )
+        query = self._list_query()
         
         # Filter: user's own posts OR published posts from others
         query = query.filter(
@@ -307,13 +348,10 @@ class BlogService:
         
         return posts
     
+    @read_only
     def get_posts(self, search_params: BlogSearchParams) -> Tuple[List[BlogPost], int]:
         """Get blog posts with search and pagination"""
-        query = self.db.query(BlogPost).options(
-            joinedload(BlogPost.author),
-            joinedload(BlogPost.category),
-            joinedload(BlogPost.tags)
-        )
+        query = self._list_query()
         
         # Apply filters
         if search_params.q:
@@ -420,6 +458,14 @@ class BlogService:
             elif not update_data["is_published"] and post.is_published:
                 update_data["published_at"] = None
         
+        # Fill in a missing excerpt, and keep a generated one in step with the content
+        if not update_data.get("excerpt") and (
+            "excerpt" in update_data
+            or not post.excerpt
+            or ("content" in update_data and post.excerpt == make_excerpt(post.content))
+        ):
+            update_data["excerpt"] = make_excerpt(update_data.get("content") or post.content)
+        
         # Handle tags
         if "tag_ids" in update_data and update_data["tag_ids"] is not None:
             tag_ids = update_data.pop("tag_ids", [])
@@ -446,12 +492,16 @@ class BlogService:
         # Update other fields
         for field, value in update_data.items():
             setattr(post, field, value)
+        render_later = self._derive_content(post)
         
         post.updated_at = datetime.utcnow()
         
         self.db.commit()
         self.db.refresh(post)
         
+        if render_later:
+            schedule_post_render(post.id, post.content_hash, post.content)
+        
         return post
     
     def delete_post(self, post_id: UUID, user_id: UUID) -> bool:
@@ -491,42 +541,47 @@ class BlogService:
         
         return post
     
-    def get_popular_posts(self, limit: int = 10) -> List[BlogPost]:
-        """Get most popular blog posts by view count"""
-        return self.db.query(BlogPost).options(
-            joinedload(BlogPost.author),
-            joinedload(BlogPost.category),
-            joinedload(BlogPost.tags)
-        ).filter(
-            BlogPost.status == "published"
-        ).order_by(
+    @read_only
+    def get_popular_posts(self, limit: int = 10, days: Optional[int] = None) -> List[BlogPost]:
+        """Get most popular blog posts by view count, optionally published within the last ``days``"""
+        query = self._list_query().filter(BlogPost.status == "published")
+        if days:
+            query = query.filter(BlogPost.published_at >= datetime.utcnow() - timedelta(days=days))
+        
+        return query.order_by(
             desc(BlogPost.view_count)
         ).limit(limit).all()
     
+    @read_only
     def get_recent_posts(self, limit: int = 10) -> List[BlogPost]:
         """Get most recent published blog posts"""
-        return self.db.query(BlogPost).options(
-            joinedload(BlogPost.author),
-            joinedload(BlogPost.category),
-            joinedload(BlogPost.tags)
-        ).filter(
+        return self._list_query().filter(
             BlogPost.status == "published"
         ).order_by(
             desc(BlogPost.published_at)
         ).limit(limit).all()
     
-    def get_posts_by_author(self, author_id: int, skip: int = 0, limit: int = 10) -> List[BlogPost]:
+    @read_only
+    def get_posts_by_author(
+        self,
+        author_id: UUID,
+        skip: int = 0,
+        limit: int = 10,
+        is_published: Optional[bool] = None
+    ) -> List[BlogPost]:
         """Get blog posts by specific author"""
-        return self.db.query(BlogPost).options(
-            joinedload(BlogPost.author),
-            joinedload(BlogPost.category),
-            joinedload(BlogPost.tags)
-        ).filter(
-            BlogPost.author_id == author_id
-        ).order_by(
+        query = self._list_query().filter(BlogPost.author_id == author_id)
+        if is_published is not None:
+            if is_published:
+                query = query.filter(BlogPost.status == "published")
+            else:
+                query = query.filter(BlogPost.status != "published")
+        
+        return query.order_by(
             desc(BlogPost.created_at)
         ).offset(skip).limit(limit).all()
     
+    @read_only
     def get_posts_by_category(self, category_id: UUID, skip: int = 0, limit: int = 10) -> List[BlogPost]:
         """Get blog posts by category"""
         return self.db.query(BlogPost).options(
@@ -542,6 +597,7 @@ class BlogService:
             desc(BlogPost.published_at)
         ).offset(skip).limit(limit).all()
     
+    @read_only
     def get_posts_by_tag(self, tag_id: UUID, skip: int = 0, limit: int = 10) -> List[BlogPost]:
         """Get blog posts by tag"""
         return self.db.query(BlogPost).options(
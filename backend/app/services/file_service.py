@@ -4,10 +4,16 @@ import shutil
 from typing import Optional, List
 from pathlib import Path
 from fastapi import UploadFile, HTTPException, status
-from PIL import Image
 import aiofiles
 
 from ..core.config import settings
+from ..core.metrics import record_upload
+
+
+UPLOAD_SUBDIRECTORIES = ("images", "videos", "documents", "attachments", "temp")
+
+# Upload directories are created once per process, on first use
+_upload_directories_ready = False
 
 
 class FileService:
@@ -31,16 +37,13 @@ class FileService:
     
     def _create_upload_directories(self):
         """Create upload directories if they don't exist"""
-        directories = [
-            self.upload_dir / "images",
-            self.upload_dir / "videos",
-            self.upload_dir / "documents",
-            self.upload_dir / "attachments",
-            self.upload_dir / "temp"
-        ]
+        global _upload_directories_ready
+        if _upload_directories_ready:
+            return
         
-        for directory in directories:
-            directory.mkdir(parents=True, exist_ok=True)
+        for name in UPLOAD_SUBDIRECTORIES:
+            (self.upload_dir / name).mkdir(parents=True, exist_ok=True)
+        _upload_directories_ready = True
     
     def _generate_filename(self, original_filename: str) -> str:
         """Generate unique filename while preserving extension"""
@@ -90,6 +93,7 @@ class FileService:
             async with aiofiles.open(file_path, 'wb') as f:
                 content = await file.read()
                 await f.write(content)
+            record_upload("images", len(content))
             
             # Resize image if requested
             if resize:
@@ -118,6 +122,9 @@ class FileService:
     
     async def _resize_image(self, file_path: Path, size: tuple):
         """Resize image to specified dimensions"""
+        # Pillow is only needed when resizing, keep it off the startup path
+        from PIL import Image
+        
         try:
             with Image.open(file_path) as img:
                 # Convert RGBA to RGB if necessary
@@ -149,6 +156,7 @@ class FileService:
             async with aiofiles.open(file_path, 'wb') as f:
                 content = await file.read()
                 await f.write(content)
+            record_upload("videos", len(content))
             
             # Generate URL
             file_url = f"/uploads/videos/{filename}"
@@ -186,6 +194,7 @@ class FileService:
             async with aiofiles.open(file_path, 'wb') as f:
                 content = await file.read()
                 await f.write(content)
+            record_upload("documents", len(content))
             
             # Generate URL
             file_url = f"/uploads/documents/{filename}"
@@ -222,6 +231,7 @@ class FileService:
             async with aiofiles.open(file_path, 'wb') as f:
                 content = await file.read()
                 await f.write(content)
+            record_upload("attachments", len(content))
             
             # Generate URL
             file_url = f"/uploads/attachments/{filename}"
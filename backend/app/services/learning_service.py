@@ -1,24 +1,51 @@
 from typing import Optional, List
 from uuid import UUID
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, desc, func
+from sqlalchemy.orm import Session, joinedload, defer, aliased
+from sqlalchemy import (
+    and_, or_, asc, desc, func, select, update, insert, delete,
+    values, column, cast, case, null, Integer, String
+)
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, insert as pg_insert
 from fastapi import HTTPException, status
-from datetime import datetime
-from typing import List, Tuple, Optional
+from fastapi.encoders import jsonable_encoder
+from datetime import datetime, timezone
+from typing import List, Tuple, Optional, Union
 
+from ..core.bitmap import sql_clear_bit, sql_has_bit, sql_popcount, sql_set_bit
+from ..core.calendar import CALENDAR_LESSON_FIELDS, feed_cache
+from ..core.config import settings
+from ..core.live_updates import publish_course_event
+from ..core.text import make_excerpt, SHORT_DESCRIPTION_LENGTH
+from ..core.replicas import read_only
 from ..models.learning import (
     Course, Module, Lesson, LessonAttachment,
     UserEnrollment, UserProgress
 )
-from ..models.user import User
+from ..models.user import User, UserRole
 from ..schemas.learning import (
     CourseCreate, CourseUpdate, CourseSearchParams,
     ModuleCreate, ModuleUpdate,
     LessonCreate, LessonUpdate,
     LessonAttachmentCreate, LessonAttachmentUpdate,
-    UserEnrollmentCreate
+    UserEnrollmentCreate, ReorderItem
 )
 
+# Gap left between sibling order indexes so a single move rarely renumbers others
+ORDER_INDEX_STEP = 1024
+
+
+def _writes_progress_rows() -> bool:
+    return settings.PROGRESS_STORE != "bitset"
+
+
+def _writes_progress_bits() -> bool:
+    return settings.PROGRESS_STORE in ("dual", "bitset")
+
+
+def _reads_progress_bits() -> bool:
+    """Whether completion is read from enrollment bitsets instead of user_progress rows"""
+    return settings.PROGRESS_STORE == "bitset"
+
 
 class LearningService:
     def __init__(self, db: Session):
@@ -30,7 +57,7 @@ class LearningService:
         db_course = Course(
             title=course_create.title,
             description=course_create.description,
-            short_description=None,
+            short_description=make_excerpt(course_create.description, SHORT_DESCRIPTION_LENGTH),
             thumbnail_url=course_create.featured_image,
             difficulty_level=course_create.level,
             estimated_duration=course_create.duration_hours,
@@ -51,76 +78,80 @@ class LearningService:
             Lesson.module_id == module_id
         ).order_by(Lesson.order_index).offset(skip).limit(limit).all()
     
+    @read_only
     def get_lessons(self, skip: int = 0, limit: int = 50) -> List[Lesson]:
         """Get all lessons"""
         return self.db.query(Lesson).order_by(
             Lesson.created_at.desc()
         ).offset(skip).limit(limit).all()
     
+    @read_only
     def get_courses(self, search_params: CourseSearchParams) -> Tuple[List[Course], int]:
-        """Get courses with search and pagination"""
-        try:
-            # Simple approach: get all courses first, then apply filters
-            all_courses = self.db.query(Course).all()
-            
-            # Apply filters in Python for now to avoid SQL issues
-            filtered_courses = []
-            for course in all_courses:
-                # Apply search filter
-                if search_params.q:
-                    search_term = search_params.q.lower()
-                    if (search_term not in course.title.lower() and 
-                        search_term not in (course.description or "").lower()):
-                        continue
-                
-                # Apply instructor filter
-                if search_params.instructor_id and course.instructor_id != search_params.instructor_id:
-                    continue
-                
-                # Apply difficulty filter
-                if search_params.difficulty_level and course.difficulty_level != search_params.difficulty_level:
-                    continue
-                
-                # Apply price filters
-                if search_params.min_price is not None and course.price < search_params.min_price:
-                    continue
-                
-                if search_params.max_price is not None and course.price > search_params.max_price:
-                    continue
-                
-                filtered_courses.append(course)
-            
-            # Apply sorting
-            if search_params.sort_by == "title":
-                filtered_courses.sort(key=lambda x: x.title, reverse=(search_params.sort_order == "desc"))
-            elif search_params.sort_by == "price":
-                filtered_courses.sort(key=lambda x: x.price, reverse=(search_params.sort_order == "desc"))
-            elif search_params.sort_by == "updated_at":
-                filtered_courses.sort(key=lambda x: x.updated_at, reverse=(search_params.sort_order == "desc"))
-            else:  # default to created_at
-                filtered_courses.sort(key=lambda x: x.created_at, reverse=(search_params.sort_order == "desc"))
-            
-            # Apply pagination
-            total = len(filtered_courses)
-            offset = (search_params.page - 1) * search_params.size
-            paginated_courses = filtered_courses[offset:offset + search_params.size]
-            
-            return paginated_courses, total
-            
-        except Exception as e:
-            print(f"Error in get_courses: {e}")
-            return [], 0
+        """Get courses with search and pagination (description is left unloaded for list views)"""
+        query = self.db.query(Course).options(defer(Course.description))
+        
+        if search_params.q:
+            search_term = f"%{search_params.q}%"
+            query = query.filter(
+                or_(
+                    Course.title.ilike(search_term),
+                    Course.description.ilike(search_term)
+                )
+            )
+        
+        if search_params.instructor_id:
+            query = query.filter(Course.instructor_id == search_params.instructor_id)
+        
+        if search_params.difficulty_level:
+            query = query.filter(Course.difficulty_level == search_params.difficulty_level)
+        
+        if search_params.min_price is not None:
+            query = query.filter(Course.price >= search_params.min_price)
+        
+        if search_params.max_price is not None:
+            query = query.filter(Course.price <= search_params.max_price)
+        
+        if search_params.is_published is not None:
+            query = query.filter(Course.is_published == search_params.is_published)
+        
+        total = query.count()
+        
+        # Apply sorting
+        order_func = desc if search_params.sort_order == "desc" else asc
+        if search_params.sort_by == "title":
+            query = query.order_by(order_func(Course.title))
+        elif search_params.sort_by == "price":
+            query = query.order_by(order_func(Course.price))
+        elif search_params.sort_by == "updated_at":
+            query = query.order_by(order_func(Course.updated_at))
+        else:  # default to created_at
+            query = query.order_by(order_func(Course.created_at))
+        
+        # Apply pagination
+        offset = (search_params.page - 1) * search_params.size
+        courses = query.offset(offset).limit(search_params.size).all()
+        
+        return courses, total
     
+    @read_only
     def get_course_by_id(self, course_id: str) -> Optional[Course]:
         """Get course by ID with full details"""
+        return self._get_course(course_id)
+    
+    def _get_course(self, course_id: str) -> Optional[Course]:
+        """Load a course with its outline from the primary, for methods that go on to write"""
         return self.db.query(Course).options(
             joinedload(Course.instructor),
             joinedload(Course.modules).joinedload(Module.lessons).joinedload(Lesson.attachments)
         ).filter(Course.id == course_id).first()
     
+    def get_course_instructor_id(self, course_id: UUID) -> Optional[UUID]:
+        """Get course instructor ID without loading the course outline"""
+        return self.db.query(Course.instructor_id).filter(Course.id == course_id).scalar()
+    
     def update_course(self, course_id: str, course_update: CourseUpdate, user_id: str) -> Course:
         """Update course"""
-        course = self.get_course_by_id(course_id)
+        course = self._get_course(course_id)
         if not course:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -137,6 +168,13 @@ class LearningService:
         
         update_data = course_update.model_dump(exclude_unset=True)
         
+        # Keep a generated short description in step with the full description
+        if update_data.get("description") and (
+            not course.short_description
+            or course.short_description == make_excerpt(course.description, SHORT_DESCRIPTION_LENGTH)
+        ):
+            update_data["short_description"] = make_excerpt(update_data["description"], SHORT_DESCRIPTION_LENGTH)
+        
         for field, value in update_data.items():
             setattr(course, field, value)
         
@@ -145,11 +183,14 @@ class LearningService:
         self.db.commit()
         self.db.refresh(course)
         
+        if "title" in update_data:
+            feed_cache.course_changed(course.id)
+        
         return course
     
     def delete_course(self, course_id: str, user_id: str) -> bool:
         """Delete course"""
-        course = self.get_course_by_id(course_id)
+        course = self._get_course(course_id)
         if not course:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -175,58 +216,30 @@ class LearningService:
                 detail=f"Cannot delete course. It has {enrollment_count} enrollments"
             )
         
+        course_id = course.id
         self.db.delete(course)
         self.db.commit()
         
+        feed_cache.course_changed(course_id)
+        
         return True
     
     def enroll_user_in_course(self, user_id: str, course_id: str) -> UserEnrollment:
         """Enroll user in course (for admin use) - allows enrollment in unpublished courses"""
-        # Check if course exists
-        course = self.get_course_by_id(course_id)
-        if not course:
+        # Admin can enroll users in unpublished courses, so only existence is checked
+        if not self.db.query(Course.id).filter(Course.id == course_id).first():
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Course not found"
             )
         
-        # Admin can enroll users in unpublished courses, so skip is_published check
-        
-        # Check if user is already enrolled
-        existing_enrollment = self.db.query(UserEnrollment).filter(
-            and_(
-                UserEnrollment.user_id == user_id,
-                UserEnrollment.course_id == course_id
-            )
-        ).first()
-        
-        if existing_enrollment:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="User is already enrolled in this course"
-            )
-        
-        # Create enrollment
-        db_enrollment = UserEnrollment(
-            user_id=user_id,
-            course_id=course_id,
-            enrolled_at=datetime.utcnow()
-        )
-        
-        self.db.add(db_enrollment)
-        
-        # Update course enrollment count
-        course.enrollment_count += 1
-        
-        self.db.commit()
-        self.db.refresh(db_enrollment)
-        
-        return db_enrollment
+        return self._insert_enrollment(user_id, course_id)
     
     def unenroll_user_from_course(self, user_id: str, course_id: str) -> bool:
         """Unenroll user from course (for admin use)"""
         return self.unenroll_user(course_id, user_id)
     
+    @read_only
     def get_popular_courses(self, limit: int = 10) -> List[Course]:
         """Get most popular courses by enrollment count"""
         return self.db.query(Course).options(
@@ -237,6 +250,7 @@ class LearningService:
             desc(Course.enrollment_count)
         ).limit(limit).all()
     
+    @read_only
     def get_recent_courses(self, limit: int = 10) -> List[Course]:
         """Get most recent published courses"""
         return self.db.query(Course).options(
@@ -248,6 +262,7 @@ class LearningService:
         ).limit(limit).all()
     
     # Module Methods
+    @read_only
     def get_modules(self, course_id: Optional[str] = None, skip: int = 0, limit: int = 50) -> List[Module]:
         """Get modules with optional course filter"""
         query = self.db.query(Module).options(
@@ -263,7 +278,7 @@ class LearningService:
     def create_module(self, course_id: str, module_create: ModuleCreate) -> Module:
         """Create a new module"""
         # Check if course exists
-        course = self.get_course_by_id(course_id)
+        course = self._get_course(course_id)
         if not course:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -292,6 +307,7 @@ class LearningService:
         
         return db_module
     
+    @read_only
     def get_modules_by_course_id(self, course_id: str, skip: int = 0, limit: int = 50) -> List[Module]:
         """Get modules for a specific course"""
         return self.db.query(Module).options(
@@ -336,6 +352,9 @@ class LearningService:
         self.db.commit()
         self.db.refresh(module)
         
+        if "title" in update_data:
+            feed_cache.course_changed(module.course_id)
+        
         return module
     
     def delete_module(self, module_id: UUID, user_id: str) -> bool:
@@ -355,50 +374,118 @@ class LearningService:
                 detail="Not authorized to delete this module"
             )
         
+        course_id = module.course_id
+        self._clear_lesson_bits(course_id, [lesson.progress_ordinal for lesson in module.lessons])
         self.db.delete(module)
         self.db.commit()
         
+        feed_cache.course_changed(course_id)
+        
         return True
     
-    def reorder_modules(self, course_id: str, module_orders: List[dict], user_id: str) -> List[Module]:
-        """Reorder modules in a course"""
-        # Check if course exists and user has permission
-        course = self.get_course_by_id(course_id)
-        if not course:
+    def reorder_modules(self, course_id: UUID, items: List[ReorderItem]) -> int:
+        """Apply a new module order for a course in a single statement"""
+        return self._bulk_reorder(Module, Module.course_id, course_id, items)
+    
+    def reorder_module(self, module_id: UUID, new_position: int) -> bool:
+        """Move a module to a zero-based position among its siblings"""
+        return self._move_item(Module, Module.course_id, module_id, new_position)
+    
+    def _bulk_reorder(self, model, parent_column, parent_id: UUID, items: List[ReorderItem]) -> int:
+        """Write (id, order_index) pairs with one UPDATE ... FROM (VALUES ...)"""
+        if not items:
+            return 0
+        
+        if len({item.id for item in items}) != len(items):
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Course not found"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Duplicate ids in reorder request"
             )
         
-        if course.instructor_id != user_id:
-            # TODO: Add admin role check
+        updated = self._write_order_indexes(
+            model, parent_column, parent_id,
+            [(item.id, item.order_index) for item in items]
+        )
+        
+        # Every id must belong to the parent, otherwise nothing is applied
+        if updated != len(items):
+            self.db.rollback()
             raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to reorder modules in this course"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Reorder request contains items that do not belong to this parent"
             )
         
-        # Update order for each module
-        for order_data in module_orders:
-            module_id = order_data.get("module_id")
-            new_order = order_data.get("order_index")
-            
-            module = self.db.query(Module).filter(
-                and_(
-                    Module.id == module_id,
-                    Module.course_id == course_id
-                )
-            ).first()
-            
-            if module:
-                module.order_index = new_order
-                module.updated_at = datetime.utcnow()
-        
         self.db.commit()
+        return updated
+    
+    def _move_item(self, model, parent_column, item_id: UUID, new_position: int) -> bool:
+        """Move one item using sparse order indexes.
+        
+        The item gets an order_index between its new neighbours, so only its row
+        is written. Siblings are renumbered (still one statement) only when the
+        gap between the neighbours is exhausted.
+        """
+        parent_id = select(parent_column).where(model.id == item_id).scalar_subquery()
+        siblings = self.db.execute(
+            select(model.id, model.order_index).where(
+                parent_column == parent_id
+            ).order_by(model.order_index, model.id)
+        ).all()
         
-        # Return updated modules
-        return self.db.query(Module).filter(
-            Module.course_id == course_id
-        ).order_by(Module.order_index).all()
+        ids = [row.id for row in siblings]
+        if item_id not in ids:
+            return False
+        
+        current_position = ids.index(item_id)
+        others = [row for row in siblings if row.id != item_id]
+        new_position = max(0, min(new_position, len(others)))
+        if new_position == current_position:
+            return True
+        
+        lower = others[new_position - 1].order_index if new_position > 0 else -1
+        upper = (
+            others[new_position].order_index if new_position < len(others)
+            else lower + 2 * ORDER_INDEX_STEP
+        )
+        
+        if upper - lower > 1:
+            self.db.execute(
+                update(model).where(model.id == item_id).values(
+                    order_index=(lower + upper) // 2,
+                    updated_at=func.now()
+                ).execution_options(synchronize_session=False)
+            )
+        else:
+            # No room between neighbours: respace every sibling in one statement
+            ordered_ids = [row.id for row in others]
+            ordered_ids.insert(new_position, item_id)
+            self._write_order_indexes(
+                model, None, None,
+                [(row_id, (i + 1) * ORDER_INDEX_STEP) for i, row_id in enumerate(ordered_ids)]
+            )
+        
+        self.db.commit()
+        return True
+    
+    def _write_order_indexes(self, model, parent_column, parent_id, pairs: List[Tuple[UUID, int]]) -> int:
+        """Execute UPDATE ... SET order_index FROM (VALUES ...) and return affected rows"""
+        new_order = values(
+            column("id", PG_UUID(as_uuid=True)),
+            column("order_index", Integer),
+            name="new_order"
+        ).data(pairs)
+        
+        stmt = update(model).where(model.id == new_order.c.id)
+        if parent_column is not None:
+            stmt = stmt.where(parent_column == parent_id)
+        
+        result = self.db.execute(
+            stmt.values(
+                order_index=new_order.c.order_index,
+                updated_at=func.now()
+            ).execution_options(synchronize_session=False)
+        )
+        return result.rowcount
     
     # Lesson Methods
     def create_lesson(self, lesson_create: LessonCreate, module_id: UUID, user_id: str) -> Lesson:
@@ -435,6 +522,7 @@ class LearningService:
             notification=lesson_create.notification,
             duration=lesson_create.duration,
             video_url=lesson_create.video_url,
+            lesson_date=lesson_create.lesson_date,
             order_index=order_index,
             is_active=True,  # Default to active
             module_id=module_id
@@ -460,6 +548,9 @@ class LearningService:
             self.db.commit()
             self.db.refresh(db_lesson)
         
+        if db_lesson.lesson_date is not None:
+            feed_cache.course_changed(module.course_id)
+        
         return db_lesson
     
     def get_lesson_by_id(self, lesson_id: UUID) -> Optional[Lesson]:
@@ -469,6 +560,7 @@ class LearningService:
             joinedload(Lesson.attachments)
         ).filter(Lesson.id == lesson_id).first()
     
+    @read_only
     def get_lessons_by_module(self, module_id: UUID, skip: int = 0, limit: int = 50) -> List[Lesson]:
         """Get lessons by module ID"""
         return self.db.query(Lesson).options(
@@ -500,6 +592,7 @@ class LearningService:
         # Handle attachments separately
         attachments_data = update_data.pop('attachments', None)
         
+        changes = {field: value for field, value in update_data.items() if getattr(lesson, field) != value}
         for field, value in update_data.items():
             setattr(lesson, field, value)
         
@@ -507,30 +600,110 @@ class LearningService:
         
         # Handle attachments if provided
         if attachments_data is not None:
-            # Remove existing attachments
-            existing_attachments = self.db.query(LessonAttachment).filter(
-                LessonAttachment.lesson_id == lesson.id
-            ).all()
-            for attachment in existing_attachments:
-                self.db.delete(attachment)
-            
-            # Add new attachments
-            for attachment_data in attachments_data:
-                if attachment_data.get('name') and attachment_data.get('url'):
-                    db_attachment = LessonAttachment(
-                        name=attachment_data['name'],
-                        url=attachment_data['url'],
-                        file_type=attachment_data.get('file_type'),
-                        file_size=attachment_data.get('file_size'),
-                        lesson_id=lesson.id
-                    )
-                    self.db.add(db_attachment)
+            self._sync_lesson_attachments(lesson, attachments_data)
         
         self.db.commit()
         self.db.refresh(lesson)
         
+        if CALENDAR_LESSON_FIELDS.intersection(changes):
+            feed_cache.course_changed(lesson.module.course_id)
+        
+        # Learners following the course see schedule and link changes without polling
+        if changes or attachments_data is not None:
+            publish_course_event(lesson.module.course_id, "lesson_updated", {
+                "lesson_id": str(lesson.id),
+                "module_id": str(lesson.module_id),
+                "course_id": str(lesson.module.course_id),
+                "changes": jsonable_encoder(changes),
+                "attachments_changed": attachments_data is not None,
+                "updated_at": lesson.updated_at.isoformat()
+            })
+        
         return lesson
     
+    def _sync_lesson_attachments(self, lesson: Lesson, attachments_data: List[dict]):
+        """Diff submitted attachments against stored ones.
+        
+        Items are matched by id, falling back to url. Unchanged rows are left
+        alone; modified, new and removed rows are each written with one statement.
+        """
+        existing_by_id = {attachment.id: attachment for attachment in lesson.attachments}
+        unmatched_by_url = {attachment.url: attachment for attachment in lesson.attachments}
+        matched_ids = set()
+        to_update = []
+        to_insert = []
+        
+        for attachment_data in attachments_data:
+            if not (attachment_data.get('name') and attachment_data.get('url')):
+                continue
+            
+            fields = {
+                "name": attachment_data['name'],
+                "url": attachment_data['url'],
+                "file_type": attachment_data.get('file_type'),
+                "file_size": attachment_data.get('file_size')
+            }
+            
+            existing = None
+            try:
+                existing = existing_by_id.get(UUID(str(attachment_data.get('id'))))
+            except ValueError:
+                pass
+            if existing is None or existing.id in matched_ids:
+                existing = unmatched_by_url.get(fields["url"])
+            
+            if existing is None or existing.id in matched_ids:
+                to_insert.append({**fields, "lesson_id": lesson.id})
+                continue
+            
+            matched_ids.add(existing.id)
+            unmatched_by_url.pop(existing.url, None)
+            if any(getattr(existing, field) != value for field, value in fields.items()):
+                to_update.append((existing.id, *fields.values()))
+        
+        to_delete = [attachment_id for attachment_id in existing_by_id if attachment_id not in matched_ids]
+        
+        if to_delete:
+            self.db.execute(
+                delete(LessonAttachment).where(
+                    LessonAttachment.id.in_(to_delete)
+                ).execution_options(synchronize_session=False)
+            )
+        
+        if to_update:
+            changed = values(
+                column("id", PG_UUID(as_uuid=True)),
+                column("name", String),
+                column("url", String),
+                column("file_type", String),
+                column("file_size", Integer),
+                name="changed"
+            ).data(to_update)
+            self.db.execute(
+                update(LessonAttachment).where(
+                    LessonAttachment.id == changed.c.id
+                ).values(
+                    name=changed.c.name,
+                    url=changed.c.url,
+                    file_type=changed.c.file_type,
+                    file_size=cast(changed.c.file_size, Integer)
+                ).execution_options(synchronize_session=False)
+            )
+        
+        if to_insert:
+            self.db.execute(insert(LessonAttachment).values(to_insert))
+        
+        if to_delete or to_update or to_insert:
+            self.db.expire(lesson, ["attachments"])
+    
+    def reorder_lessons(self, module_id: UUID, items: List[ReorderItem]) -> int:
+        """Apply a new lesson order for a module in a single statement"""
+        return self._bulk_reorder(Lesson, Lesson.module_id, module_id, items)
+    
+    def reorder_lesson(self, lesson_id: UUID, new_position: int) -> bool:
+        """Move a lesson to a zero-based position among its siblings"""
+        return self._move_item(Lesson, Lesson.module_id, lesson_id, new_position)
+    
     def delete_lesson(self, lesson_id: UUID, user_id: str) -> bool:
         """Delete lesson"""
         lesson = self.get_lesson_by_id(lesson_id)
@@ -548,9 +721,13 @@ class LearningService:
                 detail="Not authorized to delete this lesson"
             )
         
+        course_id = lesson.module.course_id
+        self._clear_lesson_bits(course_id, [lesson.progress_ordinal])
         self.db.delete(lesson)
         self.db.commit()
         
+        feed_cache.course_changed(course_id)
+        
         return True
     
     # Lesson Attachment Methods
@@ -616,6 +793,7 @@ class LearningService:
             joinedload(LessonAttachment.lesson).joinedload(Lesson.module).joinedload(Module.course)
         ).filter(LessonAttachment.id == attachment_id).first()
     
+    @read_only
     def get_lesson_attachments(self, lesson_id: UUID) -> List[LessonAttachment]:
         """Get all attachments for a lesson"""
         return self.db.query(LessonAttachment).filter(
@@ -625,8 +803,9 @@ class LearningService:
     # Enrollment Methods
     def enroll_user(self, enrollment_create: UserEnrollmentCreate, user_id: str) -> UserEnrollment:
         """Enroll user in a course"""
-        # Check if course exists
-        course = self.get_course_by_id(enrollment_create.course_id)
+        course = self.db.query(Course.is_published).filter(
+            Course.id == enrollment_create.course_id
+        ).first()
         if not course:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -639,37 +818,194 @@ class LearningService:
                 detail="Cannot enroll in unpublished course"
             )
         
-        # Check if user is already enrolled
-        existing_enrollment = self.db.query(UserEnrollment).filter(
-            and_(
-                UserEnrollment.user_id == user_id,
-                UserEnrollment.course_id == enrollment_create.course_id
-            )
-        ).first()
+        return self._insert_enrollment(user_id, enrollment_create.course_id)
+    
+    def _insert_enrollment(self, user_id, course_id) -> UserEnrollment:
+        """Insert an enrollment and count it on the course, or 400 if the user is already enrolled"""
+        # The unique constraint arbitrates concurrent requests; the one that loses gets no row back
+        stmt = pg_insert(UserEnrollment).values(
+            user_id=user_id,
+            course_id=course_id,
+            enrolled_at=datetime.utcnow()
+        ).on_conflict_do_nothing(
+            index_elements=[UserEnrollment.user_id, UserEnrollment.course_id]
+        ).returning(UserEnrollment)
+        enrollment = self.db.scalars(stmt).first()
         
-        if existing_enrollment:
+        if enrollment is None:
+            self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="User is already enrolled in this course"
             )
         
-        # Create enrollment
-        db_enrollment = UserEnrollment(
-            user_id=user_id,
-            course_id=enrollment_create.course_id,
-            enrolled_at=datetime.utcnow()
+        # Incremented in SQL so concurrent enrollments cannot overwrite each other's count
+        self.db.execute(
+            update(Course).where(Course.id == course_id).values(
+                enrollment_count=Course.enrollment_count + 1
+            ).execution_options(synchronize_session=False)
         )
+        self.db.commit()
+        feed_cache.user_changed(user_id)
         
-        self.db.add(db_enrollment)
-        
-        # Update course enrollment count
-        course.enrollment_count += 1
+        return enrollment
+    
+    @read_only
+    def get_learner_dashboard(self, user_id: str, skip: int = 0, limit: int = 20) -> List[dict]:
+        """Get the user's enrollments with course, progress and next lesson in a single query"""
+        enrolled_courses = select(UserEnrollment.course_id).where(UserEnrollment.user_id == user_id)
+        
+        # Lessons numbered in outline order; the first one not completed per course is next
+        outline = select(
+            Module.course_id,
+            Lesson.id.label("lesson_id"),
+            Lesson.title.label("lesson_title"),
+            Module.id.label("module_id"),
+            Module.title.label("module_title"),
+            func.row_number().over(
+                partition_by=Module.course_id,
+                order_by=(Module.order_index, Lesson.order_index, Lesson.id)
+            ).label("position")
+        ).join_from(
+            Module, Lesson, Lesson.module_id == Module.id
+        ).where(
+            Module.course_id.in_(enrolled_courses)
+        )
         
-        self.db.commit()
-        self.db.refresh(db_enrollment)
+        if _reads_progress_bits():
+            # Completed lessons are the popcount of the enrollment bitset
+            lesson_stats = select(
+                Module.course_id,
+                func.count(Lesson.id).label("total_lessons")
+            ).join(
+                Lesson, Lesson.module_id == Module.id
+            ).where(
+                Module.course_id.in_(enrolled_courses)
+            ).group_by(Module.course_id).subquery()
+            completed_lessons = sql_popcount(UserEnrollment.completed_lesson_bits)
+            
+            enrollment = aliased(UserEnrollment)
+            remaining = outline.join(
+                enrollment,
+                and_(
+                    enrollment.course_id == Module.course_id,
+                    enrollment.user_id == user_id
+                )
+            ).where(
+                ~sql_has_bit(enrollment.completed_lesson_bits, Lesson.progress_ordinal)
+            ).subquery()
+        else:
+            completed_progress = and_(
+                UserProgress.lesson_id == Lesson.id,
+                UserProgress.user_id == user_id,
+                UserProgress.is_completed.is_(True)
+            )
+            lesson_stats = select(
+                Module.course_id,
+                func.count(Lesson.id).label("total_lessons"),
+                func.count(UserProgress.id).label("completed_lessons")
+            ).join(
+                Lesson, Lesson.module_id == Module.id
+            ).outerjoin(
+                UserProgress, completed_progress
+            ).where(
+                Module.course_id.in_(enrolled_courses)
+            ).group_by(Module.course_id).subquery()
+            completed_lessons = lesson_stats.c.completed_lessons
+            remaining = outline.where(
+                ~select(UserProgress.id).where(completed_progress).exists()
+            ).subquery()
+        
+        rows = self.db.execute(
+            select(
+                UserEnrollment,
+                Course,
+                lesson_stats.c.total_lessons,
+                completed_lessons,
+                remaining.c.lesson_id,
+                remaining.c.lesson_title,
+                remaining.c.module_id,
+                remaining.c.module_title
+            ).join(
+                Course, Course.id == UserEnrollment.course_id
+            ).outerjoin(
+                lesson_stats, lesson_stats.c.course_id == UserEnrollment.course_id
+            ).outerjoin(
+                remaining,
+                and_(
+                    remaining.c.course_id == UserEnrollment.course_id,
+                    remaining.c.position == 1
+                )
+            ).where(
+                UserEnrollment.user_id == user_id
+            ).options(
+                defer(Course.description)
+            ).order_by(
+                desc(func.coalesce(UserEnrollment.last_accessed_at, UserEnrollment.enrolled_at))
+            ).offset(skip).limit(limit)
+        ).all()
         
-        return db_enrollment
+        dashboard = []
+        for enrollment, course, total, completed, lesson_id, lesson_title, module_id, module_title in rows:
+            total = total or 0
+            completed = completed or 0
+            dashboard.append({
+                "course": course,
+                "enrolled_at": enrollment.enrolled_at,
+                "last_accessed_at": enrollment.last_accessed_at,
+                "is_completed": enrollment.is_completed,
+                "completed_at": enrollment.completed_at,
+                "total_lessons": total,
+                "completed_lessons": completed,
+                "progress_percentage": round(completed * 100 / total, 2) if total else 0.0,
+                "next_lesson": {
+                    "id": lesson_id,
+                    "title": lesson_title,
+                    "module_id": module_id,
+                    "module_title": module_title
+                } if lesson_id is not None else None
+            })
+        return dashboard
     
+    @read_only
+    def get_schedule(self, user_id: str, start: datetime, end: datetime, limit: int = 500) -> list:
+        """Get the user's active lessons dated in [start, end) across enrolled courses, soonest first, in one query"""
+        return self.db.query(
+            Lesson.id.label("lesson_id"),
+            Lesson.title,
+            Lesson.lesson_date,
+            Lesson.duration,
+            Lesson.instructor,
+            Lesson.zoom_link,
+            Lesson.updated_at,
+            Module.id.label("module_id"),
+            Module.title.label("module_title"),
+            Course.id.label("course_id"),
+            Course.title.label("course_title")
+        ).select_from(UserEnrollment).join(
+            Course, Course.id == UserEnrollment.course_id
+        ).join(
+            Module, Module.course_id == Course.id
+        ).join(
+            Lesson, Lesson.module_id == Module.id
+        ).filter(
+            UserEnrollment.user_id == user_id,
+            # Matches the partial index predicate so each module is one range scan
+            Lesson.lesson_date.isnot(None),
+            Lesson.is_active == True,
+            Lesson.lesson_date >= start,
+            Lesson.lesson_date < end
+        ).order_by(
+            Lesson.lesson_date, Lesson.id
+        ).limit(limit).all()
+    
+    def get_enrolled_course_ids(self, user_id: str) -> List[UUID]:
+        """Get the ids of every course the user is enrolled in"""
+        return self.db.scalars(
+            select(UserEnrollment.course_id).where(UserEnrollment.user_id == user_id)
+        ).all()
+    
+    @read_only
     def get_user_enrollments(self, user_id: str, skip: int = 0, limit: int = 10) -> List[UserEnrollment]:
         """Get user's course enrollments"""
         return self.db.query(UserEnrollment).options(
@@ -689,6 +1025,42 @@ class LearningService:
             )
         ).first()
     
+    def check_course_follower(self, course_id: UUID, user_id: str) -> None:
+        """Allow the course's learners, its instructor and admins to follow its live updates, in one query"""
+        row = self.db.query(
+            Course.instructor_id,
+            User.role,
+            User.is_active,
+            UserEnrollment.id.label("enrollment_id")
+        ).select_from(Course).join(
+            User, User.id == user_id
+        ).outerjoin(
+            UserEnrollment,
+            and_(
+                UserEnrollment.course_id == Course.id,
+                UserEnrollment.user_id == user_id
+            )
+        ).filter(Course.id == course_id).first()
+    
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Course not found"
+            )
+    
+        if not row.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Inactive user"
+            )
+    
+        if row.enrollment_id is None and str(row.instructor_id) != str(user_id) and row.role != UserRole.ADMIN:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="User is not enrolled in this course"
+            )
+    
+    @read_only
     def get_course_enrollments(self, course_id: str, skip: int = 0, limit: int = 10) -> List[UserEnrollment]:
         """Get course enrollments"""
         return self.db.query(UserEnrollment).options(
@@ -701,129 +1073,153 @@ class LearningService:
     
     def unenroll_user(self, course_id: str, user_id: str) -> bool:
         """Unenroll user from course"""
-        enrollment = self.db.query(UserEnrollment).filter(
-            and_(
+        # Only the request whose delete returns the row decrements, so concurrent calls count once
+        deleted = self.db.execute(
+            delete(UserEnrollment).where(
                 UserEnrollment.user_id == user_id,
                 UserEnrollment.course_id == course_id
-            )
+            ).returning(UserEnrollment.id).execution_options(synchronize_session=False)
         ).first()
         
-        if not enrollment:
+        if deleted is None:
+            self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Enrollment not found"
             )
         
-        # Update course enrollment count
-        course = self.get_course_by_id(course_id)
-        if course:
-            course.enrollment_count = max(0, course.enrollment_count - 1)
-        
-        self.db.delete(enrollment)
+        # Decremented in SQL, like the increment in _insert_enrollment
+        self.db.execute(
+            update(Course).where(Course.id == course_id).values(
+                enrollment_count=func.greatest(Course.enrollment_count - 1, 0)
+            ).execution_options(synchronize_session=False)
+        )
         self.db.commit()
+        feed_cache.user_changed(user_id)
         
         return True
     
     # Progress Tracking Methods
-    def mark_lesson_complete(self, lesson_id: UUID, user_id: str) -> UserProgress:
-        """Mark lesson as completed for user"""
-        # Check if lesson exists
-        lesson = self.get_lesson_by_id(lesson_id)
-        if not lesson:
+    def _enrolled_lesson(self, lesson_id: UUID, user_id: str):
+        """Return the lesson's course id and progress ordinal with the user's enrollment id, checking both in one query"""
+        row = self.db.query(
+            Module.course_id,
+            Lesson.progress_ordinal,
+            UserEnrollment.id.label("enrollment_id")
+        ).select_from(Lesson).join(
+            Module, Lesson.module_id == Module.id
+        ).outerjoin(
+            UserEnrollment,
+            and_(
+                UserEnrollment.course_id == Module.course_id,
+                UserEnrollment.user_id == user_id
+            )
+        ).filter(Lesson.id == lesson_id).first()
+        
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Lesson not found"
             )
         
-        # Check if user is enrolled in the course
-        enrollment = self.db.query(UserEnrollment).filter(
-            and_(
-                UserEnrollment.user_id == user_id,
-                UserEnrollment.course_id == lesson.module.course_id
-            )
-        ).first()
-        
-        if not enrollment:
+        if row.enrollment_id is None:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="User is not enrolled in this course"
             )
         
-        # Check if progress already exists
-        existing_progress = self.db.query(UserProgress).filter(
-            and_(
-                UserProgress.user_id == user_id,
-                UserProgress.lesson_id == lesson_id
-            )
-        ).first()
+        return row
+    
+    def mark_lesson_complete(self, lesson_id: UUID, user_id: str) -> Union[UserProgress, dict]:
+        """Mark lesson as completed for user"""
+        lesson = self._enrolled_lesson(lesson_id, user_id)
+        completed_at = datetime.now(timezone.utc)
+        progress = {"lesson_id": lesson_id, "user_id": user_id, "is_completed": True, "completed_at": completed_at}
         
-        if existing_progress:
-            existing_progress.is_completed = True
-            existing_progress.completed_at = datetime.utcnow()
-            progress = existing_progress
-        else:
-            progress = UserProgress(
+        if _writes_progress_rows():
+            # Insert or update in one statement; the unique index makes repeated or concurrent calls converge
+            stmt = pg_insert(UserProgress).values(
                 user_id=user_id,
                 lesson_id=lesson_id,
                 is_completed=True,
-                completed_at=datetime.utcnow()
+                completed_at=completed_at
             )
-            self.db.add(progress)
-        
-        self.db.commit()
-        self.db.refresh(progress)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[UserProgress.user_id, UserProgress.lesson_id],
+                set_={
+                    "is_completed": True,
+                    # Repeat completions keep the original time; uncompleting clears it
+                    "completed_at": func.coalesce(UserProgress.completed_at, stmt.excluded.completed_at),
+                    "updated_at": func.now()
+                }
+            ).returning(UserProgress)
+            progress = self.db.scalars(stmt, execution_options={"populate_existing": True}).one()
+        
+        if _writes_progress_bits():
+            self._write_lesson_bit(lesson.enrollment_id, lesson.course_id, lesson.progress_ordinal, True)
         
         # Update overall course progress
-        self._update_course_progress(user_id, lesson.module.course_id)
+        if not _reads_progress_bits():
+            self._update_course_progress(user_id, lesson.course_id)
+        self.db.commit()
         
         return progress
     
     def uncomplete_lesson(self, lesson_id: UUID, user_id: str) -> bool:
         """Mark lesson as uncompleted for user"""
-        # Check if lesson exists
-        lesson = self.get_lesson_by_id(lesson_id)
-        if not lesson:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Lesson not found"
+        lesson = self._enrolled_lesson(lesson_id, user_id)
+        changed = False
+        
+        if _writes_progress_rows():
+            result = self.db.execute(
+                update(UserProgress).where(
+                    and_(
+                        UserProgress.user_id == user_id,
+                        UserProgress.lesson_id == lesson_id
+                    )
+                ).values(
+                    is_completed=False,
+                    completed_at=None,
+                    updated_at=func.now()
+                ).execution_options(synchronize_session=False)
             )
+            changed = bool(result.rowcount)
         
-        # Check if user is enrolled in the course
-        enrollment = self.db.query(UserEnrollment).filter(
-            and_(
-                UserEnrollment.user_id == user_id,
-                UserEnrollment.course_id == lesson.module.course_id
-            )
-        ).first()
+        if _writes_progress_bits():
+            cleared = self._write_lesson_bit(lesson.enrollment_id, lesson.course_id, lesson.progress_ordinal, False)
+            if _reads_progress_bits():
+                changed = cleared
         
-        if not enrollment:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="User is not enrolled in this course"
-            )
+        if not changed:
+            self.db.rollback()
+            return False
         
-        # Find existing progress
-        existing_progress = self.db.query(UserProgress).filter(
-            and_(
-                UserProgress.user_id == user_id,
-                UserProgress.lesson_id == lesson_id
-            )
-        ).first()
-        
-        if existing_progress:
-            existing_progress.is_completed = False
-            existing_progress.completed_at = None
-            self.db.commit()
-            
-            # Update overall course progress
-            self._update_course_progress(user_id, lesson.module.course_id)
-            
-            return True
+        # Update overall course progress
+        if not _reads_progress_bits():
+            self._update_course_progress(user_id, lesson.course_id)
+        self.db.commit()
         
-        return False
+        return True
     
-    def get_user_lesson_progress(self, user_id: str, lesson_id: UUID) -> Optional[UserProgress]:
+    def get_user_lesson_progress(self, user_id: str, lesson_id: UUID) -> Union[UserProgress, dict, None]:
         """Get user's progress for a specific lesson"""
+        if _reads_progress_bits():
+            completed = self.db.query(
+                sql_has_bit(UserEnrollment.completed_lesson_bits, Lesson.progress_ordinal)
+            ).select_from(Lesson).join(
+                Module, Lesson.module_id == Module.id
+            ).join(
+                UserEnrollment,
+                and_(
+                    UserEnrollment.course_id == Module.course_id,
+                    UserEnrollment.user_id == user_id
+                )
+            ).filter(Lesson.id == lesson_id).scalar()
+            # Bitsets record completion only, not when it happened
+            if not completed:
+                return None
+            return {"lesson_id": lesson_id, "user_id": user_id, "is_completed": True, "completed_at": None}
+        
         return self.db.query(UserProgress).filter(
             and_(
                 UserProgress.user_id == user_id,
@@ -831,56 +1227,139 @@ class LearningService:
             )
         ).first()
     
-    def get_user_course_progress(self, user_id: str, course_id: str) -> Optional[UserProgress]:
-        """Get user's progress for a specific course"""
-        return self.db.query(UserProgress).filter(
-            and_(
-                UserProgress.user_id == user_id,
-                UserProgress.course_id == course_id
+    @read_only
+    def get_course_lesson_progress(self, user_id: str, course_id: UUID) -> list:
+        """Get the user's completion state of every lesson in a course, in outline order, in one query"""
+        if _reads_progress_bits():
+            lessons = self.db.query(
+                Lesson.id.label("lesson_id"),
+                Lesson.module_id,
+                sql_has_bit(UserEnrollment.completed_lesson_bits, Lesson.progress_ordinal).label("is_completed"),
+                null().label("completed_at")
+            ).join(
+                Module, Lesson.module_id == Module.id
+            ).outerjoin(
+                UserEnrollment,
+                and_(
+                    UserEnrollment.course_id == Module.course_id,
+                    UserEnrollment.user_id == user_id
+                )
             )
-        ).first()
+        else:
+            lessons = self.db.query(
+                Lesson.id.label("lesson_id"),
+                Lesson.module_id,
+                func.coalesce(UserProgress.is_completed, False).label("is_completed"),
+                UserProgress.completed_at
+            ).join(
+                Module, Lesson.module_id == Module.id
+            ).outerjoin(
+                UserProgress,
+                and_(
+                    UserProgress.lesson_id == Lesson.id,
+                    UserProgress.user_id == user_id
+                )
+            )
+        
+        lessons = lessons.filter(
+            Module.course_id == course_id
+        ).order_by(
+            Module.order_index, Lesson.order_index, Lesson.id
+        ).all()
+        
+        # Only a course without lessons needs a second look to tell it from a missing one
+        if not lessons and not self.db.query(Course.id).filter(Course.id == course_id).first():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Course not found"
+            )
+        
+        return lessons
+    
     
     def _update_course_progress(self, user_id: str, course_id: str):
-        """Update user's overall progress for a course"""
-        # Get total lessons in course
-        total_lessons = self.db.query(func.count(Lesson.id)).join(
-            Module, Lesson.module_id == Module.id
-        ).filter(Module.course_id == course_id).scalar()
-        
-        # Get completed lessons by user
-        completed_lessons = self.db.query(func.count(UserProgress.id)).join(
-            Lesson, UserProgress.lesson_id == Lesson.id
-        ).join(
+        """Recompute the enrollment's progress from the user's completed lessons, in the caller's transaction"""
+        completed = func.count(UserProgress.id).filter(UserProgress.is_completed.is_(True))
+        stats = select(
+            Module.course_id,
+            (completed * 100.0 / func.count(Lesson.id)).label("percentage")
+        ).select_from(Lesson).join(
             Module, Lesson.module_id == Module.id
-        ).filter(
+        ).outerjoin(
+            UserProgress,
             and_(
-                Module.course_id == course_id,
-                UserProgress.user_id == user_id,
-            UserProgress.is_completed == True
+                UserProgress.lesson_id == Lesson.id,
+                UserProgress.user_id == user_id
             )
-        ).scalar()
-        
-        # Calculate progress percentage
-        progress_percentage = (completed_lessons / total_lessons * 100) if total_lessons > 0 else 0
-        
-        # Update or create progress record
-        existing_progress = self.get_user_course_progress(user_id, course_id)
+        ).where(Module.course_id == course_id).group_by(Module.course_id).subquery()
         
-        if existing_progress:
-            existing_progress.progress_percentage = progress_percentage
-            existing_progress.last_accessed_at = datetime.utcnow()
-            if progress_percentage >= 100:
-                existing_progress.is_completed = True
-                existing_progress.completed_at = datetime.utcnow()
-        else:
-            progress = UserProgress(
-                user_id=user_id,
-                course_id=course_id,
-                progress_percentage=progress_percentage,
-                is_completed=progress_percentage >= 100,
-                completed_at=datetime.utcnow() if progress_percentage >= 100 else None,
-                last_accessed_at=datetime.utcnow()
+        finished = stats.c.percentage >= 100
+        self.db.execute(
+            update(UserEnrollment).where(
+                and_(
+                    UserEnrollment.user_id == user_id,
+                    UserEnrollment.course_id == stats.c.course_id
+                )
+            ).values(
+                progress_percentage=stats.c.percentage,
+                is_completed=finished,
+                completed_at=case(
+                    (finished, func.coalesce(UserEnrollment.completed_at, func.now())),
+                    else_=None
+                ),
+                last_accessed_at=func.now()
+            ).execution_options(synchronize_session=False)
+        )
+    
+    def _total_lessons(self, course_id):
+        """Scalar subquery counting the course's lessons"""
+        return select(func.count(Lesson.id)).join(
+            Module, Lesson.module_id == Module.id
+        ).where(Module.course_id == course_id).scalar_subquery()
+    
+    def _write_lesson_bit(self, enrollment_id: UUID, course_id: UUID, ordinal: int, completed: bool) -> bool:
+        """Set or clear a lesson's bit in the enrollment bitset, in the caller's transaction.
+        
+        When progress is read from bitsets the same UPDATE refreshes the
+        enrollment's percentage from the popcount of the new bitset. Returns
+        False when clearing a bit that was not set.
+        """
+        bits = UserEnrollment.completed_lesson_bits
+        new_bits = sql_set_bit(bits, ordinal) if completed else sql_clear_bit(bits, ordinal)
+        values = {"completed_lesson_bits": new_bits}
+        
+        if _reads_progress_bits():
+            percentage = func.coalesce(
+                sql_popcount(new_bits) * 100.0 / func.nullif(self._total_lessons(course_id), 0), 0
+            )
+            finished = percentage >= 100
+            values.update(
+                progress_percentage=percentage,
+                is_completed=finished,
+                completed_at=case(
+                    (finished, func.coalesce(UserEnrollment.completed_at, func.now())),
+                    else_=None
+                ),
+                last_accessed_at=func.now()
             )
-            self.db.add(progress)
         
-        self.db.commit()
\ No newline at end of file
+        stmt = update(UserEnrollment).where(UserEnrollment.id == enrollment_id)
+        if not completed:
+            stmt = stmt.where(sql_has_bit(bits, ordinal))
+        result = self.db.execute(stmt.values(**values).execution_options(synchronize_session=False))
+        return bool(result.rowcount)
+    
+    def _clear_lesson_bits(self, course_id: UUID, ordinals: List[int]):
+        """Clear deleted lessons from every enrollment bitset of the course so popcounts stay exact"""
+        if not ordinals or not _writes_progress_bits():
+            return
+        bits = UserEnrollment.completed_lesson_bits
+        for ordinal in ordinals:
+            bits = sql_clear_bit(bits, ordinal)
+        self.db.execute(
+            update(UserEnrollment).where(
+                UserEnrollment.course_id == course_id
+            ).values(
+                completed_lesson_bits=bits
+            ).execution_options(synchronize_session=False)
+        )
@@ -0,0 +1,163 @@
+from typing import Optional
+from uuid import UUID
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func, or_, true
+
+from ..core.bitmap import sql_popcount
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..core.replicas import read_only
+from ..models.learning import Course, Module, Lesson, UserEnrollment
+from ..models.blog import BlogPost
+from ..models.user import User
+
+
+# Shared across requests in this worker; disabled when STATS_CACHE_TTL_SECONDS is 0
+_stats_cache = TTLCache(ttl_seconds=settings.STATS_CACHE_TTL_SECONDS)
+
+
+class StatsService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    @read_only
+    def get_course_stats(self, course_id: UUID) -> Optional[dict]:
+        """Get course statistics with a single aggregate query"""
+        cache_key = ("course", str(course_id))
+        cached = _stats_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        completed = or_(
+            UserEnrollment.is_completed == True,
+            UserEnrollment.progress_percentage >= 100
+        )
+
+        if settings.PROGRESS_STORE == "bitset":
+            # Exact progress from one popcount per enrollment bitset, rescaled once by the outline size
+            average = func.coalesce(func.avg(sql_popcount(UserEnrollment.completed_lesson_bits)), 0.0)
+        else:
+            average = func.coalesce(func.avg(UserEnrollment.progress_percentage), 0.0)
+
+        enrollment_stats = select(
+            func.count(UserEnrollment.id).label("total_enrollments"),
+            func.count(UserEnrollment.id).filter(~completed).label("active_enrollments"),
+            func.count(UserEnrollment.id).filter(completed).label("completed_enrollments"),
+            average.label("average_progress")
+        ).where(
+            UserEnrollment.course_id == course_id
+        ).subquery()
+
+        outline_stats = select(
+            func.count(func.distinct(Module.id)).label("total_modules"),
+            func.count(Lesson.id).label("total_lessons")
+        ).select_from(Module).outerjoin(
+            Lesson, Lesson.module_id == Module.id
+        ).where(
+            Module.course_id == course_id
+        ).subquery()
+
+        row = self.db.execute(
+            select(
+                Course.id,
+                Course.title,
+                Course.is_published,
+                Course.instructor_id,
+                Course.created_at,
+                Course.updated_at,
+                enrollment_stats,
+                outline_stats
+            ).select_from(Course).join(
+                enrollment_stats, true()
+            ).join(
+                outline_stats, true()
+            ).where(Course.id == course_id)
+        ).mappings().first()
+
+        if row is None:
+            return None
+
+        average_progress = float(row["average_progress"])
+        if settings.PROGRESS_STORE == "bitset":
+            average_progress = average_progress * 100 / row["total_lessons"] if row["total_lessons"] else 0.0
+
+        stats = {
+            "course_id": row["id"],
+            "title": row["title"],
+            "is_published": row["is_published"],
+            "instructor_id": row["instructor_id"],
+            "total_enrollments": row["total_enrollments"],
+            "active_enrollments": row["active_enrollments"],
+            "completed_enrollments": row["completed_enrollments"],
+            "average_progress": average_progress,
+            "total_modules": row["total_modules"],
+            "total_lessons": row["total_lessons"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"]
+        }
+
+        _stats_cache.set(cache_key, stats)
+        return stats
+
+    @read_only
+    def get_user_stats(self, user_id: UUID) -> Optional[dict]:
+        """Get user statistics with a single aggregate query"""
+        cache_key = ("user", str(user_id))
+        cached = _stats_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        enrollment_stats = select(
+            func.count(UserEnrollment.id).label("total_courses_enrolled"),
+            func.count(UserEnrollment.id).filter(
+                UserEnrollment.is_completed == True
+            ).label("total_courses_completed"),
+            func.max(UserEnrollment.last_accessed_at).label("last_accessed_at")
+        ).where(
+            UserEnrollment.user_id == user_id
+        ).subquery()
+
+        blog_stats = select(
+            func.count(BlogPost.id).label("total_blog_posts"),
+            func.count(BlogPost.id).filter(
+                BlogPost.status == "published"
+            ).label("total_published_posts"),
+            func.coalesce(func.sum(BlogPost.view_count), 0).label("total_post_views")
+        ).where(
+            BlogPost.author_id == user_id
+        ).subquery()
+
+        row = self.db.execute(
+            select(
+                User.id,
+                User.created_at,
+                User.is_active,
+                User.role,
+                enrollment_stats,
+                blog_stats
+            ).select_from(User).join(
+                enrollment_stats, true()
+            ).join(
+                blog_stats, true()
+            ).where(User.id == user_id)
+        ).mappings().first()
+
+        if row is None:
+            return None
+
+        stats = {
+            "user_id": row["id"],
+            "total_courses_enrolled": row["total_courses_enrolled"],
+            "total_courses_completed": row["total_courses_completed"],
+            "total_blog_posts": row["total_blog_posts"],
+            "total_published_posts": row["total_published_posts"],
+            "total_post_views": int(row["total_post_views"]),
+            "account_created": row["created_at"],
+            "last_accessed_at": row["last_accessed_at"],
+            "is_active": row["is_active"],
+            "role": row["role"]
+        }
+
+        _stats_cache.set(cache_key, stats)
+        return stats
+
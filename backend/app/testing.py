@@ -0,0 +1,70 @@
+"""Pytest helpers for keeping SQL query counts in check.
+
+Enable with ``pytest -p app.testing`` or ``pytest_plugins = ["app.testing"]``
+in a conftest, then either mark a test::
+
+    @pytest.mark.query_budget(4)
+    def test_list_courses(client, query_budget):
+        client.get("/api/v1/courses/")
+
+or use the fixture inline::
+
+    def test_list_courses(client, query_budget):
+        with query_budget(4):
+            client.get("/api/v1/courses/")
+"""
+from contextlib import contextmanager
+from typing import Iterator
+
+import pytest
+
+from .core.database import engine
+from .core.sql_profiler import SQLProfile, install_sql_profiler, profile_queries
+
+
+_installed = False
+
+
+def _ensure_profiler() -> None:
+    global _installed
+    if not _installed:
+        install_sql_profiler(engine)
+        _installed = True
+
+
+def _check_budget(profile: SQLProfile, budget: int) -> None:
+    if profile.count <= budget:
+        return
+
+    lines = [f"{profile.count} SQL statements executed, budget is {budget}"]
+    for repeated in profile.repeated_shapes():
+        lines.append(f"  possible N+1 ({repeated['count']}x): {repeated['shape']}")
+        lines.extend(f"    at {frame}" for frame in repeated["stack"])
+    pytest.fail("\n".join(lines), pytrace=False)
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "query_budget(n): fail the test if it executes more than n SQL statements"
+    )
+
+
+@pytest.fixture
+def query_budget(request):
+    """Fail the test when SQL statements exceed a declared budget"""
+    _ensure_profiler()
+
+    @contextmanager
+    def budget(limit: int) -> Iterator[SQLProfile]:
+        with profile_queries() as profile:
+            yield profile
+        _check_budget(profile, limit)
+
+    marker = request.node.get_closest_marker("query_budget")
+    if marker is None:
+        yield budget
+        return
+
+    with profile_queries() as profile:
+        yield budget
+    _check_budget(profile, marker.args[0])
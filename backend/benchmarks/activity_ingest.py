@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Measure heartbeat ingestion throughput and check that no time is lost.
+
+Virtual clients post batched activity events to POST /lessons/activity
+against the ASGI app in-process, for lessons of courses their user is
+enrolled in. The app's own flusher writes the buffer on its interval; the
+lifespan shutdown flushes the rest. The report shows ingested events per
+second, request latency, every flush with its size and duration, and
+whether the time_spent added in the database equals the seconds sent,
+after the per-lesson cap the endpoint applies to each batch:
+
+    python benchmarks/activity_ingest.py --duration 10 --concurrency 32
+    python benchmarks/activity_ingest.py --store bitset --events-per-request 50
+
+Exits with status 1 if the stored total does not match.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import List, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Ingestion must not be throttled or shed
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("LOAD_SHEDDING_ENABLED", "false")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--events-per-request", type=int, default=20)
+    parser.add_argument("--users", type=int, default=500, help="enrolled users to send heartbeats as")
+    parser.add_argument("--flush-interval", type=float, default=1.0)
+    parser.add_argument("--store", choices=("rows", "dual", "bitset"), help="override PROGRESS_STORE")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args(argv)
+
+
+STORED_SECONDS = {
+    "rows": "SELECT coalesce(sum(time_spent), 0) FROM user_progress",
+    "bitset": "SELECT coalesce(sum(seconds), 0) FROM enrollment_lesson_time",
+}
+
+
+async def main_async(args: argparse.Namespace) -> int:
+    import httpx
+    from sqlalchemy import text
+
+    from app.core import activity
+    from app.core.activity import cap_lesson_seconds
+    from app.core.config import settings
+    from app.schemas.learning import MAX_EVENT_SECONDS
+    from app.core.database import engine
+    from app.core.security import create_access_token
+    from app.main import app
+
+    settings.ACTIVITY_FLUSH_INTERVAL_SECONDS = args.flush_interval
+    if args.store:
+        settings.PROGRESS_STORE = args.store
+    stored = STORED_SECONDS["bitset" if settings.PROGRESS_STORE == "bitset" else "rows"]
+
+    with engine.connect() as conn:
+        rows = conn.execute(text("""
+            SELECT e.user_id, u.token_version, array_agg(l.id) AS lessons
+            FROM user_enrollments e
+            JOIN users u ON u.id = e.user_id AND u.is_active
+            JOIN modules m ON m.course_id = e.course_id
+            JOIN lessons l ON l.module_id = m.id
+            GROUP BY e.user_id, u.token_version
+            LIMIT :users
+        """), {"users": args.users}).all()
+        before = conn.execute(text(stored)).scalar()
+    if not rows:
+        print("No enrollments to send heartbeats for; seed the database first")
+        return 1
+
+    clients: List[Tuple[dict, list]] = [
+        ({"Authorization": f"Bearer {create_access_token(user_id, version=version)}"}, [str(l) for l in lessons])
+        for user_id, version, lessons in rows
+    ]
+
+    flushes = []
+    write_activity = activity.write_activity
+
+    def timed_write(engine, entries, store="rows"):
+        started = time.perf_counter()
+        written = write_activity(engine, entries, store)
+        flushes.append((len(entries), written, time.perf_counter() - started))
+        return written
+
+    activity.write_activity = timed_write
+
+    sent_seconds = sent_events = 0
+    latencies: List[float] = []
+    errors = 0
+
+    async def client_loop(client: httpx.AsyncClient, worker: int, deadline: float) -> None:
+        nonlocal sent_seconds, sent_events, errors
+        rng = random.Random(f"{args.seed}:{worker}")
+        while time.perf_counter() < deadline:
+            headers, lessons = rng.choice(clients)
+            now = datetime.now(timezone.utc).isoformat()
+            events = [
+                {"lesson_id": rng.choice(lessons), "seconds": rng.randint(5, 30), "occurred_at": now}
+                for _ in range(args.events_per_request)
+            ]
+            started = time.perf_counter()
+            response = await client.post("/lessons/activity", json={"events": events}, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code == 202:
+                sent_events += len(events)
+                capped = cap_lesson_seconds(
+                    ((event["lesson_id"], event["seconds"], 0.0) for event in events),
+                    MAX_EVENT_SECONDS, settings.ACTIVITY_MAX_SECONDS_PER_LESSON
+                )
+                sent_seconds += sum(seconds for _, seconds, _ in capped)
+            else:
+                errors += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://localhost/api/v1") as client:
+            started = time.perf_counter()
+            deadline = started + args.duration
+            await asyncio.gather(*(client_loop(client, worker, deadline) for worker in range(args.concurrency)))
+            elapsed = time.perf_counter() - started
+    activity.write_activity = write_activity
+
+    with engine.connect() as conn:
+        added = conn.execute(text(stored)).scalar() - before
+
+    latencies.sort()
+    print(f"requests   {len(latencies):>10,}  {len(latencies) / elapsed:>10,.0f}/s  errors {errors}")
+    print(f"events     {sent_events:>10,}  {sent_events / elapsed:>10,.0f}/s")
+    print(
+        f"latency    p50 {statistics.median(latencies) * 1000:.2f} ms  "
+        f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:.2f} ms"
+    )
+    for pairs, written, duration in flushes:
+        print(f"flush      {pairs:>10,} pairs  {written:>10,} written  {duration * 1000:8.1f} ms")
+    ok = added == sent_seconds
+    print(f"seconds    sent {sent_seconds:,}  stored {added:,}  {'ok' if ok else 'MISMATCH'}")
+    return 0 if ok else 1
+
+
+def main(argv=None) -> int:
+    return asyncio.run(main_async(parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
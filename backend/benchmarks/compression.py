@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Bandwidth versus CPU for response compression at different levels.
+
+Builds two representative JSON bodies in memory (no database needed):
+
+    blog detail      one ~2000-word post with rendered HTML and TOC
+    course outline   modules and lessons with attachments, a few hundred KB
+
+and reports compressed size, ratio and compression time for gzip levels and
+brotli qualities, plus the cost of a CompressionMiddleware cache hit
+(digest + lookup) for comparison:
+
+    python benchmarks/compression.py --repeat 20
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+import zlib
+from datetime import datetime, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import orjson  # noqa: E402
+
+from app.core.cache import TTLCache  # noqa: E402
+from app.core.compression import CompressionMiddleware, brotli  # noqa: E402
+from app.core.content import derive_post_content  # noqa: E402
+
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc).isoformat()
+WORDS = (
+    "model training data vector query index cache latency learning course module lesson "
+    "python async stream event design review practice gradient network batch tensor"
+).split()
+
+
+def article(words: int) -> str:
+    rng = random.Random(7)
+    vocabulary = WORDS + [f"{word}{suffix}" for word in WORDS for suffix in ("s", "ing", "ed", "er")]
+    sections = []
+    for section in range(words // 200):
+        body = " ".join(rng.choice(vocabulary) for _ in range(200))
+        sections.append(f"## Section {section}\n\n{body}\n\n```python\nprint({section})\n```")
+    return "\n\n".join(sections)
+
+
+def blog_detail_body(words: int) -> bytes:
+    content = article(words)
+    post = {
+        "id": str(uuid.uuid4()), "title": "Compression benchmark post", "slug": "compression-benchmark-post",
+        "content": content, "excerpt": content[:300], "is_published": True, "view_count": 42,
+        "created_at": NOW, "updated_at": NOW, "published_at": NOW, "author_id": str(uuid.uuid4()),
+        "author": {"id": str(uuid.uuid4()), "email": "author@example.com", "full_name": "Author"},
+        "category": {"id": str(uuid.uuid4()), "name": "Engineering"},
+        "tags": [{"id": str(uuid.uuid4()), "name": f"tag-{n}"} for n in range(4)],
+        **derive_post_content(content)
+    }
+    return orjson.dumps(post)
+
+
+def course_outline_body(modules: int, lessons: int) -> bytes:
+    outline = {"id": str(uuid.uuid4()), "title": "Benchmark course", "modules": []}
+    for m in range(modules):
+        module = {"id": str(uuid.uuid4()), "title": f"Module {m}", "order_index": m, "lessons": []}
+        for n in range(lessons):
+            module["lessons"].append({
+                "id": str(uuid.uuid4()), "title": f"Lesson {m}.{n}", "order_index": n,
+                "description": " ".join(WORDS[(m + n + k) % len(WORDS)] for k in range(40)),
+                "instructor": "Instructor", "zoomLink": "https://zoom.example.com/j/123456789",
+                "quizLink": None, "duration": 45, "created_at": NOW, "updated_at": NOW,
+                "attachments": [
+                    {"id": str(uuid.uuid4()), "name": f"slides-{m}-{n}-{a}.pdf",
+                     "url": f"/uploads/attachments/{uuid.uuid4()}.pdf", "file_type": "application/pdf",
+                     "file_size": 123456}
+                    for a in range(2)
+                ]
+            })
+        outline["modules"].append(module)
+    return orjson.dumps(outline)
+
+
+def timed(run, repeat: int) -> float:
+    run()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def report(label: str, body: bytes, repeat: int) -> None:
+    print(f"{label}: {len(body) / 1024:.1f} KiB uncompressed (median of {repeat})")
+    print(f"  {'codec':<12} {'size KiB':>9} {'ratio':>7} {'ms':>8} {'MB/s':>8}")
+
+    codecs = [(f"gzip-{level}", lambda level=level: zlib.compress(body, level)) for level in (1, 4, 6, 9)]
+    if brotli is not None:
+        codecs += [(f"br-{quality}", lambda quality=quality: brotli.compress(body, quality=quality))
+                   for quality in (1, 4, 6, 9, 11)]
+
+    for name, run in codecs:
+        size = len(run())
+        ms = timed(run, repeat)
+        print(f"  {name:<12} {size / 1024:9.1f} {len(body) / size:7.1f} {ms:8.2f} {len(body) / ms / 1000:8.1f}")
+
+    middleware = CompressionMiddleware(app=None, cache=TTLCache(ttl_seconds=60))
+    encoding = middleware.encodings[0]
+    middleware.compress(encoding, body)
+    ms = timed(lambda: middleware.compress(encoding, body), repeat)
+    print(f"  {'cache hit':<12} {'':>9} {'':>7} {ms:8.3f}   ({encoding}, digest + lookup)\n")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=2000)
+    parser.add_argument("--modules", type=int, default=12)
+    parser.add_argument("--lessons", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    report("blog detail", blog_detail_body(args.words), args.repeat)
+    report("course outline", course_outline_body(args.modules, args.lessons), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
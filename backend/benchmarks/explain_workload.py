@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""Replay the load-test workload in-process and EXPLAIN every query shape.
+
+The scenarios from benchmarks/load_test.py run against the ASGI app
+directly (no server needed) while every SQL statement is captured and
+grouped by shape with app.core.sql_profiler.normalize_statement. Each
+shape is then re-run once with its captured parameters under
+
+    EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)
+
+inside a transaction that is rolled back, so writes leave no trace. The
+report lists shapes by total cost and flags sequential scans, which is
+how index coverage is checked rather than guessed:
+
+    python benchmarks/explain_workload.py --duration 10
+    python benchmarks/explain_workload.py --json plans.json --strict
+
+Sequential scans over tables with fewer than --min-table-rows estimated
+rows are reported but not flagged; the planner rightly prefers them there.
+--strict exits with status 1 when any flagged scan remains.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Replay must not be throttled or shed
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("LOAD_SHEDDING_ENABLED", "false")
+
+import httpx  # noqa: E402
+from sqlalchemy import event, text  # noqa: E402
+
+from app.core.database import engine  # noqa: E402
+from app.core.sql_profiler import normalize_statement  # noqa: E402
+from app.main import app  # noqa: E402
+from load_test import Recorder, VirtualUser, discover_catalog, parse_mix  # noqa: E402
+
+
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+class ShapeCapture:
+    """First sample and call count of every statement shape"""
+
+    def __init__(self):
+        self.shapes: Dict[str, dict] = {}
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if executemany or not statement.lstrip().upper().startswith(EXPLAINABLE):
+            return
+        shape = normalize_statement(statement)
+        entry = self.shapes.get(shape)
+        if entry is None:
+            self.shapes[shape] = {"statement": statement, "parameters": parameters, "calls": 1}
+        else:
+            entry["calls"] += 1
+
+
+async def replay(args: argparse.Namespace) -> None:
+    # Server errors are reported as 500s, as they would be over HTTP
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost/api/v1", timeout=60) as client:
+        catalog = await discover_catalog(client, args.discovery_pages)
+        recorder = Recorder()
+        users = []
+        for worker in range(args.concurrency):
+            rng = random.Random(f"{args.seed}:{worker}")
+            user = VirtualUser(client, recorder, catalog, rng)
+            index = rng.randint(args.first_user, args.last_user)
+            if not await user.login(args.email_pattern.format(index), args.password):
+                raise SystemExit(f"Login failed for {args.email_pattern.format(index)}")
+            users.append(user)
+
+        deadline = time.perf_counter() + args.duration
+        await asyncio.gather(*(user.run(args.mix, deadline) for user in users))
+
+
+def walk(node: dict, found: List[dict]) -> None:
+    if node.get("Node Type") == "Seq Scan":
+        loops = node.get("Actual Loops", 1)
+        found.append({
+            "relation": node.get("Relation Name"),
+            "rows_scanned": int((node.get("Actual Rows", 0) + node.get("Rows Removed by Filter", 0)) * loops),
+            "filter": node.get("Filter")
+        })
+    for child in node.get("Plans", []):
+        walk(child, found)
+
+
+def explain(shapes: Dict[str, dict], table_rows: Dict[str, float], min_table_rows: int) -> List[dict]:
+    results = []
+    with engine.connect() as conn:
+        for shape, entry in shapes.items():
+            transaction = conn.begin()
+            try:
+                plan_json = conn.exec_driver_sql(
+                    "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + entry["statement"],
+                    entry["parameters"]
+                ).scalar()
+            except Exception as e:
+                results.append({"shape": shape, "calls": entry["calls"], "error": str(e).splitlines()[0]})
+                continue
+            finally:
+                transaction.rollback()
+
+            plan = plan_json[0] if isinstance(plan_json, list) else json.loads(plan_json)[0]
+            root = plan["Plan"]
+            seq_scans: List[dict] = []
+            walk(root, seq_scans)
+            for scan in seq_scans:
+                scan["flagged"] = table_rows.get(scan["relation"], 0) >= min_table_rows
+
+            results.append({
+                "shape": shape,
+                "calls": entry["calls"],
+                "execution_ms": round(plan["Execution Time"], 3),
+                "total_ms": round(plan["Execution Time"] * entry["calls"], 3),
+                "shared_hit": root.get("Shared Hit Blocks", 0),
+                "shared_read": root.get("Shared Read Blocks", 0),
+                "seq_scans": seq_scans
+            })
+    results.sort(key=lambda row: row.get("total_ms", 0), reverse=True)
+    return results
+
+
+def estimated_table_rows() -> Dict[str, float]:
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT relname, reltuples FROM pg_class "
+            "WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace"
+        )).all()
+    return {name: max(float(count), 0.0) for name, count in rows}
+
+
+def print_report(results: List[dict], width: int) -> int:
+    flagged = 0
+    print(f"{'calls':>6} {'ms/call':>9} {'total ms':>10} {'hit':>7} {'read':>6}  shape")
+    for row in results:
+        if "error" in row:
+            print(f"{row['calls']:>6} {'error':>9} {'':>10} {'':>7} {'':>6}  {row['shape'][:width]}")
+            print(f"{'':>43}! {row['error']}")
+            continue
+        print(
+            f"{row['calls']:>6} {row['execution_ms']:>9.3f} {row['total_ms']:>10.2f} "
+            f"{row['shared_hit']:>7} {row['shared_read']:>6}  {row['shape'][:width]}"
+        )
+        for scan in row["seq_scans"]:
+            marker = "SEQ SCAN" if scan["flagged"] else "seq scan (small table)"
+            flagged += scan["flagged"]
+            detail = f" filter {scan['filter']}" if scan["filter"] else ""
+            print(f"{'':>43}{marker} on {scan['relation']}: {scan['rows_scanned']} rows{detail}"[:width + 43])
+    print(f"\n{len(results)} shapes, {flagged} flagged sequential scans")
+    return flagged
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of workload to capture")
+    parser.add_argument("--concurrency", type=int, default=4, help="virtual users")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("catalog=40,lesson=20,blog=30,search=10"))
+    parser.add_argument("--email-pattern", default="user{}@loadtest.example.com")
+    parser.add_argument("--password", default="loadtest123")
+    parser.add_argument("--first-user", type=int, default=100)
+    parser.add_argument("--last-user", type=int, default=1099)
+    parser.add_argument("--discovery-pages", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--min-table-rows", type=int, default=1000,
+                        help="only flag sequential scans on tables at least this large")
+    parser.add_argument("--width", type=int, default=140, help="truncate shapes to this many characters")
+    parser.add_argument("--json", help="write shapes, plans summaries and scans to this file")
+    parser.add_argument("--strict", action="store_true", help="exit 1 if any flagged sequential scan remains")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> Optional[int]:
+    args = parse_args(argv)
+
+    capture = ShapeCapture()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        asyncio.run(replay(args))
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    results = explain(capture.shapes, estimated_table_rows(), args.min_table_rows)
+    flagged = print_report(results, args.width)
+
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump({"min_table_rows": args.min_table_rows, "shapes": results}, handle, indent=2)
+
+    return 1 if args.strict and flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Compare Google ID token verification with and without the certificate cache.
+
+Runs a local stand-in for Google's key server (x509 certificates keyed by
+kid, served with Cache-Control max-age), mints RS256 tokens signed by its
+key, and times:
+
+    per-call fetch   id_token.verify_token with a new transport per call (old behaviour)
+    cached verifier  app.core.google_verifier.GoogleTokenVerifier
+
+It then rotates the key and checks the verifier picks up the new kid with a
+single refetch. No network access or Google credentials are needed.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cryptography import x509  # noqa: E402
+from cryptography.hazmat.primitives import hashes, serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import rsa  # noqa: E402
+from cryptography.x509.oid import NameOID  # noqa: E402
+from google.auth import crypt, jwt  # noqa: E402
+from google.auth.transport import requests as google_requests  # noqa: E402
+from google.oauth2 import id_token  # noqa: E402
+
+from app.core.google_verifier import GoogleTokenVerifier  # noqa: E402
+
+
+CLIENT_ID = "stand-in-client.apps.googleusercontent.com"
+
+
+class KeyServer:
+    """Serves {kid: PEM certificate} like https://www.googleapis.com/oauth2/v1/certs"""
+
+    def __init__(self, max_age: int):
+        self.max_age = max_age
+        self.keys = {}
+        self.fetches = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.fetches += 1
+                body = json.dumps({kid: cert for kid, (_, cert) in server.keys.items()}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Cache-Control", f"public, max-age={server.max_age}, must-revalidate")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/oauth2/v1/certs"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def add_key(self, kid: str) -> None:
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "stand-in")])
+        now = datetime.datetime.now(datetime.timezone.utc)
+        cert = (
+            x509.CertificateBuilder()
+            .subject_name(name).issuer_name(name)
+            .public_key(key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - datetime.timedelta(days=1))
+            .not_valid_after(now + datetime.timedelta(days=1))
+            .sign(key, hashes.SHA256())
+        )
+        pem_key = key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        ).decode()
+        self.keys[kid] = (pem_key, cert.public_bytes(serialization.Encoding.PEM).decode())
+
+    def mint(self, kid: str, email: str = "learner@example.com") -> str:
+        signer = crypt.RSASigner.from_string(self.keys[kid][0], key_id=kid)
+        now = int(time.time())
+        payload = {
+            "iss": "https://accounts.google.com",
+            "aud": CLIENT_ID,
+            "sub": "1234567890",
+            "email": email,
+            "iat": now,
+            "exp": now + 3600
+        }
+        return jwt.encode(signer, payload).decode()
+
+    def close(self) -> None:
+        self.httpd.shutdown()
+
+
+def time_calls(label: str, verify, token: str, iterations: int) -> None:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        verify(token)
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    print(
+        f"{label:<18} p50={statistics.median(samples):7.3f}ms "
+        f"p95={samples[int(len(samples) * 0.95) - 1]:7.3f}ms max={samples[-1]:7.3f}ms"
+    )
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--max-age", type=int, default=3600)
+    args = parser.parse_args(argv)
+
+    server = KeyServer(args.max_age)
+    server.add_key("key-1")
+    token = server.mint("key-1")
+
+    fetches = server.fetches
+    time_calls(
+        "per-call fetch",
+        lambda t: id_token.verify_token(t, google_requests.Request(), audience=CLIENT_ID, certs_url=server.url),
+        token,
+        args.iterations
+    )
+    print(f"{'':<18} certificate fetches: {server.fetches - fetches}")
+
+    verifier = GoogleTokenVerifier(server.url, CLIENT_ID, min_refetch_interval_seconds=0)
+    fetches = server.fetches
+    time_calls("cached verifier", verifier.verify, token, args.iterations)
+    print(f"{'':<18} certificate fetches: {server.fetches - fetches}")
+
+    # Google rotates keys ahead of max-age; an unseen kid forces one refetch
+    server.add_key("key-2")
+    fetches = server.fetches
+    claims = verifier.verify(server.mint("key-2", email="rotated@example.com"))
+    verifier.verify(server.mint("key-2"))
+    print(f"key rotation       verified {claims['email']} with {server.fetches - fetches} refetch")
+
+    verifier.close()
+    server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Measure how quickly lesson updates reach learners following a course.
+
+Starts the app under uvicorn on a local port, opens --streams server-sent
+event streams to GET /courses/{id}/events as users enrolled in the course
+with the most enrollments (reusing users when there are fewer), then has
+the course instructor PUT a lesson change --updates times. Each update
+carries a unique notification text, and every stream records when it
+arrives. The report shows connect time, how many streams received each
+update, and the delivery latency from sending the PUT:
+
+    python benchmarks/live_updates.py --streams 2000 --updates 5
+
+Clients and server share the machine, so latencies include client-side
+parsing of every stream. Exits with status 1 if any update was missed.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+import uuid
+from typing import Dict, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Thousands of streams connect at once from one address
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("LOAD_SHEDDING_ENABLED", "false")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--streams", type=int, default=1000)
+    parser.add_argument("--updates", type=int, default=5)
+    parser.add_argument("--interval", type=float, default=0.5, help="seconds between updates")
+    parser.add_argument("--port", type=int, default=8765)
+    return parser.parse_args(argv)
+
+
+def start_server(port: int):
+    import uvicorn
+
+    from app.main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, port=port, log_level="warning", timeout_graceful_shutdown=1))
+    # Runs in a thread, which cannot install signal handlers
+    server.install_signal_handlers = lambda: None
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+async def main_async(args: argparse.Namespace) -> int:
+    import httpx
+    from sqlalchemy import text
+
+    from app.core.database import engine
+    from app.core.security import create_access_token
+
+    with engine.connect() as conn:
+        course = conn.execute(text("""
+            SELECT c.id, c.instructor_id, u.token_version
+            FROM courses c
+            JOIN users u ON u.id = c.instructor_id
+            JOIN user_enrollments e ON e.course_id = c.id
+            WHERE EXISTS (SELECT 1 FROM modules m JOIN lessons l ON l.module_id = m.id WHERE m.course_id = c.id)
+            GROUP BY c.id, c.instructor_id, u.token_version
+            ORDER BY count(*) DESC
+            LIMIT 1
+        """)).first()
+        if course is None:
+            print("No course with enrollments and lessons; seed the database first")
+            return 1
+        learners = conn.execute(text("""
+            SELECT u.id, u.token_version FROM user_enrollments e JOIN users u ON u.id = e.user_id
+            WHERE e.course_id = :course_id AND u.is_active
+        """), {"course_id": course.id}).all()
+        lesson_id = conn.execute(text("""
+            SELECT l.id FROM lessons l JOIN modules m ON m.id = l.module_id WHERE m.course_id = :course_id LIMIT 1
+        """), {"course_id": course.id}).scalar()
+
+    tokens = [create_access_token(user_id, version=version) for user_id, version in learners]
+    instructor = {"Authorization": f"Bearer {create_access_token(course.instructor_id, version=course.token_version)}"}
+    print(f"course {course.id}: {len(learners)} enrolled, {args.streams} streams")
+
+    server, thread = start_server(args.port)
+    base_url = f"http://127.0.0.1:{args.port}/api/v1"
+    received: Dict[str, List[float]] = {}
+    connected = 0
+    all_connected = asyncio.Event()
+
+    async def follow(client: httpx.AsyncClient, token: str) -> None:
+        nonlocal connected
+        async with client.stream(
+            "GET", f"/courses/{course.id}/events", params={"access_token": token},
+            headers={"Accept": "text/event-stream"}
+        ) as response:
+            response.raise_for_status()
+            connected += 1
+            if connected == args.streams:
+                all_connected.set()
+            async for line in response.aiter_lines():
+                if line.startswith("data: ") and '"bench-' in line:
+                    marker = line[line.index('"bench-') + 1:].split('"', 1)[0]
+                    received.setdefault(marker, []).append(time.perf_counter())
+
+    limits = httpx.Limits(max_connections=args.streams + 10, max_keepalive_connections=args.streams + 10)
+    timeout = httpx.Timeout(30.0, read=None)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+        started = time.perf_counter()
+        followers = [asyncio.create_task(follow(client, tokens[i % len(tokens)])) for i in range(args.streams)]
+        await asyncio.wait_for(all_connected.wait(), 120)
+        connect_time = time.perf_counter() - started
+
+        sent = {}
+        for _ in range(args.updates):
+            marker = f"bench-{uuid.uuid4().hex[:12]}"
+            sent[marker] = time.perf_counter()
+            response = await client.put(f"/lessons/{lesson_id}", json={"notification": marker}, headers=instructor)
+            response.raise_for_status()
+            await asyncio.sleep(args.interval)
+        await asyncio.sleep(1)
+
+        for task in followers:
+            task.cancel()
+        await asyncio.gather(*followers, return_exceptions=True)
+
+    server.should_exit = True
+    thread.join(5)
+
+    print(f"connect    {args.streams:,} streams in {connect_time:.2f}s")
+    ok = True
+    for marker, sent_at in sent.items():
+        latencies = sorted(arrival - sent_at for arrival in received.get(marker, []))
+        ok = ok and len(latencies) == args.streams
+        if not latencies:
+            print(f"update     {marker}  delivered 0/{args.streams:,}")
+            continue
+        print(
+            f"update     {marker}  delivered {len(latencies):,}/{args.streams:,}  "
+            f"p50 {statistics.median(latencies) * 1000:7.1f} ms  "
+            f"p99 {latencies[max(0, int(len(latencies) * 0.99) - 1)] * 1000:7.1f} ms  "
+            f"max {latencies[-1] * 1000:7.1f} ms"
+        )
+    return 0 if ok else 1
+
+
+def main(argv=None) -> int:
+    return asyncio.run(main_async(parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
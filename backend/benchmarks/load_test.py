@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""Scripted load test reporting throughput and latency percentiles per endpoint.
+
+Virtual users log in as accounts created by benchmarks/seed_dataset.py and
+loop over weighted scenarios:
+
+    catalog  browse the course list, a course, its modules and lessons
+    lesson   enroll, open a module and complete a lesson, read progress
+    blog     list posts, read one by slug, view popular posts
+    search   full-text style searches over courses and blog posts
+
+Results can be saved with --json and compared against a previous run with
+--compare to spot regressions between releases:
+
+    python benchmarks/load_test.py --duration 60 --concurrency 50 --json v1.json
+    python benchmarks/load_test.py --duration 60 --concurrency 50 --compare v1.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence
+
+import httpx
+
+
+SEARCH_TERMS = ("python", "data", "cache", "design", "async", "query", "model", "test")
+
+
+class Recorder:
+    """Latency samples and error counts per endpoint label"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.recording = False
+
+    def add(self, endpoint: str, elapsed: float, ok: bool) -> None:
+        if not self.recording:
+            return
+        self.samples[endpoint].append(elapsed)
+        if not ok:
+            self.errors[endpoint] += 1
+
+    def report(self, duration: float) -> Dict[str, dict]:
+        results = {}
+        for endpoint, samples in sorted(self.samples.items()):
+            results[endpoint] = summarize(samples, self.errors[endpoint], duration)
+        everything = [value for samples in self.samples.values() for value in samples]
+        if everything:
+            results["TOTAL"] = summarize(everything, sum(self.errors.values()), duration)
+        return results
+
+
+def percentile(ordered: Sequence[float], fraction: float) -> float:
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(samples: List[float], errors: int, duration: float) -> dict:
+    ordered = sorted(samples)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "rps": round(len(ordered) / duration, 2),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 2),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+        "p90_ms": round(percentile(ordered, 0.90) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2)
+    }
+
+
+class VirtualUser:
+    """One logged-in client running weighted scenarios until the deadline"""
+
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, catalog: dict, rng: random.Random):
+        self.client = client
+        self.recorder = recorder
+        self.catalog = catalog
+        self.rng = rng
+        self.headers: Dict[str, str] = {}
+
+    async def request(
+        self,
+        endpoint: str,
+        method: str,
+        url: str,
+        expected: Sequence[int] = (200,),
+        **kwargs
+    ) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=self.headers, **kwargs)
+        except httpx.HTTPError:
+            self.recorder.add(endpoint, time.perf_counter() - started, False)
+            return None
+        self.recorder.add(endpoint, time.perf_counter() - started, response.status_code in expected)
+        return response
+
+    async def login(self, email: str, password: str) -> bool:
+        response = await self.request(
+            "POST /auth/login", "POST", "/auth/login",
+            data={"username": email, "password": password}
+        )
+        if response is None or response.status_code != 200:
+            return False
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return True
+
+    def _course(self) -> str:
+        return self.rng.choice(self.catalog["courses"])
+
+    async def _lessons(self, course_id: str) -> List[str]:
+        response = await self.request(
+            "GET /courses/{course_id}/modules", "GET", f"/courses/{course_id}/modules"
+        )
+        if response is None or response.status_code != 200 or not response.json():
+            return []
+        module_id = self.rng.choice(response.json())["id"]
+        response = await self.request(
+            "GET /modules/{module_id}/lessons", "GET", f"/modules/{module_id}/lessons"
+        )
+        if response is None or response.status_code != 200:
+            return []
+        return [lesson["id"] for lesson in response.json()]
+
+    async def catalog_scenario(self) -> None:
+        skip = self.rng.randrange(0, 200, 20)
+        await self.request("GET /courses/", "GET", "/courses/", params={"skip": skip, "limit": 20})
+        course_id = self._course()
+        await self.request("GET /courses/{course_id}", "GET", f"/courses/{course_id}")
+        await self._lessons(course_id)
+
+    async def lesson_scenario(self) -> None:
+        course_id = self._course()
+        # Re-enrolling is rejected with 400, which is expected for repeat visits
+        await self.request(
+            "POST /courses/{course_id}/enroll", "POST", f"/courses/{course_id}/enroll",
+            expected=(200, 201, 400)
+        )
+        lessons = await self._lessons(course_id)
+        if lessons:
+            lesson_id = self.rng.choice(lessons)
+            await self.request("POST /lessons/{lesson_id}/complete", "POST", f"/lessons/{lesson_id}/complete")
+        await self.request("GET /courses/{course_id}/progress", "GET", f"/courses/{course_id}/progress")
+
+    async def blog_scenario(self) -> None:
+        skip = self.rng.randrange(0, 200, 20)
+        await self.request("GET /blogs/", "GET", "/blogs/", params={"skip": skip, "limit": 20})
+        if self.catalog["posts"]:
+            slug = self.rng.choice(self.catalog["posts"])
+            await self.request("GET /blogs/slug/{slug}", "GET", f"/blogs/slug/{slug}")
+        await self.request("GET /blogs/popular", "GET", "/blogs/popular")
+
+    async def search_scenario(self) -> None:
+        term = self.rng.choice(SEARCH_TERMS)
+        await self.request("GET /courses/?search", "GET", "/courses/", params={"search": term})
+        await self.request("GET /blogs/?search", "GET", "/blogs/", params={"search": term})
+
+    async def run(self, mix: Dict[str, int], deadline: float) -> None:
+        scenarios = [getattr(self, f"{name}_scenario") for name in mix]
+        weights = list(mix.values())
+        while time.perf_counter() < deadline:
+            await self.rng.choices(scenarios, weights)[0]()
+
+
+async def discover_catalog(client: httpx.AsyncClient, pages: int) -> dict:
+    """Collect course ids and post slugs to drive scenarios"""
+    courses: List[str] = []
+    posts: List[str] = []
+    for page in range(pages):
+        response = await client.get("/courses/", params={"skip": page * 100, "limit": 100})
+        response.raise_for_status()
+        courses.extend(course["id"] for course in response.json())
+
+        response = await client.get("/blogs/", params={"skip": page * 100, "limit": 100})
+        response.raise_for_status()
+        posts.extend(post["slug"] for post in response.json())
+    if not courses:
+        raise SystemExit("No published courses found; seed the database first")
+    return {"courses": courses, "posts": posts}
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ("catalog", "lesson", "blog", "search"):
+            raise argparse.ArgumentTypeError(f"unknown scenario: {name}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+async def run_load_test(args: argparse.Namespace) -> Dict[str, dict]:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        catalog = await discover_catalog(client, args.discovery_pages)
+        recorder = Recorder()
+
+        users = []
+        for worker in range(args.concurrency):
+            rng = random.Random(f"{args.seed}:{worker}")
+            user = VirtualUser(client, recorder, catalog, rng)
+            index = rng.randint(args.first_user, args.last_user)
+            if not await user.login(args.email_pattern.format(index), args.password):
+                raise SystemExit(f"Login failed for {args.email_pattern.format(index)}")
+            users.append(user)
+
+        # Warm-up traffic is not recorded
+        warmup_deadline = time.perf_counter() + args.warmup
+        await asyncio.gather(*(user.run(args.mix, warmup_deadline) for user in users))
+
+        recorder.recording = True
+        started = time.perf_counter()
+        await asyncio.gather(*(user.run(args.mix, started + args.duration) for user in users))
+        return recorder.report(time.perf_counter() - started)
+
+
+def print_report(results: Dict[str, dict], baseline: Optional[Dict[str, dict]]) -> None:
+    header = f"{'endpoint':<40} {'reqs':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8} {'max':>9}"
+    if baseline:
+        header += f" {'Δrps':>8} {'Δp95':>8}"
+    print(header)
+    print("-" * len(header))
+    for endpoint, row in results.items():
+        line = (
+            f"{endpoint:<40} {row['requests']:>7} {row['errors']:>5} {row['rps']:>8.1f} "
+            f"{row['p50_ms']:>8.1f} {row['p90_ms']:>8.1f} {row['p95_ms']:>8.1f} "
+            f"{row['p99_ms']:>8.1f} {row['max_ms']:>9.1f}"
+        )
+        previous = (baseline or {}).get(endpoint)
+        if previous:
+            line += f" {change(previous['rps'], row['rps']):>8} {change(previous['p95_ms'], row['p95_ms']):>8}"
+        print(line)
+
+
+def change(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000/api/v1")
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="unmeasured seconds before the run")
+    parser.add_argument("--concurrency", type=int, default=20, help="virtual users")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("catalog=40,lesson=20,blog=30,search=10"))
+    parser.add_argument("--email-pattern", default="user{}@loadtest.example.com")
+    parser.add_argument("--password", default="loadtest123")
+    parser.add_argument("--first-user", type=int, default=100, help="lowest seeded user index to log in as")
+    parser.add_argument("--last-user", type=int, default=1099, help="highest seeded user index to log in as")
+    parser.add_argument("--discovery-pages", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="baseline results file from a previous --json run")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    results = asyncio.run(run_load_test(args))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as handle:
+            baseline = json.load(handle)["results"]
+    print_report(results, baseline)
+
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump({
+                "config": {
+                    "base_url": args.base_url,
+                    "duration": args.duration,
+                    "concurrency": args.concurrency,
+                    "mix": args.mix
+                },
+                "results": results
+            }, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Measure per-request overhead of the request timing/logging middleware.
+
+Compares the previous pair of @app.middleware("http") functions
+(BaseHTTPMiddleware, time.time(), f-string logging on the event loop)
+with AccessLogMiddleware. Requests are driven straight through the ASGI
+interface so no network or server time is included.
+
+Usage: python benchmarks/middleware_overhead.py [requests]
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import time
+from time import perf_counter_ns
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI, Request
+
+from app.core.access_log import AccessLogMiddleware, start_access_log_listener, stop_access_log_listener
+
+
+def build_bare_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+def build_legacy_app() -> FastAPI:
+    app = build_bare_app()
+    logger = logging.getLogger("benchmark.legacy")
+
+    @app.middleware("http")
+    async def add_process_time_header(request: Request, call_next):
+        start_time = time.time()
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        response.headers["X-Process-Time"] = str(process_time)
+        return response
+
+    @app.middleware("http")
+    async def log_requests(request: Request, call_next):
+        start_time = time.time()
+        logger.info(
+            f"Request: {request.method} {request.url.path} - "
+            f"Client: {request.client.host if request.client else 'unknown'}"
+        )
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        logger.info(
+            f"Response: {response.status_code} - "
+            f"Time: {process_time:.4f}s - "
+            f"Path: {request.url.path}"
+        )
+        return response
+
+    return app
+
+
+def build_asgi_app(sample_rate: float) -> FastAPI:
+    app = build_bare_app()
+    app.add_middleware(AccessLogMiddleware, sample_rate=sample_rate, slow_request_ms=1000)
+    return app
+
+
+async def drive(app, requests: int) -> float:
+    """Send requests through the ASGI app and return mean microseconds per request"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 12345),
+        "server": ("127.0.0.1", 8000),
+    }
+
+    async def send(message):
+        pass
+
+    async def one_request():
+        messages = iter([{"type": "http.request", "body": b"", "more_body": False}])
+
+        async def receive():
+            try:
+                return next(messages)
+            except StopIteration:
+                # Behave like a client that stays connected until cancelled
+                await asyncio.sleep(3600)
+                return {"type": "http.disconnect"}
+
+        await app(dict(scope), receive, send)
+
+    # Warm up routing and middleware stack
+    for _ in range(200):
+        await one_request()
+
+    start = perf_counter_ns()
+    for _ in range(requests):
+        await one_request()
+    return (perf_counter_ns() - start) / requests / 1000
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    # Both variants write to the same sink so formatting and I/O cost is comparable
+    sink = open(os.devnull, "w")
+    logging.basicConfig(level=logging.INFO, stream=sink)
+    start_access_log_listener(stream=sink)
+
+    results = {
+        "no middleware": asyncio.run(drive(build_bare_app(), requests)),
+        "legacy @app.middleware x2": asyncio.run(drive(build_legacy_app(), requests)),
+        "AccessLogMiddleware (sample 1.0)": asyncio.run(drive(build_asgi_app(1.0), requests)),
+        "AccessLogMiddleware (sample 0.01)": asyncio.run(drive(build_asgi_app(0.01), requests)),
+    }
+    stop_access_log_listener()
+
+    baseline = results["no middleware"]
+    print(f"{'variant':<36}{'us/request':>12}{'overhead us':>14}")
+    for name, micros in results.items():
+        print(f"{name:<36}{micros:>12.1f}{micros - baseline:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
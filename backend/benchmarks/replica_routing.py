@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Check read-replica routing, read-your-writes stickiness and lag fallback.
+
+Runs a few requests against the ASGI app in-process and counts the
+statements each engine executed:
+
+    anonymous catalog read          replica
+    same read right after a write   primary (the user is sticky)
+    once the sticky window ends     replica
+    replica lagging too far         primary
+
+With two local Postgres instances pass the standby with --replica-url.
+Without it the primary is opened a second time as the "replica", which is
+enough to see the routing. Lag is simulated in either case by swapping the
+replica set's lag probe:
+
+    python benchmarks/replica_routing.py
+    python benchmarks/replica_routing.py --replica-url postgresql://.../lms_db
+
+Exits with status 1 if any step was routed to the wrong engine.
+"""
+
+import argparse
+import os
+import sys
+from typing import Dict
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--replica-url", help="standby to read from; defaults to DATABASE_URL again")
+    parser.add_argument("--email", default="user100@loadtest.example.com")
+    parser.add_argument("--password", default="loadtest123")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    # Must be set before app.core.database builds the engines
+    from app.core.config import settings
+    settings.DATABASE_REPLICA_URLS = [args.replica_url or settings.DATABASE_URL]
+    settings.RATE_LIMIT_ENABLED = False
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event, text
+
+    from app.core.database import engine, replica_engines
+    from app.core.replicas import get_replica_set, recent_writers
+    from app.main import app
+
+    counts: Dict[str, int] = {"primary": 0, "replica": 0}
+
+    def counter(name):
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            # The lag monitor's own probe is not a routed read
+            if "pg_is_in_recovery" not in statement:
+                counts[name] += 1
+        return _count
+
+    event.listen(engine, "before_cursor_execute", counter("primary"))
+    for replica in replica_engines:
+        event.listen(replica, "before_cursor_execute", counter("replica"))
+
+    failures = 0
+
+    def step(label: str, expected: str, request) -> None:
+        nonlocal failures
+        counts.update(primary=0, replica=0)
+        response = request()
+        routed = "replica" if counts["replica"] else "primary"
+        ok = routed == expected and response.status_code < 400
+        failures += not ok
+        print(
+            f"{'ok' if ok else 'FAIL':>4}  {label:<34} status={response.status_code} "
+            f"primary={counts['primary']:<3} replica={counts['replica']:<3} expected {expected}"
+        )
+
+    with TestClient(app, base_url="http://localhost") as client:
+        replica_set = get_replica_set()
+        if replica_set is None:
+            print("No replica configured")
+            return 1
+
+        login = client.post("/api/v1/auth/login", data={"username": args.email, "password": args.password})
+        if login.status_code != 200:
+            print(f"Login failed for {args.email}: {login.status_code}")
+            return 1
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        with engine.connect() as conn:
+            course_id = conn.execute(text(
+                "SELECT id FROM courses WHERE is_published AND id NOT IN "
+                "(SELECT course_id FROM user_enrollments e JOIN users u ON u.id = e.user_id WHERE u.email = :email) "
+                "LIMIT 1"
+            ), {"email": args.email}).scalar()
+
+        step("anonymous course list", "replica", lambda: client.get("/api/v1/courses/"))
+        step("enroll (write)", "primary", lambda: client.post(f"/api/v1/courses/{course_id}/enroll", headers=headers))
+        step("course list after own write", "primary", lambda: client.get("/api/v1/courses/", headers=headers))
+        recent_writers.clear()
+        step("course list after sticky window", "replica", lambda: client.get("/api/v1/courses/", headers=headers))
+
+        probe = replica_set.lag_probe
+        replica_set.lag_probe = lambda _engine: replica_set.max_lag_seconds + 60
+        replica_set.check()
+        step("course list while replica lags", "primary", lambda: client.get("/api/v1/courses/"))
+        replica_set.lag_probe = probe
+        replica_set.check()
+        step("course list after catching up", "replica", lambda: client.get("/api/v1/courses/"))
+
+        client.delete(f"/api/v1/courses/{course_id}/enroll", headers=headers)
+
+    print(f"\n{failures} misrouted step(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""Generate a large synthetic dataset with COPY-based bulk loading.
+
+Rows are produced by deterministic generators and streamed straight into
+``COPY ... FROM STDIN`` so memory stays flat regardless of scale. Primary
+keys are derived from (table, row index) so child tables can reference
+parents without keeping them in memory, and the same --seed always yields
+the same dataset.
+
+The schema must already exist (run Alembic, or pass --create-schema).
+
+Example (capacity-planning scale):
+
+    python benchmarks/seed_dataset.py --truncate \\
+        --users 1000000 --courses 50000 --enrollments 5000000 \\
+        --progress-rows 50000000 --blog-posts 500000
+
+Every generated account uses the password given by --password so the
+load-test suite (benchmarks/load_test.py) can log in as user<N>@loadtest.example.com.
+"""
+
+import argparse
+import csv
+import io
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterable, Iterator, Sequence
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.bitmap import pack_ordinals  # noqa: E402
+from app.core.database import engine, Base  # noqa: E402
+from app.core.security import get_password_hash  # noqa: E402
+import app.models  # noqa: E402,F401  (register all tables on Base.metadata)
+
+
+WORDS = (
+    "learn course lesson module python data model query index database cache "
+    "request response server client design pattern system scale latency "
+    "throughput memory thread async event stream vector matrix network api "
+    "service deploy monitor metric test debug profile optimize refactor build "
+    "review student teacher project practice example exercise quiz video note"
+).split()
+
+DIFFICULTIES = ("beginner", "intermediate", "advanced")
+TAG_COLORS = ("#3B82F6", "#10B981", "#F59E0B", "#EF4444", "#8B5CF6", "#EC4899")
+
+# Tables in dependency order; truncated together when --truncate is set
+TABLES = (
+    "users", "courses", "modules", "lessons", "user_enrollments", "user_progress",
+    "blog_categories", "blog_tags", "blog_posts", "blog_post_tags"
+)
+
+
+class CopyStream(io.TextIOBase):
+    """File-like view over a row generator, rendered as CSV for COPY FROM STDIN"""
+
+    def __init__(self, rows: Iterable[Sequence], on_row: Callable[[], None] = lambda: None):
+        self._rows = iter(rows)
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+        self._pending = ""
+        self._on_row = on_row
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> str:
+        size = size if size and size > 0 else 1 << 16
+        while len(self._pending) < size:
+            chunk = self._fill(size)
+            if not chunk:
+                break
+            self._pending += chunk
+
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+    def _fill(self, size: int) -> str:
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        for row in self._rows:
+            self._writer.writerow(["\\N" if value is None else value for value in row])
+            self._on_row()
+            if self._buffer.tell() >= size:
+                break
+        return self._buffer.getvalue()
+
+
+class DatasetIds:
+    """Deterministic primary keys: one random 64-bit namespace per table plus the row index"""
+
+    def __init__(self, seed: int):
+        rng = random.Random(seed)
+        # Canonical text of the high 64 bits, so per-row work is one hex format
+        self._prefixes = {}
+        for table in TABLES:
+            high = f"{rng.getrandbits(64):016x}"
+            self._prefixes[table] = f"{high[:8]}-{high[8:12]}-{high[12:]}-"
+
+    def __call__(self, table: str, index: int) -> str:
+        low = f"{index:016x}"
+        return f"{self._prefixes[table]}{low[:4]}-{low[4:]}"
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def paragraphs(rng: random.Random, words: int) -> str:
+    chunks = []
+    while words > 0:
+        size = min(words, rng.randint(40, 120))
+        chunks.append(sentence(rng, size) + ".")
+        words -= size
+    return "\n\n".join(chunks)
+
+
+def iso(value: datetime) -> str:
+    return value.isoformat()
+
+
+class DatasetGenerator:
+    """Row generators for every seeded table"""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.ids = DatasetIds(args.seed)
+        self.now = datetime.now(timezone.utc).replace(microsecond=0)
+        self.instructors = max(1, int(args.users * args.instructor_fraction))
+        self.lessons_per_course = args.modules_per_course * args.lessons_per_module
+        self.password_hash = get_password_hash(args.password)
+
+    def _rng(self, stream: str) -> random.Random:
+        return random.Random(f"{self.args.seed}:{stream}")
+
+    def _past(self, rng: random.Random, days: int) -> datetime:
+        return self.now - timedelta(seconds=rng.randint(0, days * 86400))
+
+    def _popular_course(self, rng: random.Random) -> int:
+        # Squaring a uniform sample skews enrollments towards low course indexes
+        return int(self.args.courses * rng.random() ** 2)
+
+    def users(self) -> Iterator[tuple]:
+        rng = self._rng("users")
+        for index in range(self.args.users):
+            created = self._past(rng, 730)
+            yield (
+                self.ids("users", index),
+                f"user{index}@loadtest.example.com",
+                f"user{index}",
+                f"Load Test User {index}",
+                self.password_hash,
+                "admin" if index == 0 else ("instructor" if index < self.instructors else "user"),
+                True,
+                True,
+                "local",
+                iso(created),
+                iso(created)
+            )
+
+    def courses(self) -> Iterator[tuple]:
+        rng = self._rng("courses")
+        for index in range(self.args.courses):
+            created = self._past(rng, 720)
+            yield (
+                self.ids("courses", index),
+                f"{sentence(rng, rng.randint(3, 7))} {index}",
+                paragraphs(rng, rng.randint(80, 300)),
+                sentence(rng, 20),
+                rng.choice(DIFFICULTIES),
+                rng.randint(2, 60),
+                rng.random() < 0.9,
+                0.0,
+                0,
+                self.lessons_per_course,
+                self.ids("users", index % self.instructors),
+                iso(created),
+                iso(created)
+            )
+
+    def modules(self) -> Iterator[tuple]:
+        rng = self._rng("modules")
+        per_course = self.args.modules_per_course
+        for course in range(self.args.courses):
+            for position in range(per_course):
+                yield (
+                    self.ids("modules", course * per_course + position),
+                    sentence(rng, rng.randint(2, 6)),
+                    sentence(rng, 25),
+                    position,
+                    True,
+                    self.ids("courses", course),
+                    iso(self.now),
+                    iso(self.now)
+                )
+
+    def lessons(self) -> Iterator[tuple]:
+        rng = self._rng("lessons")
+        per_module = self.args.lessons_per_module
+        for module in range(self.args.courses * self.args.modules_per_course):
+            first_ordinal = module % self.args.modules_per_course * per_module
+            for position in range(per_module):
+                # Lesson dates straddle "now" so schedule queries have both past and upcoming rows
+                lesson_date = self.now + timedelta(days=rng.randint(-180, 180), hours=rng.randint(8, 20))
+                yield (
+                    self.ids("lessons", module * per_module + position),
+                    sentence(rng, rng.randint(3, 8)),
+                    paragraphs(rng, rng.randint(30, 120)),
+                    iso(lesson_date),
+                    f"Instructor {module % 500}",
+                    rng.randint(15, 120),
+                    position,
+                    first_ordinal + position,
+                    True,
+                    self.ids("modules", module),
+                    iso(self.now),
+                    iso(self.now)
+                )
+
+    def _enrollment_plan(self) -> Iterator[tuple]:
+        """(enrollment index, user, course, completed lesson count, last access), regenerated identically per pass"""
+        rng = self._rng("enrollments")
+        users = self.args.users
+        courses = self.args.courses
+        per_user, extra = divmod(self.args.enrollments, users)
+        # Spread progress rows across enrollments so the requested total is hit on average
+        mean_done = self.args.progress_rows / max(1, self.args.enrollments)
+
+        index = 0
+        for user in range(users):
+            wanted = min(courses, per_user + (1 if user < extra else 0))
+            if wanted * 2 > courses:
+                chosen = set(rng.sample(range(courses), wanted))
+            else:
+                chosen = set()
+                while len(chosen) < wanted:
+                    chosen.add(self._popular_course(rng))
+            for course in sorted(chosen):
+                done = min(self.lessons_per_course, int(rng.expovariate(1 / mean_done))) if mean_done else 0
+                yield index, user, course, done, self._past(rng, 90)
+                index += 1
+
+    def enrollments(self) -> Iterator[tuple]:
+        total = max(1, self.lessons_per_course)
+        for index, user, course, done, last_access in self._enrollment_plan():
+            completed = done >= total
+            yield (
+                self.ids("user_enrollments", index),
+                round(done * 100.0 / total, 2),
+                completed,
+                iso(last_access) if completed else None,
+                iso(last_access - timedelta(days=30)),
+                iso(last_access),
+                # The completed prefix of the outline, matching the user_progress rows
+                "\\x" + pack_ordinals(range(done)).hex(),
+                self.ids("users", user),
+                self.ids("courses", course)
+            )
+
+    def progress(self) -> Iterator[tuple]:
+        rng = self._rng("progress")
+        per_course = self.lessons_per_course
+        row = 0
+        for _, user, course, done, last_access in self._enrollment_plan():
+            user_id = self.ids("users", user)
+            completed_at = iso(last_access)
+            for position in range(done):
+                yield (
+                    self.ids("user_progress", row),
+                    True,
+                    completed_at,
+                    60 + int(rng.random() * 3540),
+                    completed_at,
+                    completed_at,
+                    user_id,
+                    self.ids("lessons", course * per_course + position)
+                )
+                row += 1
+
+    def blog_categories(self) -> Iterator[tuple]:
+        for index in range(self.args.categories):
+            yield (
+                self.ids("blog_categories", index),
+                f"Category {index}",
+                f"Synthetic category {index}",
+                f"category-{index}",
+                iso(self.now),
+                iso(self.now)
+            )
+
+    def blog_tags(self) -> Iterator[tuple]:
+        for index in range(self.args.tags):
+            yield (
+                self.ids("blog_tags", index),
+                f"tag-{index}",
+                TAG_COLORS[index % len(TAG_COLORS)],
+                iso(self.now)
+            )
+
+    def blog_posts(self) -> Iterator[tuple]:
+        rng = self._rng("blog_posts")
+        for index in range(self.args.blog_posts):
+            words = max(20, int(rng.gauss(self.args.post_words, self.args.post_words / 3)))
+            content = paragraphs(rng, words)
+            status = "published" if rng.random() < 0.8 else rng.choice(("draft", "archived"))
+            created = self._past(rng, 720)
+            # Most posts come from instructors, the long tail from everyone else
+            author = rng.randrange(self.instructors) if rng.random() < 0.7 else rng.randrange(self.args.users)
+            yield (
+                self.ids("blog_posts", index),
+                f"{sentence(rng, rng.randint(4, 10))} {index}",
+                f"post-{index}",
+                content,
+                content[:300],
+                status,
+                min(int(rng.paretovariate(1.2)) - 1, 10_000_000),
+                words,
+                max(1, round(words / 200)),
+                iso(created) if status == "published" else None,
+                iso(created),
+                iso(created),
+                self.ids("users", author),
+                self.ids("blog_categories", rng.randrange(self.args.categories)) if self.args.categories else None
+            )
+
+    def blog_post_tags(self) -> Iterator[tuple]:
+        rng = self._rng("blog_post_tags")
+        tags = self.args.tags
+        for index in range(self.args.blog_posts):
+            post_id = self.ids("blog_posts", index)
+            for tag in rng.sample(range(tags), min(tags, rng.randint(0, self.args.tags_per_post))):
+                yield post_id, self.ids("blog_tags", tag)
+
+
+COPY_PLAN = (
+    ("users", "users", (
+        "id", "email", "username", "full_name", "hashed_password", "role",
+        "is_active", "is_verified", "auth_provider", "created_at", "updated_at"
+    )),
+    ("courses", "courses", (
+        "id", "title", "description", "short_description", "difficulty_level",
+        "estimated_duration", "is_published", "price", "enrollment_count",
+        "next_lesson_ordinal", "instructor_id", "created_at", "updated_at"
+    )),
+    ("modules", "modules", (
+        "id", "title", "description", "order_index", "is_published", "course_id",
+        "created_at", "updated_at"
+    )),
+    ("lessons", "lessons", (
+        "id", "title", "description", "lesson_date", "instructor", "duration",
+        "order_index", "progress_ordinal", "is_active", "module_id", "created_at", "updated_at"
+    )),
+    ("user_enrollments", "enrollments", (
+        "id", "progress_percentage", "is_completed", "completed_at", "enrolled_at",
+        "last_accessed_at", "completed_lesson_bits", "user_id", "course_id"
+    )),
+    ("user_progress", "progress", (
+        "id", "is_completed", "completed_at", "time_spent", "created_at", "updated_at",
+        "user_id", "lesson_id"
+    )),
+    ("blog_categories", "blog_categories", (
+        "id", "name", "description", "slug", "created_at", "updated_at"
+    )),
+    ("blog_tags", "blog_tags", ("id", "name", "color", "created_at")),
+    ("blog_posts", "blog_posts", (
+        "id", "title", "slug", "content", "excerpt", "status", "view_count",
+        "word_count", "read_time_minutes", "published_at", "created_at", "updated_at",
+        "author_id", "category_id"
+    )),
+    ("blog_post_tags", "blog_post_tags", ("post_id", "tag_id")),
+)
+
+# Denormalized counters are recomputed once after loading instead of per row
+FINALIZE_SQL = (
+    """
+    UPDATE courses SET enrollment_count = counts.total
+    FROM (SELECT course_id, count(*) AS total FROM user_enrollments GROUP BY course_id) AS counts
+    WHERE courses.id = counts.course_id
+    """,
+    # Fresh statistics so the planner sees the loaded volumes
+    f"ANALYZE {', '.join(TABLES)}",
+)
+
+
+def copy_table(cursor, table: str, columns: Sequence[str], rows: Iterable[Sequence]) -> int:
+    """Stream rows into table with COPY and return the row count"""
+    count = 0
+
+    def counted() -> None:
+        nonlocal count
+        count += 1
+
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+        CopyStream(rows, counted)
+    )
+    return count
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--instructor-fraction", type=float, default=0.01)
+    parser.add_argument("--courses", type=int, default=500)
+    parser.add_argument("--modules-per-course", type=int, default=5)
+    parser.add_argument("--lessons-per-module", type=int, default=6)
+    parser.add_argument("--enrollments", type=int, default=50000)
+    parser.add_argument("--progress-rows", type=int, default=500000,
+                        help="approximate total; each enrollment completes a prefix of its course outline")
+    parser.add_argument("--blog-posts", type=int, default=5000)
+    parser.add_argument("--post-words", type=int, default=400)
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--tags", type=int, default=200)
+    parser.add_argument("--tags-per-post", type=int, default=4)
+    parser.add_argument("--password", default="loadtest123")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", nargs="*", choices=[table for table, _, _ in COPY_PLAN],
+                        help="load only these tables")
+    parser.add_argument("--truncate", action="store_true", help="TRUNCATE seeded tables first (destroys data)")
+    parser.add_argument("--create-schema", action="store_true", help="create missing tables from the models")
+    parser.add_argument("--disable-triggers", action="store_true",
+                        help="skip FK triggers during COPY (needs superuser; data is generated consistent)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    generator = DatasetGenerator(args)
+
+    if args.create_schema:
+        Base.metadata.create_all(bind=engine)
+
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        if args.truncate:
+            cursor.execute(f"TRUNCATE {', '.join(TABLES)} CASCADE")
+        if args.disable_triggers:
+            cursor.execute("SET session_replication_role = replica")
+
+        started = time.perf_counter()
+        for table, method, columns in COPY_PLAN:
+            if args.only and table not in args.only:
+                continue
+            table_started = time.perf_counter()
+            count = copy_table(cursor, table, columns, getattr(generator, method)())
+            elapsed = time.perf_counter() - table_started
+            print(f"{table:<18} {count:>12,} rows  {elapsed:8.1f}s  {count / max(elapsed, 1e-9):>12,.0f} rows/s")
+
+        if args.disable_triggers:
+            cursor.execute("SET session_replication_role = DEFAULT")
+        for statement in FINALIZE_SQL:
+            cursor.execute(statement)
+        connection.commit()
+        print(f"Loaded in {time.perf_counter() - started:.1f}s")
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
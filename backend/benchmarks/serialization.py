@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Measure response serialization cost for large lesson and blog listings.
+
+Builds in-memory ORM objects (no database needed) and times three paths:
+
+    fastapi + json     response models re-validated by FastAPI, encoded with stdlib json
+    fastapi + orjson   same validation, encoded by ORJSONResponse (the new default class)
+    TypeAdapter        app.core.responses.model_list_response: one validation pass, pydantic-core JSON
+
+Usage:
+
+    python benchmarks/serialization.py --lessons 1000 --posts 100 --repeat 20
+"""
+
+import argparse
+import asyncio
+import gc
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+from app.core.responses import model_list_response  # noqa: E402
+from app.models.blog import BlogCategory, BlogPost, BlogTag  # noqa: E402
+from app.models.learning import Lesson, LessonAttachment  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.schemas.blog import BlogPostResponse  # noqa: E402
+from app.schemas.learning import LessonResponse  # noqa: E402
+
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+PARAGRAPH = (
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua. Ut enim ad minim veniam. "
+)
+
+
+def make_lessons(count: int) -> List[Lesson]:
+    module_id = uuid.uuid4()
+    lessons = []
+    for index in range(count):
+        lesson = Lesson(
+            id=uuid.uuid4(), title=f"Lesson {index}", description=PARAGRAPH * 2,
+            instructor="Instructor", zoom_link="https://zoom.example.com/j/1",
+            quiz_link=None, notification=None, duration=45, video_url=None,
+            order_index=index, is_active=True, created_at=NOW, updated_at=NOW,
+            module_id=module_id
+        )
+        lesson.attachments = [
+            LessonAttachment(
+                id=uuid.uuid4(), name=f"slides-{index}-{n}.pdf", url=f"/uploads/attachments/{n}.pdf",
+                file_type="application/pdf", file_size=123456, lesson_id=lesson.id
+            )
+            for n in range(2)
+        ]
+        lessons.append(lesson)
+    return lessons
+
+
+def make_posts(count: int, words: int) -> List[BlogPost]:
+    author = User(
+        id=uuid.uuid4(), email="author@example.com", username="author", full_name="Author",
+        role="instructor", is_active=True, is_verified=True, auth_provider="local",
+        created_at=NOW, updated_at=NOW
+    )
+    category = BlogCategory(id=uuid.uuid4(), name="Engineering", slug="engineering",
+                            created_at=NOW, updated_at=NOW)
+    tags = [BlogTag(id=uuid.uuid4(), name=f"tag-{n}", color="#3B82F6", created_at=NOW) for n in range(4)]
+    content = PARAGRAPH * max(1, words // 20)
+
+    posts = []
+    for index in range(count):
+        post = BlogPost(
+            id=uuid.uuid4(), title=f"Post {index}", slug=f"post-{index}", content=content,
+            excerpt=content[:300], status="published", view_count=index, word_count=words,
+            read_time_minutes=words // 200, published_at=NOW, created_at=NOW, updated_at=NOW,
+            author_id=author.id, category_id=category.id
+        )
+        post.author = author
+        post.category = category
+        post.tags = tags
+        posts.append(post)
+    return posts
+
+
+def fastapi_path(model, items, response_class, prebuild=None) -> bytes:
+    """What FastAPI does for ``return items`` with ``response_model=List[model]``"""
+    field = create_response_field(name="response", type_=List[model])
+    content = [prebuild(item) for item in items] if prebuild else items
+    encoded = asyncio.run(serialize_response(field=field, response_content=content))
+    return response_class(content=encoded).body
+
+
+def adapter_path(model, items) -> bytes:
+    return model_list_response(model, items).body
+
+
+def measure(label: str, run, repeat: int) -> float:
+    run()  # warm caches (schema build, adapter construction)
+    samples = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        body = run()
+        samples.append((time.perf_counter() - started) * 1000)
+    median = statistics.median(samples)
+    print(f"  {label:<18} {median:9.2f} ms   {len(body) / 1024:8.1f} KiB")
+    return median
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lessons", type=int, default=1000)
+    parser.add_argument("--posts", type=int, default=100)
+    parser.add_argument("--post-words", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    lessons = make_lessons(args.lessons)
+    print(f"{args.lessons} lessons with attachments (median of {args.repeat})")
+    baseline = measure("fastapi + json", lambda: fastapi_path(
+        LessonResponse, lessons, JSONResponse, LessonResponse.from_orm_with_attachments), args.repeat)
+    measure("fastapi + orjson", lambda: fastapi_path(
+        LessonResponse, lessons, ORJSONResponse, LessonResponse.from_orm_with_attachments), args.repeat)
+    fast = measure("TypeAdapter", lambda: adapter_path(LessonResponse, lessons), args.repeat)
+    print(f"  speedup            {baseline / fast:9.1f}x\n")
+
+    posts = make_posts(args.posts, args.post_words)
+    print(f"{args.posts} full blog posts of ~{args.post_words} words (median of {args.repeat})")
+    baseline = measure("fastapi + json", lambda: fastapi_path(BlogPostResponse, posts, JSONResponse), args.repeat)
+    measure("fastapi + orjson", lambda: fastapi_path(BlogPostResponse, posts, ORJSONResponse), args.repeat)
+    fast = measure("TypeAdapter", lambda: adapter_path(BlogPostResponse, posts), args.repeat)
+    print(f"  speedup            {baseline / fast:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
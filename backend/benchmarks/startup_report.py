@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Report worker cold-start cost: import time per module and time per lifespan phase.
+
+Each run boots the app in a fresh interpreter with ``-X importtime`` so the
+numbers match what a new uvicorn/gunicorn worker pays:
+
+    python benchmarks/startup_report.py --runs 3 --top 20
+    python benchmarks/startup_report.py --no-lifespan   # imports only, no database needed
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BOOT_SNIPPET = """
+import asyncio, json, sys
+from app.main import app
+from app.core.startup import startup_report
+
+async def boot():
+    async with app.router.lifespan_context(app):
+        pass
+
+if {run_lifespan}:
+    asyncio.run(boot())
+print(json.dumps(startup_report.as_dict()), file=sys.__stdout__)
+"""
+
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[int, int]]:
+    """Map module name to (self, cumulative) microseconds from -X importtime output"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def boot_once(run_lifespan: bool) -> Tuple[dict, Dict[str, Tuple[int, int]]]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", BOOT_SNIPPET.format(run_lifespan=run_lifespan)],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True
+    )
+    if completed.returncode != 0:
+        raise SystemExit(completed.stderr[-2000:])
+    report = json.loads(completed.stdout.strip().splitlines()[-1])
+    return report, parse_importtime(completed.stderr)
+
+
+def top_level_packages(modules: Dict[str, Tuple[int, int]]) -> Dict[str, int]:
+    """Self time summed per top-level package (app.* is kept at two levels)"""
+    totals: Dict[str, int] = defaultdict(int)
+    for name, (self_us, _) in modules.items():
+        parts = name.split(".")
+        key = ".".join(parts[:2]) if parts[0] == "app" else parts[0]
+        totals[key] += self_us
+    return totals
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--no-lifespan", action="store_true", help="skip lifespan startup (no database needed)")
+    args = parser.parse_args(argv)
+
+    # The first boot also compiles bytecode; it is not representative of a rolling restart
+    boot_once(not args.no_lifespan)
+
+    reports: List[dict] = []
+    package_times: Dict[str, List[int]] = defaultdict(list)
+    module_times: Dict[str, List[int]] = defaultdict(list)
+    for _ in range(args.runs):
+        report, modules = boot_once(not args.no_lifespan)
+        reports.append(report)
+        for name, total in top_level_packages(modules).items():
+            package_times[name].append(total)
+        for name, (_, cumulative) in modules.items():
+            module_times[name].append(cumulative)
+
+    print(f"Startup over {args.runs} cold boots (median)")
+    print(f"  import           {statistics.median(r['import_ms'] for r in reports):9.1f} ms")
+    for phase in reports[0]["phases_ms"]:
+        print(f"  {phase:<16} {statistics.median(r['phases_ms'][phase] for r in reports):9.1f} ms")
+    print(f"  total            {statistics.median(r['total_ms'] for r in reports):9.1f} ms")
+
+    print(f"\nSelf import time by package (top {args.top})")
+    ranked = sorted(package_times.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for name, samples in ranked[:args.top]:
+        print(f"  {name:<40} {statistics.median(samples) / 1000:9.1f} ms")
+
+    print(f"\nCumulative import time of app modules (top {args.top})")
+    app_modules = [(name, samples) for name, samples in module_times.items() if name.startswith("app.")]
+    app_modules.sort(key=lambda item: statistics.median(item[1]), reverse=True)
+    for name, samples in app_modules[:args.top]:
+        print(f"  {name:<40} {statistics.median(samples) / 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
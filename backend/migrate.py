@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""Bring the database schema up to date.
+
+The application no longer creates tables at startup; run this once per
+deploy instead of on every worker boot. The first Alembic revision predates
+the models, so an empty database is built from the models and stamped at
+head, while an existing database is upgraded through the migrations.
+"""
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
+from app.core.database import engine, Base
+import app.models  # noqa: F401  (register all tables on Base.metadata)
+
+
+def migrate():
+    """Create a fresh schema or upgrade an existing one to the latest revision"""
+    config = Config(os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic"))
+
+    existing_tables = set(inspect(engine).get_table_names())
+    if not existing_tables - {"alembic_version"}:
+        print("Empty database, creating schema from models...")
+        Base.metadata.create_all(bind=engine)
+        command.stamp(config, "head")
+    else:
+        print("Upgrading database to the latest revision...")
+        command.upgrade(config, "head")
+
+    print("Database schema is up to date")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Move lesson progress from user_progress rows to per-enrollment bitsets.
+
+Every lesson has a progress_ordinal, unique within its course, and an
+enrollment records completed lessons as bits of
+user_enrollments.completed_lesson_bits, with seconds spent per lesson in
+the narrow enrollment_lesson_time table. Completion percentages then come
+from a popcount of one small bytea per enrollment instead of counting rows.
+
+Switch over in three steps:
+
+    1. PROGRESS_STORE=dual    completions are written to rows and bitsets
+    2. python migrate_progress_bitsets.py backfill
+       python migrate_progress_bitsets.py verify
+    3. PROGRESS_STORE=bitset  reads and writes use the bitsets only
+
+backfill rebuilds bitsets and time from user_progress a batch of courses
+per transaction and can be re-run at any time. verify lists enrollments
+whose popcount disagrees with their completed rows. stats compares the
+on-disk size of both representations. Requires Postgres 14+ (bit_count).
+"""
+
+import argparse
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+
+from app.core.database import engine
+
+
+# Completed ordinals of each enrollment in the batch, OR-ed into bytes and hex-encoded in byte order
+BACKFILL_BITS = text("""
+    WITH done AS (
+        SELECT p.user_id, m.course_id, l.progress_ordinal AS ordinal
+        FROM user_progress p
+        JOIN lessons l ON l.id = p.lesson_id
+        JOIN modules m ON m.id = l.module_id
+        WHERE p.is_completed AND m.course_id = ANY(:course_ids)
+    ), bytes AS (
+        SELECT user_id, course_id, ordinal / 8 AS byte_index, sum(1 << (ordinal % 8)) AS value
+        FROM done GROUP BY user_id, course_id, ordinal / 8
+    ), packed AS (
+        SELECT last.user_id, last.course_id,
+               decode(string_agg(lpad(to_hex(coalesce(b.value, 0)), 2, '0'), '' ORDER BY s.byte_index), 'hex') AS bits
+        FROM (SELECT user_id, course_id, max(byte_index) AS byte_index FROM bytes GROUP BY user_id, course_id) last
+        CROSS JOIN LATERAL generate_series(0, last.byte_index) AS s(byte_index)
+        LEFT JOIN bytes b
+            ON b.user_id = last.user_id AND b.course_id = last.course_id AND b.byte_index = s.byte_index
+        GROUP BY last.user_id, last.course_id
+    )
+    UPDATE user_enrollments e
+    SET completed_lesson_bits = coalesce(packed.bits, '\\x'::bytea)
+    FROM user_enrollments target
+    LEFT JOIN packed ON packed.user_id = target.user_id AND packed.course_id = target.course_id
+    WHERE e.id = target.id AND target.course_id = ANY(:course_ids)
+      AND e.completed_lesson_bits IS DISTINCT FROM coalesce(packed.bits, '\\x'::bytea)
+""")
+
+BACKFILL_TIME = text("""
+    INSERT INTO enrollment_lesson_time (enrollment_id, lesson_ordinal, seconds)
+    SELECT e.id, l.progress_ordinal, p.time_spent
+    FROM user_progress p
+    JOIN lessons l ON l.id = p.lesson_id
+    JOIN modules m ON m.id = l.module_id
+    JOIN user_enrollments e ON e.user_id = p.user_id AND e.course_id = m.course_id
+    WHERE p.time_spent > 0 AND m.course_id = ANY(:course_ids)
+    ON CONFLICT (enrollment_id, lesson_ordinal)
+    DO UPDATE SET seconds = excluded.seconds WHERE enrollment_lesson_time.seconds < excluded.seconds
+""")
+
+# Enrollments whose bitset popcount differs from their completed progress rows
+VERIFY = text("""
+    SELECT e.id, e.user_id, e.course_id, bit_count(e.completed_lesson_bits) AS bits, coalesce(r.completed, 0) AS rows
+    FROM user_enrollments e
+    LEFT JOIN (
+        SELECT p.user_id, m.course_id, count(*) AS completed
+        FROM user_progress p
+        JOIN lessons l ON l.id = p.lesson_id
+        JOIN modules m ON m.id = l.module_id
+        WHERE p.is_completed
+        GROUP BY p.user_id, m.course_id
+    ) r ON r.user_id = e.user_id AND r.course_id = e.course_id
+    WHERE bit_count(e.completed_lesson_bits) <> coalesce(r.completed, 0)
+    LIMIT :limit
+""")
+
+STATS = text("""
+    SELECT
+        (SELECT count(*) FROM user_progress) AS progress_rows,
+        pg_total_relation_size('user_progress') AS rows_bytes,
+        (SELECT coalesce(sum(octet_length(completed_lesson_bits)), 0) FROM user_enrollments) AS bitset_bytes,
+        (SELECT count(*) FROM enrollment_lesson_time) AS time_rows,
+        pg_total_relation_size('enrollment_lesson_time') AS time_bytes
+""")
+
+
+def backfill(batch_size: int) -> None:
+    with engine.connect() as conn:
+        course_ids = conn.execute(text("SELECT id FROM courses ORDER BY id")).scalars().all()
+
+    started = time.perf_counter()
+    updated = timed = 0
+    for offset in range(0, len(course_ids), batch_size):
+        batch = {"course_ids": course_ids[offset:offset + batch_size]}
+        with engine.begin() as conn:
+            updated += conn.execute(BACKFILL_BITS, batch).rowcount
+            timed += conn.execute(BACKFILL_TIME, batch).rowcount
+        print(f"  {min(offset + batch_size, len(course_ids)):>8,}/{len(course_ids):,} courses", end="\r", flush=True)
+
+    print(f"\nRewrote {updated:,} bitsets and {timed:,} time entries in {time.perf_counter() - started:.1f}s")
+
+
+def verify(limit: int) -> int:
+    with engine.connect() as conn:
+        mismatches = conn.execute(VERIFY, {"limit": limit}).all()
+    for row in mismatches:
+        print(f"  enrollment {row.id} (user {row.user_id}, course {row.course_id}): {row.bits} bits, {row.rows} rows")
+    print("Bitsets match user_progress" if not mismatches else f"{len(mismatches)} mismatched enrollment(s) shown")
+    return 1 if mismatches else 0
+
+
+def stats() -> None:
+    with engine.connect() as conn:
+        row = conn.execute(STATS).one()
+    bitset_total = row.bitset_bytes + row.time_bytes
+    print(f"user_progress          {row.progress_rows:>12,} rows  {row.rows_bytes / 2**20:>10.2f} MiB (with indexes)")
+    print(f"completed_lesson_bits  {'':>17}  {row.bitset_bytes / 2**20:>10.2f} MiB (inline in user_enrollments)")
+    print(f"enrollment_lesson_time {row.time_rows:>12,} rows  {row.time_bytes / 2**20:>10.2f} MiB (with indexes)")
+    if row.bitset_bytes:
+        print(
+            f"Completion bitsets are {row.rows_bytes / row.bitset_bytes:,.0f}x smaller than user_progress, "
+            f"{row.rows_bytes / bitset_total:.1f}x including time spent"
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    backfill_parser = commands.add_parser("backfill", help="rebuild bitsets and time from user_progress")
+    backfill_parser.add_argument("--batch-size", type=int, default=500, help="courses per transaction")
+    verify_parser = commands.add_parser("verify", help="compare bitset popcounts with completed rows")
+    verify_parser.add_argument("--limit", type=int, default=20)
+    commands.add_parser("stats", help="storage used by each representation")
+    args = parser.parse_args(argv)
+
+    if args.command == "backfill":
+        backfill(args.batch_size)
+    elif args.command == "verify":
+        return verify(args.limit)
+    else:
+        stats()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
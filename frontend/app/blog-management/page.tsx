@@ -8,10 +8,10 @@ import { Badge } from "@/components/ui/badge"
 import { Eye, Edit, Trash2, Plus, Loader2 } from "lucide-react"
 import { BlogEditor } from "@/components/blog-editor"
 import { apiClient } from "@/lib/api"
-import type { BlogPost, BlogPostData, User } from "@/lib/api"
+import type { BlogPost, BlogPostData, BlogPostSummary, User } from "@/lib/api"
 
 export default function BlogManagementPage() {
-  const [posts, setPosts] = useState<BlogPost[]>([])
+  const [posts, setPosts] = useState<BlogPostSummary[]>([])
   const [isEditorOpen, setIsEditorOpen] = useState(false)
   const [editingPost, setEditingPost] = useState<BlogPost | null>(null)
   const [user, setUser] = useState<User | null>(null)
@@ -30,12 +30,8 @@ export default function BlogManagementPage() {
         
         // Fetch blog posts
         const postsData = await apiClient.getBlogPosts()
-        const posts: BlogPost[] = Array.isArray(postsData) ? postsData : (postsData as { items?: BlogPost[] }).items || []
-        const postsWithWordCount = posts.map(post => ({
-          ...post,
-          word_count: calculateWordCount(post.content)
-        }))
-        setPosts(postsWithWordCount)
+        const posts: BlogPostSummary[] = Array.isArray(postsData) ? postsData : (postsData as { items?: BlogPostSummary[] }).items || []
+        setPosts(posts)
       } catch (err: unknown) {
         console.error('Error fetching data:', err)
         if (err instanceof Error) {
@@ -71,9 +67,15 @@ export default function BlogManagementPage() {
     setIsEditorOpen(true)
   }
 
-  const handleEditPost = (post: BlogPost): void => {
-    setEditingPost(post)
-    setIsEditorOpen(true)
+  const handleEditPost = async (post: BlogPostSummary): Promise<void> => {
+    try {
+      // The list only carries summaries; load the full content for editing
+      setEditingPost(await apiClient.getBlogPost(post.id))
+      setIsEditorOpen(true)
+    } catch (error) {
+      console.error('Error loading post:', error)
+      alert('Failed to load post. Please try again.')
+    }
   }
 
   const calculateWordCount = (content: string): number => {
@@ -92,7 +94,7 @@ export default function BlogManagementPage() {
     
     try {
       await apiClient.deleteBlogPost(postId)
-      setPosts(posts.filter((post: BlogPost) => post.id !== postId))
+      setPosts(posts.filter((post: BlogPostSummary) => post.id !== postId))
     } catch (error) {
       console.error('Error deleting post:', error)
       alert('Failed to delete post. Please try again.')
@@ -110,7 +112,7 @@ export default function BlogManagementPage() {
           ...savedPost,
           word_count: calculateWordCount(savedPost.content)
         }
-        setPosts(posts.map((post: BlogPost) => 
+        setPosts(posts.map((post: BlogPostSummary) => 
           post.id === editingPost.id ? postWithWordCount : post
         ))
       } else {
@@ -176,7 +178,7 @@ export default function BlogManagementPage() {
               </Button>
             </div>
           ) : (
-            posts.map((post: BlogPost) => (
+            posts.map((post: BlogPostSummary) => (
               <Card key={post.id}>
                 <CardHeader>
                   <div className="flex items-start justify-between">
@@ -218,7 +220,7 @@ export default function BlogManagementPage() {
                 </CardHeader>
                 <CardContent>
                   <p className="text-gray-600 line-clamp-3">
-                    {post.content.replace(/[#*]/g, "").substring(0, 200)}...
+                    {post.excerpt}...
                   </p>
                 </CardContent>
               </Card>
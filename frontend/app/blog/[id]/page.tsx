@@ -190,11 +190,11 @@ export default function BlogPostPage({ params }: BlogPostPageProps) {
               <header className="mb-8">
                 <div className="flex items-center space-x-4 text-sm text-gray-500 mb-4">
                   <div className="flex items-center space-x-1">
-                    <span>{calculateWordCount(post.content)}</span>
+                    <span>{post.word_count ? `${post.word_count} words` : calculateWordCount(post.content)}</span>
                   </div>
                   <div className="flex items-center space-x-1">
                     <Clock className="w-4 h-4" />
-                    <span>{calculateReadTime(post.content)}</span>
+                    <span>{post.read_time_minutes ? `${post.read_time_minutes} min read` : calculateReadTime(post.content)}</span>
                   </div>
                 </div>
 
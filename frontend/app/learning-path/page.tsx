@@ -316,9 +316,15 @@ export default function LearningPathPage() {
     setIsCourseDialogOpen(true)
   }
 
-  const handleEditCourse = (course: Course) => {
-    setEditingCourse(course)
-    setIsCourseDialogOpen(true)
+  const handleEditCourse = async (course: Course) => {
+    try {
+      // The course list omits the full description; load it for the edit form
+      const { description } = await apiClient.getCourse(course.id)
+      setEditingCourse({ ...course, description })
+      setIsCourseDialogOpen(true)
+    } catch (err) {
+      console.error('Error loading course:', err)
+    }
   }
 
   const handleDeleteCourse = async (courseId: string) => {
@@ -534,7 +540,7 @@ export default function LearningPathPage() {
 
         <div className="mb-6">
           <h2 className="text-xl font-semibold text-gray-900 mb-2">{selectedCourse.title}</h2>
-          <p className="text-gray-600">{selectedCourse.description}</p>
+          <p className="text-gray-600">{selectedCourse.description || selectedCourse.short_description}</p>
         </div>
 
         <div className="space-y-4">
@@ -8,7 +8,7 @@ import { Button } from "@/components/ui/button"
 import { Card, CardContent } from "@/components/ui/card"
 import { Badge } from "@/components/ui/badge"
 import { ArrowRight, BookOpen, Calendar, Clock } from "lucide-react"
-import { apiClient, BlogPost, Category, Tag } from "@/lib/api"
+import { apiClient, BlogPostSummary, Category, Tag } from "@/lib/api"
 import ReactMarkdown from 'react-markdown'
 import remarkMath from 'remark-math'
 import rehypeKatex from 'rehype-katex'
@@ -16,11 +16,8 @@ import rehypeRaw from 'rehype-raw'
 import 'katex/dist/katex.min.css'
 
 // Helper functions
-const calculateReadTime = (content: string): string => {
-  const wordsPerMinute = 200
-  const words = content.split(' ').length
-  const minutes = Math.ceil(words / wordsPerMinute)
-  return `${minutes} min read`
+const formatReadTime = (minutes?: number): string => {
+  return `${Math.max(1, minutes || 0)} min read`
 }
 
 const formatDate = (dateString: string): string => {
@@ -33,8 +30,8 @@ const formatDate = (dateString: string): string => {
 }
 
 export default function HomePage() {
-  const [publishedPosts, setPublishedPosts] = useState<BlogPost[]>([])
-  const [allPosts, setAllPosts] = useState<BlogPost[]>([])
+  const [publishedPosts, setPublishedPosts] = useState<BlogPostSummary[]>([])
+  const [allPosts, setAllPosts] = useState<BlogPostSummary[]>([])
   const [categories, setCategories] = useState<Category[]>([])
   const [tags, setTags] = useState<Tag[]>([])
   const [selectedCategory, setSelectedCategory] = useState<string | null>(null)
@@ -285,16 +282,16 @@ export default function HomePage() {
                                     img: () => null
                                   }}
                                 >
-                                  {(post.excerpt || post.content.substring(0, 300)) + '...'}
+                                  {(post.excerpt || '') + '...'}
                                 </ReactMarkdown>
                               </div>
                               
                               <div className="flex items-center justify-between">
                                 <div className="flex items-center gap-4 text-sm text-gray-500">
-                                  <span>{post.content.split(/\s+/).filter(word => word.length > 0).length} words</span>
+                                  <span>{post.word_count || 0} words</span>
                                   <span className="flex items-center gap-1">
                                     <Clock className="h-4 w-4" />
-                                    <span>{calculateReadTime(post.content)}</span>
+                                    <span>{formatReadTime(post.read_time_minutes)}</span>
                                   </span>
                                 </div>
                                 
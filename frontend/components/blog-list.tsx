@@ -6,7 +6,7 @@ import { Badge } from "@/components/ui/badge"
 import { Input } from "@/components/ui/input"
 import { Calendar, Clock, Search, Filter, BookOpen, ChevronRight } from "lucide-react"
 import Link from "next/link"
-import { apiClient, BlogPost } from "@/lib/api"
+import { apiClient, BlogPostSummary } from "@/lib/api"
 
 const gradients = [
   "from-blue-400 to-purple-600",
@@ -20,7 +20,7 @@ const gradients = [
 export function BlogList() {
   const [searchTerm, setSearchTerm] = useState("")
   const [selectedCategory, setSelectedCategory] = useState("All")
-  const [posts, setPosts] = useState<BlogPost[]>([])
+  const [posts, setPosts] = useState<BlogPostSummary[]>([])
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
   const [categories, setCategories] = useState<string[]>(["All"])
@@ -57,11 +57,8 @@ export function BlogList() {
     })
   }
 
-  const calculateReadTime = (content: string) => {
-    const wordsPerMinute = 200
-    const wordCount = content.split(' ').length
-    const readTime = Math.ceil(wordCount / wordsPerMinute)
-    return `${readTime} min read`
+  const formatReadTime = (minutes?: number) => {
+    return `${Math.max(1, minutes || 0)} min read`
   }
 
   if (loading) {
@@ -100,7 +97,6 @@ export function BlogList() {
   // Filter posts based on search term and category
   const filteredPosts = posts.filter(post => {
     const matchesSearch = post.title.toLowerCase().includes(searchTerm.toLowerCase()) ||
-                         post.content.toLowerCase().includes(searchTerm.toLowerCase()) ||
                          (post.excerpt && post.excerpt.toLowerCase().includes(searchTerm.toLowerCase()))
     const matchesCategory = selectedCategory === "All" || 
                            (post.category && post.category.name === selectedCategory)
@@ -159,7 +155,7 @@ export function BlogList() {
                       </div>
                       <div className="flex items-center gap-1">
                         <Clock className="h-4 w-4" />
-                        <span>{calculateReadTime(post.content)}</span>
+                        <span>{formatReadTime(post.read_time_minutes)}</span>
                       </div>
                       <div className="flex items-center gap-1">
                         <BookOpen className="h-4 w-4" />
@@ -181,7 +177,7 @@ export function BlogList() {
                       ))}
                     </div>
 
-                    <p className="text-gray-600 mb-4">{post.excerpt || post.content.substring(0, 150)}...</p>
+                    <p className="text-gray-600 mb-4">{post.excerpt}...</p>
 
                     <div className="flex items-center space-x-4 text-sm text-gray-500">
                       <span>By {post.author?.full_name || 'Anonymous'}</span>
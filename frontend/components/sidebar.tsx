@@ -3,12 +3,12 @@
 import { Card, CardContent } from "@/components/ui/card"
 import { Badge } from "@/components/ui/badge"
 import { Button } from "@/components/ui/button"
-import { Category, Tag, BlogPost } from "@/lib/api"
+import { Category, Tag, BlogPostSummary } from "@/lib/api"
 
 interface SidebarProps {
   categories: Category[]
   tags: Tag[]
-  allPosts: BlogPost[]
+  allPosts: BlogPostSummary[]
   selectedCategory: string | null
   selectedTag: string | null
   onCategoryClick: (categoryName: string) => void
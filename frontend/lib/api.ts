@@ -18,10 +18,11 @@ export interface User {
   google_id?: string;
 }
 
-export interface BlogPost {
+// List endpoints return summaries; content is only sent by the detail endpoint
+export interface BlogPostSummary {
   id: string;
   title: string;
-  content: string;
+  slug?: string;
   excerpt?: string;
   is_published: boolean;
   created_at: string;
@@ -29,7 +30,8 @@ export interface BlogPost {
   author_id: string;
   category_id?: string;
   word_count?: number;
-  author?: User;
+  read_time_minutes?: number;
+  author?: Pick<User, 'id' | 'full_name' | 'username' | 'avatar_url'>;
   category?: {
     id: string;
     name: string;
@@ -41,6 +43,13 @@ export interface BlogPost {
   }[];
 }
 
+export interface BlogPost extends BlogPostSummary {
+  content: string;
+  content_html?: string | null;
+  content_toc?: { level: number; text: string; id: string }[] | null;
+  author?: User;
+}
+
 export interface BlogPostData {
   title: string;
   content: string;
@@ -348,6 +357,22 @@ class ApiClient {
   }
 
   async logout() {
+    // Revoke both tokens server-side; local sign-out happens regardless
+    const refreshToken = typeof window !== 'undefined' ? localStorage.getItem('refresh_token') : null;
+    if (this.token) {
+      try {
+        await fetch(`${this.baseURL}/api/v1/auth/logout`, {
+          method: 'POST',
+          headers: {
+            'Content-Type': 'application/json',
+            Authorization: `Bearer ${this.token}`,
+          },
+          body: refreshToken ? JSON.stringify({ refresh_token: refreshToken }) : undefined,
+        });
+      } catch {
+        // Unreachable server: the tokens still expire on their own
+      }
+    }
     this.clearTokens();
   }
 
@@ -364,8 +389,8 @@ class ApiClient {
   }
 
   // Blog methods
-  async getBlogPosts(skip: number = 0, limit: number = 10): Promise<BlogPost[]> {
-    return this.request<BlogPost[]>(`/api/v1/blogs?skip=${skip}&limit=${limit}`, {}, false);
+  async getBlogPosts(skip: number = 0, limit: number = 10): Promise<BlogPostSummary[]> {
+    return this.request<BlogPostSummary[]>(`/api/v1/blogs?skip=${skip}&limit=${limit}`, {}, false);
   }
 
   async getBlogPost(id: string): Promise<BlogPost> {